@@ -0,0 +1,97 @@
+"""
+Microbenchmarks of the hot paths that use the per-class field metadata of nodes.
+
+* `NodeEncoder.default`: converting a node into its JSON dict
+* `BaseNode._from_json`: creating a node from its JSON dict
+* `BaseNode.__deepcopy__`: copying a node
+* `NodeIterator`: iterating over all nodes of a project
+* `_NodeDecoderHook.resolve_unresolved_uids`: looking for unresolved UIDs in a project
+
+Reports the time per node in microseconds, the best of a few runs.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_field_metadata.py
+```
+"""
+import copy
+import logging
+import time
+
+import cript
+from cript.nodes.node_iterator import NodeIterator
+from cript.nodes.util import NodeEncoder
+from cript.nodes.util.json import _NodeDecoderHook
+from cript.nodes.uuid_base import UUIDBaseNode
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def time_per_node(function, num_nodes: int, repeat: int = 5) -> float:
+    """Best time of `repeat` runs of `function`, divided by the number of nodes it handles, in microseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations) / num_nodes * 1e6
+
+
+def encode_nodes(nodes) -> None:
+    encoder = NodeEncoder()
+    for node in nodes:
+        encoder.default(node)
+
+
+def decode_nodes(node_class, json_dicts) -> None:
+    # A fresh UUID cache, so every node is created again
+    previous_uuid_cache = UUIDBaseNode._uuid_cache
+    UUIDBaseNode._uuid_cache = {}
+    try:
+        for json_dict in json_dicts:
+            node_class._from_json(json_dict)
+    finally:
+        UUIDBaseNode._uuid_cache = previous_uuid_cache
+
+
+def deepcopy_nodes(nodes) -> None:
+    for node in nodes:
+        copy.deepcopy(node)
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        api.schema.skip_validation = True
+        project = build_project(1000)
+        all_nodes = list(NodeIterator(project))
+        materials = [node for node in all_nodes if isinstance(node, cript.Material)]
+        quantities = [node for node in all_nodes if isinstance(node, cript.Quantity)]
+        material_dicts = [material.get_json().json_dict for material in materials]
+
+        results = {
+            "NodeEncoder.default": time_per_node(lambda: encode_nodes(all_nodes), len(all_nodes)),
+            "BaseNode._from_json": time_per_node(lambda: decode_nodes(cript.Material, material_dicts), len(material_dicts)),
+            "BaseNode.__deepcopy__": time_per_node(lambda: deepcopy_nodes(quantities), len(quantities)),
+            "NodeIterator": time_per_node(lambda: list(NodeIterator(project)), len(all_nodes)),
+            "resolve_unresolved_uids": time_per_node(lambda: _NodeDecoderHook().resolve_unresolved_uids(project), len(all_nodes)),
+        }
+
+        print(f"{'hot path':>24} {'time per node [us]':>19}")
+        for name, duration in results.items():
+            print(f"{name:>24} {duration:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
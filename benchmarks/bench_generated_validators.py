@@ -0,0 +1,43 @@
+"""
+Micro-benchmark for the validators that are generated from the DB schema.
+
+Compares the compiled `jsonschema` validator of a node definition
+with the plain-Python function generated for the same definition.
+Both only check if the node JSON is valid, the validation cache is not involved.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_generated_validators.py
+```
+"""
+import json
+import logging
+import timeit
+
+import cript
+
+
+def main(number: int = 1000) -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        project = cript.Project(name="my project", material=[material])
+
+        for node in (quantity, material, project):
+            node_dict = json.loads(node.get_json().json)
+            schema_definition = api.schema._get_schema_definition(node.node_type)
+            generated_validator = api.schema._generated_node_validators.get(schema_definition)
+            if generated_validator is None:
+                print(f"{node.node_type:<10} no generated validator for {schema_definition}")
+                continue
+            node_validator = api.schema._get_node_validator(node.node_type)
+
+            before = timeit.timeit(lambda: node_validator.is_valid(node_dict), number=number)
+            after = timeit.timeit(lambda: generated_validator(node_dict), number=number)
+
+            print(f"{node.node_type:<10} jsonschema: {number / before:>12.1f} validations/sec  generated: {number / after:>12.1f} validations/sec  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of repeated serialization of a large project, where only one node changes between serializations.
+
+Compares `project.get_json().json` outside and inside of a `cript.incremental_serialization()` block.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_incremental_serialization.py
+```
+"""
+import logging
+import time
+
+import cript
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def serialize_after_changes(project: cript.Project, num_changes: int) -> float:
+    """Average time of serializing the project after renaming one process each time."""
+    processes = [experiment.process[0] for experiment in project.collection[0].experiment]
+    project.get_json().json
+    duration = 0.0
+    for i in range(num_changes):
+        processes[i * 7919 % len(processes)].name = f"my renamed process {i}"
+        start = time.perf_counter()
+        project.get_json().json
+        duration += time.perf_counter() - start
+    return duration / num_changes
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        print(f"{'experiments':>12} {'full [s]':>9} {'incremental [s]':>16}")
+        for num_experiments in (100, 1000, 5000):
+            api.schema.skip_validation = True
+            project = build_project(num_experiments)
+
+            full_time = serialize_after_changes(project, num_changes=10)
+            with cript.incremental_serialization():
+                incremental_time = serialize_after_changes(project, num_changes=10)
+                incremental_json = project.get_json().json
+            assert incremental_json == project.get_json().json
+
+            print(f"{num_experiments:>12} {full_time:>9.4f} {incremental_time:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the JSON backends selectable with `cript.set_json_backend`.
+
+For every installed backend, measures encoding a large project as a request body (after the JSON dict is built),
+decoding it to plain dicts, and loading it into nodes with `cript.load_nodes_from_json`.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_json_backends.py
+```
+"""
+import json
+import logging
+import time
+
+import cript
+from cript.nodes.util.json_backend import _json_dumps, _json_loads
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def best_time(function, repeat: int = 3) -> float:
+    """Best wall time of `repeat` runs."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        api.schema.skip_validation = True
+        project = build_project(2000)
+        json_dict = project.get_json().json_dict
+        expanded_json = project.get_expanded_json()
+
+        print(f"{'backend':>8} {'encode [s]':>11} {'decode [s]':>11} {'load nodes [s]':>15}")
+        for backend in ("json", "ujson", "msgspec", "orjson"):
+            try:
+                cript.set_json_backend(backend)
+            except ImportError:
+                print(f"{backend:>8} not installed")
+                continue
+
+            # Every backend has to produce the same JSON
+            assert json.loads(_json_dumps(json_dict)) == json_dict
+            assert _json_loads(expanded_json) == json.loads(expanded_json)
+
+            encode_time = best_time(lambda: _json_dumps(json_dict))
+            decode_time = best_time(lambda: _json_loads(expanded_json))
+            load_time = best_time(lambda: cript.load_nodes_from_json(expanded_json, _use_uuid_cache=dict()), repeat=1)
+
+            print(f"{backend:>8} {encode_time:>11.4f} {decode_time:>11.4f} {load_time:>15.3f}")
+
+        cript.set_json_backend("json")
+
+
+if __name__ == "__main__":
+    main()
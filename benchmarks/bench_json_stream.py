@@ -0,0 +1,115 @@
+"""
+Benchmark of loading a large JSON document of nodes at once and streaming it item by item.
+
+Writes a JSON array with many experiments to a file, then reads it with `cript.load_nodes_from_json`
+and with `cript.stream_nodes_from_json`, handling every experiment and dropping it afterwards.
+Then does the same for a single project that contains all experiments, like an API response of a large project.
+All its nodes stay in memory in both cases, but streaming never holds the whole text or its parsed dicts.
+Reports the time and the peak memory allocated by Python during each load.
+The memory is measured with `tracemalloc` in a separate run, as tracing slows loading down.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_json_stream.py
+```
+"""
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+import weakref
+
+import cript
+
+
+def make_experiment(i: int) -> cript.Experiment:
+    """An experiment with a process and its ingredient."""
+    material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+    quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+    ingredient = cript.Ingredient(material=material, quantity=[quantity])
+    process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+    return cript.Experiment(name=f"my experiment {i}", process=[process])
+
+
+def write_experiments(path: str, num_experiments: int) -> None:
+    """Write a JSON array of `num_experiments` experiments."""
+    with open(path, "w") as file_handle:
+        file_handle.write("[")
+        for i in range(num_experiments):
+            if i > 0:
+                file_handle.write(",")
+            file_handle.write(make_experiment(i).get_json(condense_to_uuid={}).json)
+        file_handle.write("]")
+
+
+def write_project(path: str, num_experiments: int) -> None:
+    """Write an API response with a single project, whose collection has `num_experiments` experiments."""
+    collection = cript.Collection(name="my collection", experiment=[make_experiment(i) for i in range(num_experiments)])
+    project = cript.Project(name="my project", collection=[collection])
+    with open(path, "w") as file_handle:
+        file_handle.write('{"data": [' + project.get_json(condense_to_uuid={}).json + "]}")
+
+
+def load_at_once(path: str) -> int:
+    with open(path) as file_handle:
+        experiments, _ = cript.load_nodes_from_json(file_handle.read(), _use_uuid_cache=dict(), skip_validation=True)
+    return sum(len(experiment.name) for experiment in experiments)
+
+
+def load_project_at_once(path: str) -> int:
+    with open(path) as file_handle:
+        response, _ = cript.load_nodes_from_json(file_handle.read(), _use_uuid_cache=dict(), skip_validation=True)
+    return sum(len(experiment.name) for experiment in response["data"][0].collection[0].experiment)
+
+
+def load_project_streaming(path: str) -> int:
+    projects = cript.stream_nodes_from_json(path, path=("data",), _use_uuid_cache=dict(), skip_validation=True)
+    return sum(len(experiment.name) for project in projects for experiment in project.collection[0].experiment)
+
+
+def load_streaming(path: str) -> int:
+    # Every experiment is dropped after use, so the UUID cache must not keep them either
+    experiments = cript.stream_nodes_from_json(path, _use_uuid_cache=weakref.WeakValueDictionary(), skip_validation=True)
+    return sum(len(experiment.name) for experiment in experiments)
+
+
+def measure(function, path: str):
+    """Duration in seconds and peak traced memory in MB of `function(path)`."""
+    start = time.perf_counter()
+    result = function(path)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    assert function(path) == result
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak / 1e6
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api, tempfile.TemporaryDirectory() as directory:
+        api.schema.skip_validation = True
+        path = os.path.join(directory, "experiments.json")
+
+        print(f"{'experiments':>12} {'file [MB]':>10} {'at once [s]':>12} {'at once [MB]':>13} {'streaming [s]':>14} {'streaming [MB]':>15}")
+        for num_experiments in (1000, 5000, 20000):
+            write_experiments(path, num_experiments)
+            once_time, once_memory = measure(load_at_once, path)
+            stream_time, stream_memory = measure(load_streaming, path)
+            file_size = os.path.getsize(path) / 1e6
+            print(f"{num_experiments:>12} {file_size:>10.2f} {once_time:>12.3f} {once_memory:>13.1f} {stream_time:>14.3f} {stream_memory:>15.1f}")
+
+        print()
+        print(f"{'project exp.':>12} {'file [MB]':>10} {'at once [s]':>12} {'at once [MB]':>13} {'streaming [s]':>14} {'streaming [MB]':>15}")
+        for num_experiments in (1000, 5000):
+            write_project(path, num_experiments)
+            once_time, once_memory = measure(load_project_at_once, path)
+            stream_time, stream_memory = measure(load_project_streaming, path)
+            file_size = os.path.getsize(path) / 1e6
+            print(f"{num_experiments:>12} {file_size:>10.2f} {once_time:>12.3f} {once_memory:>13.1f} {stream_time:>14.3f} {stream_memory:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
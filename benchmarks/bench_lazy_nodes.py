@@ -0,0 +1,74 @@
+"""
+Benchmark of looking through search results with and without lazy node materialization.
+
+Simulates a page of search results with the JSON of many materials, and reads only the name of every result,
+like a user scanning the results would. Compares creating every node (`load_nodes_from_json`) with `cript.LazyNode`,
+and the cost of materializing every lazy node afterwards.
+Reports the best of a few runs.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_lazy_nodes.py
+```
+"""
+import json
+import logging
+import time
+
+import cript
+
+
+def build_results(num_results: int) -> list:
+    """JSON dicts of `num_results` materials with a property and a child material each, as the API returns them."""
+    results = []
+    for i in range(num_results):
+        component = cript.Material(name=f"my component {i}", bigsmiles="{[][$]CC[$][]}")
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}", keyword=["homopolymer"])
+        material.component = [component]
+        material.property = [cript.Property(key="modulus_shear", type="value", value=5.0, unit="GPa")]
+        results.append(json.loads(material.get_expanded_json()))
+    return results
+
+
+def time_it(function, repeat: int = 3) -> float:
+    """Best time of `repeat` runs of `function` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def read_names_eager(results: list) -> list:
+    return [cript.load_nodes_from_json(result, _use_uuid_cache=dict())[0].name for result in results]
+
+
+def read_names_lazy(results: list) -> list:
+    return [cript.LazyNode(result).name for result in results]
+
+
+def materialize_lazy(results: list) -> None:
+    for result in results:
+        lazy_node = cript.LazyNode(result)
+        _ = lazy_node.name
+        lazy_node.materialize()
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        api.schema.skip_validation = True
+        print(f"{'results':>8} {'eager [s]':>10} {'lazy [s]':>10} {'lazy + materialize [s]':>23}")
+        for num_results in (100, 1000, 5000):
+            results = build_results(num_results)
+            assert read_names_lazy(results) == read_names_eager(results)
+
+            eager_time = time_it(lambda: read_names_eager(results))
+            lazy_time = time_it(lambda: read_names_lazy(results))
+            materialize_time = time_it(lambda: materialize_lazy(results))
+            print(f"{num_results:>8} {eager_time:>10.4f} {lazy_time:>10.4f} {materialize_time:>23.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark for the validation of large projects by multiple processes.
+
+Compares collecting all schema errors of a project in the current process
+with collecting them in a pool of worker processes, for growing numbers of experiments.
+The validation cache is cleared before every run, so every node is validated.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_parallel_validation.py
+```
+"""
+import logging
+import os
+import time
+
+import cript
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    with cript.deferred_validation():
+        for i in range(num_experiments):
+            material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+            quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+            ingredient = cript.Ingredient(material=material, quantity=[quantity])
+            process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+            experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+        collection = cript.Collection(name="my collection", experiment=experiments)
+        return cript.Project(name="my project", collection=[collection])
+
+
+def main() -> None:
+    max_workers = os.cpu_count()
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        print(f"{'experiments':>12} {'nodes':>8} {'serial [s]':>11} {f'{max_workers} workers [s]':>16}")
+        for num_experiments in (100, 1000, 5000):
+            api.schema.skip_validation = True
+            project = build_project(num_experiments)
+            api.schema.skip_validation = False
+            num_nodes = len(cript.nodes.node_iterator.NodeIterator(project))
+
+            api.schema.clear_validation_cache()
+            start = time.perf_counter()
+            cript.find_schema_errors(project, api=api)
+            serial_time = time.perf_counter() - start
+
+            api.schema.clear_validation_cache()
+            start = time.perf_counter()
+            cript.find_schema_errors(project, api=api, max_workers=max_workers)
+            parallel_time = time.perf_counter() - start
+
+            print(f"{num_experiments:>12} {num_nodes:>8} {serial_time:>11.3f} {parallel_time:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
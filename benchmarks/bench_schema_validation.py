@@ -0,0 +1,48 @@
+"""
+Micro-benchmark for the JSON schema validation of single nodes.
+
+Compares the previous approach of calling `jsonschema.validate` on the whole DB schema
+(which re-checks the meta-schema and rebuilds the validator on every call)
+with the pre-compiled validators of `DataSchema.is_node_schema_valid`.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_schema_validation.py
+```
+"""
+import copy
+import json
+import logging
+import timeit
+
+import jsonschema
+
+import cript
+
+
+def legacy_is_node_schema_valid(db_schema: dict, node_json: str) -> bool:
+    """Validation as it was done before validators were compiled once per schema load."""
+    node_dict = json.loads(node_json)
+    db_schema["$ref"] = f"#/$defs/{node_dict['node'][0]}Post"
+    jsonschema.validate(instance=node_dict, schema=db_schema)
+    return True
+
+
+def main(number: int = 20) -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+        project = cript.Project(name="my project", material=[material])
+        legacy_db_schema = copy.deepcopy(api.schema._db_schema)
+
+        for node in (material, project):
+            node_json = node.get_json().json
+
+            before = timeit.timeit(lambda: legacy_is_node_schema_valid(legacy_db_schema, node_json), number=number)
+            after = timeit.timeit(lambda: api.schema.is_node_schema_valid(node_json), number=number)
+
+            print(f"{node.node_type:<10} before: {number / before:>10.1f} validations/sec  after: {number / after:>10.1f} validations/sec  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark for the serialization of large projects.
+
+Compares the previous approach of `BaseNode.get_json`, which encoded the graph with `json.dumps`,
+parsed it again with `json.loads` and encoded it a second time,
+with the single-pass serialization that encodes the string directly from the nodes.
+Reports the time and the peak memory of a full serialization to a string.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_serialization.py
+```
+"""
+import inspect
+import json
+import logging
+import time
+import tracemalloc
+
+import cript
+from cript.nodes.util import NodeEncoder
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def legacy_get_json(node: cript.nodes.core.BaseNode) -> str:
+    """Serialization as it was done before, with a dump/load/dump round trip."""
+    condense_to_uuid = inspect.signature(cript.nodes.core.BaseNode.get_json).parameters["condense_to_uuid"].default
+    tmp_json = json.dumps(node, cls=NodeEncoder, check_circular=False, condense_to_uuid=condense_to_uuid)
+    tmp_dict = json.loads(tmp_json)
+    return json.dumps(tmp_dict, check_circular=False)
+
+
+def measure(function) -> tuple:
+    """Time of a run, and peak memory of a second run, since tracing the memory slows the function down."""
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak_memory
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        print(f"{'experiments':>12} {'before [s]':>11} {'after [s]':>10} {'before [MB]':>12} {'after [MB]':>11}")
+        for num_experiments in (100, 1000, 5000):
+            api.schema.skip_validation = True
+            project = build_project(num_experiments)
+            api.schema.skip_validation = False
+
+            legacy_json = legacy_get_json(project)
+            assert project.get_json().json == legacy_json
+
+            before_time, before_memory = measure(lambda: legacy_get_json(project))
+            after_time, after_memory = measure(lambda: project.get_json().json)
+
+            print(f"{num_experiments:>12} {before_time:>11.3f} {after_time:>10.3f} {before_memory / 1e6:>12.1f} {after_memory / 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
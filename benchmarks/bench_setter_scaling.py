@@ -0,0 +1,47 @@
+"""
+Scaling benchmark for attribute setters on growing node graphs.
+
+Setters validate only the modified node (children are represented as UID edges),
+so their cost should stay flat as the graph grows.
+For comparison, the cost of a full graph validation is listed as well,
+which is what every setter call used to do before.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_setter_scaling.py
+```
+"""
+import logging
+import timeit
+
+import cript
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process each."""
+    experiments = []
+    for i in range(num_experiments):
+        process = cript.Process(name=f"my process {i}", type="affinity_pure")
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def main(number: int = 20) -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        print(f"{'experiments':>12} {'setter [ms]':>12} {'full validation [ms]':>21}")
+        for num_experiments in (10, 100, 1000):
+            project = build_project(num_experiments)
+
+            def set_notes():
+                project.notes = "my project notes"
+
+            setter_time = timeit.timeit(set_notes, number=number) / number
+            full_time = timeit.timeit(lambda: project.validate(api=api), number=1)
+
+            print(f"{num_experiments:>12} {setter_time * 1e3:>12.3f} {full_time * 1e3:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
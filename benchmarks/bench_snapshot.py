@@ -0,0 +1,79 @@
+"""
+Benchmark of checkpointing a large project to a file and loading it again.
+
+Compares the binary snapshot format (`cript.dump_snapshot` / `cript.load_snapshot`)
+with the expanded JSON (`write_expanded_json` / `cript.load_nodes_from_json`).
+Both are loaded into a fresh UUID cache, so every node is created again.
+Reports the best of a few runs.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_snapshot.py
+```
+"""
+import logging
+import os
+import tempfile
+import time
+
+import cript
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def time_it(function, repeat: int = 3) -> float:
+    """Best time of `repeat` runs of `function` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def load_json(path: str) -> None:
+    with open(path) as file_handle:
+        cript.load_nodes_from_json(file_handle.read(), _use_uuid_cache=dict(), skip_validation=True)
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api, tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "project.json")
+        snapshot_path = os.path.join(directory, "project.snapshot")
+
+        print(f"{'experiments':>12} {'JSON save [s]':>14} {'JSON load [s]':>14} {'snapshot save [s]':>18} {'snapshot load [s]':>18} {'JSON [MB]':>10} {'snapshot [MB]':>14}")
+        for num_experiments in (100, 1000, 5000):
+            api.schema.skip_validation = True
+            project = build_project(num_experiments)
+
+            def save_json():
+                with open(json_path, "w") as file_handle:
+                    project.write_expanded_json(file_handle)
+
+            json_save_time = time_it(save_json)
+            json_load_time = time_it(lambda: load_json(json_path))
+            snapshot_save_time = time_it(lambda: cript.dump_snapshot(project, snapshot_path))
+            snapshot_load_time = time_it(lambda: cript.load_snapshot(snapshot_path, _use_uuid_cache=dict()))
+
+            loaded_project, _ = cript.load_snapshot(snapshot_path, _use_uuid_cache=dict())
+            assert loaded_project.get_expanded_json() == project.get_expanded_json()
+
+            json_size = os.path.getsize(json_path) / 1e6
+            snapshot_size = os.path.getsize(snapshot_path) / 1e6
+            print(f"{num_experiments:>12} {json_save_time:>14.3f} {json_load_time:>14.3f} {snapshot_save_time:>18.3f} {snapshot_load_time:>18.3f} {json_size:>10.2f} {snapshot_size:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark of creating nodes from JSON through their constructors and through the trusted fast path.
+
+Loads the parsed JSON of a project with many experiments with `cript.load_nodes_from_json`,
+once as usual and once with `trusted=True`, where `_from_json` fills the attributes of every node in one step.
+Both load into a fresh UUID cache, so every node is created again. Reports the best of a few runs in nodes per second.
+
+Requires the same environment variables as the tests: `CRIPT_HOST`, `CRIPT_TOKEN` and `CRIPT_STORAGE_TOKEN`.
+
+```bash
+python benchmarks/bench_trusted_from_json.py
+```
+"""
+import json
+import logging
+import time
+
+import cript
+
+
+def build_project(num_experiments: int) -> cript.Project:
+    """Build a project with one collection that holds `num_experiments` experiments with a process and its ingredient each."""
+    experiments = []
+    for i in range(num_experiments):
+        material = cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}")
+        quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+        ingredient = cript.Ingredient(material=material, quantity=[quantity])
+        process = cript.Process(name=f"my process {i}", type="affinity_pure", ingredient=[ingredient])
+        experiments.append(cript.Experiment(name=f"my experiment {i}", process=[process]))
+    collection = cript.Collection(name="my collection", experiment=experiments)
+    return cript.Project(name="my project", collection=[collection])
+
+
+def nodes_per_second(project_dict: dict, trusted: bool, repeat: int = 3) -> float:
+    """Best rate of `repeat` loads of `project_dict`."""
+    rates = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, uuid_cache = cript.load_nodes_from_json(project_dict, _use_uuid_cache=dict(), skip_validation=True, trusted=trusted)
+        rates.append(len(uuid_cache) / (time.perf_counter() - start))
+    return max(rates)
+
+
+def main() -> None:
+    with cript.API(host=None, api_token=None, storage_token=None, default_log_level=logging.WARNING) as api:
+        api.schema.skip_validation = True
+        print(f"{'experiments':>12} {'nodes':>8} {'constructor [nodes/s]':>22} {'trusted [nodes/s]':>18} {'speedup':>8}")
+        for num_experiments in (100, 1000, 5000):
+            project = build_project(num_experiments)
+            project_dict = json.loads(project.get_expanded_json())
+
+            loaded_project, uuid_cache = cript.load_nodes_from_json(project_dict, _use_uuid_cache=dict(), skip_validation=True, trusted=True)
+            assert loaded_project.get_expanded_json() == project.get_expanded_json()
+
+            constructor_rate = nodes_per_second(project_dict, trusted=False)
+            trusted_rate = nodes_per_second(project_dict, trusted=True)
+            print(f"{num_experiments:>12} {len(uuid_cache):>8} {constructor_rate:>22.0f} {trusted_rate:>18.0f} {trusted_rate / constructor_rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
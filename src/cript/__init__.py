@@ -24,6 +24,7 @@ from cript.nodes import (
     File,
     Ingredient,
     Inventory,
+    LazyNode,
     Material,
     NodeEncoder,
     Parameter,
@@ -36,5 +37,17 @@ from cript.nodes import (
     SoftwareConfiguration,
     User,
     add_orphaned_nodes_to_project,
+    deferred_validation,
+    dump_jsonl,
+    dump_snapshot,
+    find_orphaned_nodes,
+    find_schema_errors,
+    get_json_backend,
+    incremental_serialization,
+    load_jsonl,
     load_nodes_from_json,
+    load_snapshot,
+    register_node_class,
+    set_json_backend,
+    stream_nodes_from_json,
 )
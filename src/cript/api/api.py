@@ -1,11 +1,10 @@
 import copy
-import json
 import logging
 import os
 import traceback
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Set, Union
 
 import boto3
 import requests
@@ -24,13 +23,21 @@ from cript.api.paginator import Paginator
 from cript.api.utils.aws_s3_utils import get_s3_client
 from cript.api.utils.get_host_token import resolve_host_and_token
 from cript.api.utils.save_helper import (
+    _PATCH_IDENTITY_ATTRIBUTES,
+    _find_unchanged_uuids,
     _fix_node_save,
+    _get_patch_diff,
     _identify_suppress_attributes,
     _InternalSaveValues,
+    _KnownServerState,
+    _record_loaded_state,
+    _record_server_state,
 )
+from cript.api.utils.schema_cache import get_default_schema_cache_dir
 from cript.api.utils.web_file_downloader import download_file_from_url
 from cript.api.valid_search_modes import SearchModes
 from cript.nodes.primary_nodes.project import Project
+from cript.nodes.util.json_backend import _json_dumps
 
 # Do not use this directly! That includes devs.
 # Use the `_get_global_cached_api for access.
@@ -75,9 +82,26 @@ class API:
     # trunk-ignore-end(cspell)
 
     extra_api_log_debug_info: bool = False
+    prefetch_vocabulary: bool = False
+    _use_schema_cache: bool = False
+    _schema_cache_dir: Union[str, Path, None] = None
+    _schema_cache_offline_fallback: bool = False
+    _schema_bundle: Union[str, Path, None] = None
 
     @beartype
-    def __init__(self, host: Union[str, None] = None, api_token: Union[str, None] = None, storage_token: Union[str, None] = None, config_file_path: Union[str, Path] = "", default_log_level=logging.INFO):
+    def __init__(
+        self,
+        host: Union[str, None] = None,
+        api_token: Union[str, None] = None,
+        storage_token: Union[str, None] = None,
+        config_file_path: Union[str, Path] = "",
+        default_log_level=logging.INFO,
+        prefetch_vocabulary: bool = False,
+        use_schema_cache: bool = False,
+        schema_cache_dir: Union[str, Path, None] = None,
+        schema_cache_offline_fallback: bool = False,
+        schema_bundle: Union[str, Path, None] = None,
+    ):
         """
         Initialize CRIPT API client with host and token.
         Additionally, you can  use a config.json file and specify the file path.
@@ -177,6 +201,25 @@ class API:
             This token is used to upload local files to CRIPT cloud storage when needed
         config_file_path: str
             the file path to the config.json file where the token and host can be found
+        prefetch_vocabulary: bool
+            fetch all CRIPT controlled vocabulary categories concurrently when connecting,
+            instead of fetching each category lazily when it is first needed
+        use_schema_cache: bool
+            keep the node validation schema and the controlled vocabulary in an on-disk cache per host,
+            so connecting only reads a file while the cache is younger than `cript.api.DataSchema.schema_cache_ttl`.
+            Older cache entries are revalidated with the server.
+            While the cache is fresh, connecting sends no request, so a wrong host or token is only noticed
+            by the first request that needs the server, instead of raising a `CRIPTConnectionError` when connecting.
+        schema_cache_dir: Union[str, Path, None]
+            directory of the on-disk cache, if `use_schema_cache` is set.
+            If `None` is specified, the environment variable `CRIPT_SCHEMA_CACHE_DIR` or `~/.cache/cript/schema` is used.
+        schema_cache_offline_fallback: bool
+            use an outdated cache entry if the server cannot be reached, so nodes can be built offline.
+            Otherwise connecting fails in that case, like it does without a cache.
+        schema_bundle: Union[str, Path, None]
+            warm-start bundle written by `api.schema.export_bundle()`.
+            The schema and vocabulary are loaded from the bundle without any request to the server.
+            If `None` is specified, the bundle is inferred from the environment variable `CRIPT_SCHEMA_BUNDLE` if it is set.
 
 
         Notes
@@ -212,6 +255,13 @@ class API:
         self._host: str = host.rstrip("/")
         self._api_token = api_token  # type: ignore
         self._storage_token = storage_token  # type: ignore
+        self.prefetch_vocabulary = prefetch_vocabulary
+        self._use_schema_cache = use_schema_cache
+        self._schema_cache_dir = schema_cache_dir
+        self._schema_cache_offline_fallback = schema_cache_offline_fallback
+        self._schema_bundle = schema_bundle if schema_bundle is not None else os.environ.get("CRIPT_SCHEMA_BUNDLE")
+        # State of the nodes as they were last saved to this host, keyed by UUID
+        self._known_server_states: Dict[str, _KnownServerState] = {}
 
         # set a logger instance to use for the class logs
         self._init_logger(default_log_level)
@@ -332,7 +382,12 @@ class API:
 
         # As a form to check our connection, we pull and establish the data schema
         try:
-            self._db_schema = DataSchema(self)
+            schema_cache_dir = None
+            if self._use_schema_cache:
+                schema_cache_dir = self._schema_cache_dir if self._schema_cache_dir is not None else get_default_schema_cache_dir()
+            self._db_schema = DataSchema(self, cache_dir=schema_cache_dir, bundle_path=self._schema_bundle, cache_offline_fallback=self._schema_cache_offline_fallback)
+            if self.prefetch_vocabulary:
+                self._db_schema.prefetch_vocabulary()
         except APIError as exc:
             raise CRIPTConnectionError(self.host, self._api_token) from exc
 
@@ -461,9 +516,6 @@ class API:
         while response["code"] != 200:
             # Keep a record of how the state was before the loop
             old_save_values = copy.deepcopy(save_values)
-            # We assemble the JSON to be saved to back end.
-            # Note how we exclude pre-saved uuid nodes.
-            json_data = node.get_json(known_uuid=save_values.saved_uuid, suppress_attributes=save_values.suppress_attributes).json
 
             # This checks if the current node exists on the back end.
             # if it does exist we use `patch` if it doesn't `post`.
@@ -474,13 +526,31 @@ class API:
             if not patch_request and force_patch:
                 patch_request = True
                 force_patch = False
-            # TODO activate patch validation
-            # node.validate(is_patch=patch_request)
 
-            # If all that is left is a UUID, we don't need to save it, we can just exit the loop.
-            if patch_request and len(json.loads(json_data)) == 1:
-                response = {"code": 200}
-                break
+            known_uuid = save_values.saved_uuid
+            unchanged_uuids: Set[str] = set()
+            if patch_request:
+                # Nodes that did not change since they were last saved or loaded are sent as UUID edges only
+                unchanged_uuids = _find_unchanged_uuids(node, self._known_server_states)
+                known_uuid = known_uuid.union(unchanged_uuids)
+
+            # We assemble the JSON to be saved to back end.
+            # Note how we exclude pre-saved uuid nodes.
+            json_return = node.get_json(known_uuid=known_uuid, suppress_attributes=save_values.suppress_attributes)
+            json_data = json_return.json
+
+            if patch_request:
+                # Only the attributes that changed since the last save are patched
+                patch_dict = _get_patch_diff(node, json_return.json_dict, self._known_server_states, unchanged_uuids)
+                if patch_dict is not json_return.json_dict:
+                    # Patches do not allow the UUID in the parent most node, the URL identifies it
+                    self.schema.is_node_schema_valid(_json_dumps({key: value for key, value in patch_dict.items() if key != "uuid"}), is_patch=True)
+                    json_data = _json_dumps(patch_dict)
+
+                # If all that is left is a UUID, we don't need to save it, we can just exit the loop.
+                if patch_dict.keys() <= set(_PATCH_IDENTITY_ATTRIBUTES):
+                    response = {"code": 200}
+                    break
 
             method = "POST"
             url_path = f"/{node.node_type_snake_case}/"
@@ -532,9 +602,18 @@ class API:
         if response["code"] != 200:
             raise CRIPTAPISaveError(api_host_domain=self._host, http_code=response["code"], api_response=response["error"], patch_request=patch_request, pre_saved_nodes=save_values.saved_uuid, json_data=json_data)  # type: ignore
 
+        # Remember what the API stores now, so the next save of these nodes only sends what changed
+        _record_server_state(node, json_return.handled_ids, save_values, self._known_server_states)
         save_values.saved_uuid.add(str(node.uuid))
         return save_values
 
+    def _record_loaded_nodes(self, node_json: Any) -> None:
+        """
+        Remembers the state of nodes that were just loaded from a response of this API,
+        so that saving them later only sends what changed after loading.
+        """
+        _record_loaded_state(node_json, self._known_server_states)
+
     def upload_file(self, file_path: Union[Path, str]) -> str:
         # trunk-ignore-begin(cspell)
         """
@@ -977,7 +1056,7 @@ class API:
           Time out to be used for the request call.
 
         kwargs
-          additional keyword arguments that are passed to `request.request`
+          additional keyword arguments that are passed to `request.request`.
         """
 
         url: str = self.host
@@ -993,6 +1072,7 @@ class API:
 
         if self._api_request_session is None:
             raise CRIPTAPIRequiredError
+
         response: requests.Response = self._api_request_session.request(url=url, method=method, timeout=timeout, **kwargs)
         post_log_message: str = f"Request return with {response.status_code}"
         if self.extra_api_log_debug_info:
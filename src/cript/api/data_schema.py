@@ -1,15 +1,43 @@
+import hashlib
 import json
-from typing import Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
 
 import jsonschema
+import requests
 from beartype import beartype
 
-from cript.api.exceptions import APIError, InvalidVocabulary
+from cript.api.exceptions import APIError, CRIPTSchemaBundleError, InvalidVocabulary
 from cript.api.utils.helper_functions import _get_node_type_from_json
-from cript.api.vocabulary_categories import VocabCategories
+from cript.api.utils.schema_cache import (
+    _SCHEMA_CACHE_FORMAT_VERSION,
+    _read_schema_cache_file,
+    _SchemaCache,
+    _write_schema_cache_file,
+)
+from cript.api.utils.schema_codegen import compile_schema_validators
+from cript.api.utils.validation_cache import ValidationCacheInfo, _ValidationCache
+from cript.api.vocabulary_categories import (
+    _NODE_VOCAB_ATTRIBUTES,
+    _PROPERTY_KEY_VOCAB,
+    VocabCategories,
+)
 from cript.nodes.exceptions import CRIPTNodeSchemaError
 
 
+def _compile_node_validator(db_schema: dict, schema_definition: str) -> jsonschema.protocols.Validator:
+    """
+    Compiles a `jsonschema` validator for a single definition (e.g. `MaterialPost`) of a DB schema.
+    """
+    node_schema = dict(db_schema)
+    node_schema["$ref"] = f"#/$defs/{schema_definition}"
+
+    validator_class = jsonschema.validators.validator_for(node_schema)
+    return validator_class(node_schema)
+
+
 class DataSchema:
     """
     ## Definition
@@ -17,14 +45,35 @@ class DataSchema:
     """
 
     _vocabulary: dict = {}
+    # Vocabulary of each category indexed by name, e.g. `{"file_type": {"calibration": {...}}}` for O(1) look ups.
+    _vocabulary_index: Dict[str, Dict[str, dict]] = {}
     _db_schema: dict = {}
+    # Compiled validators for every `{NodeType}Post` and `{NodeType}Patch` definition of the DB schema.
+    # Built once per schema load, so validating a node does not re-check the meta-schema every time.
+    _node_validators: Dict[str, jsonschema.protocols.Validator] = {}
+    # Plain-Python functions generated from the same definitions, that only check if a node is valid.
+    # Definitions that cannot be generated exactly are missing here, and only use the compiled validators.
+    _generated_node_validators: Dict[str, Callable[[Any], bool]] = {}
     # Advanced User Tip: Disabling Node Validation
     # For experienced users, deactivating node validation during creation can be a time-saver.
     # Note that the complete node graph will still undergo validation before being saved to the back end.
     # Caution: It's advisable to keep validation active while debugging scripts, as disabling it can delay error notifications and complicate the debugging process.
     skip_validation: bool = False
-
-    def __init__(self, api):
+    # Number of valid node JSON documents that are remembered, so unchanged nodes are not validated again.
+    # Set to 0 before connecting to disable the cache.
+    validation_cache_size: int = 10_000
+    _validation_cache: _ValidationCache
+    # Seconds the on-disk copy of the DB schema and vocabulary is used without asking the server.
+    # Afterwards the schema is revalidated with a conditional request, and the vocabulary is fetched again when needed.
+    schema_cache_ttl: float = 3600.0
+    _schema_cache: Optional[_SchemaCache] = None
+    _cache_offline_fallback: bool = False
+    _schema_version: str = ""
+    _schema_fetched_at: float = 0.0
+    _schema_etag: Optional[str] = None
+    _schema_last_modified: Optional[str] = None
+
+    def __init__(self, api, cache_dir: Union[str, Path, None] = None, bundle_path: Union[str, Path, None] = None, cache_offline_fallback: bool = False):
         """
         Initialize DataSchema class with a full hostname to fetch the node validation schema.
 
@@ -34,12 +83,81 @@ class DataSchema:
         >>> import cript
         >>> with cript.API(host="https://api.criptapp.org/") as api:
         ...    data_schema = cript.api.DataSchema(api)
+
+        Parameters
+        ----------
+        api: cript.API
+            API the schema and vocabulary are fetched with
+        cache_dir: Union[str, Path, None]
+            directory of the on-disk schema and vocabulary cache, no on-disk cache is used if `None`
+        bundle_path: Union[str, Path, None]
+            warm-start bundle written by `DataSchema.export_bundle`.
+            The schema and vocabulary are read from it without any request to the server.
+        cache_offline_fallback: bool
+            use an outdated on-disk cache entry if the server cannot be reached, instead of raising the error
+
+        Raises
+        ------
+        CRIPTSchemaBundleError
+            if the warm-start bundle cannot be loaded
         """
         self._api = api
+        self._cache_offline_fallback = cache_offline_fallback
         self._vocabulary = {}
-        self._db_schema = self._get_db_schema()
+        self._vocabulary_index = {}
+
+        schema_version: Optional[str] = None
+        if bundle_path is not None:
+            bundle = _read_schema_cache_file(bundle_path)
+            if bundle is None:
+                raise CRIPTSchemaBundleError(bundle_path=str(bundle_path))
+            schema_version = self._restore_schema_cache_entry(bundle, restore_vocabulary=True)
+        else:
+            if cache_dir is not None:
+                self._schema_cache = _SchemaCache(cache_dir=cache_dir, host=f"{api.host}/{api.api_prefix}/{api.api_version}")
+            schema_version = self._load_db_schema()
+
+        # A cached schema was already checked against its meta-schema when it was downloaded
+        self._node_validators = self._build_node_validators(check_schema=schema_version is None)
+        self._generated_node_validators = compile_schema_validators(self._db_schema, list(self._node_validators))
+        if schema_version is None:
+            schema_version = self._get_db_schema_version()
+            self._schema_version = schema_version
+            self._store_schema_cache()
+        self._validation_cache = _ValidationCache(schema_version=schema_version, maxsize=self.validation_cache_size)
+
+    def _get_db_schema_version(self) -> str:
+        """
+        Fingerprint of the loaded DB schema, so validation results of different schemas are never mixed up.
+        """
+        return hashlib.sha256(json.dumps(self._db_schema, sort_keys=True).encode()).hexdigest()
 
-    def _get_db_schema(self) -> dict:
+    @property
+    def validation_cache_info(self) -> ValidationCacheInfo:
+        """
+        Hits, misses and size of the cache of valid node JSON documents.
+
+        Examples
+        --------
+        >>> import os
+        >>> import cript
+        >>> with cript.API(
+        ...     host="https://api.criptapp.org/",
+        ...     api_token=os.getenv("CRIPT_TOKEN"),
+        ...     storage_token=os.getenv("CRIPT_STORAGE_TOKEN")
+        ... ) as api:
+        ...     print(api.schema.validation_cache_info)  # doctest: +SKIP
+        ValidationCacheInfo(hits=0, misses=0, maxsize=10000, currsize=0)
+        """
+        return self._validation_cache.info()
+
+    def clear_validation_cache(self) -> None:
+        """
+        Forget all cached validation results and reset the hit and miss counters.
+        """
+        self._validation_cache.clear()
+
+    def _get_db_schema(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[dict]:
         """
         Sends a GET request to CRIPT to get the database schema and returns it.
         The database schema can be used for validating the JSON request
@@ -50,16 +168,31 @@ class DataSchema:
         2. if db schema has not been set yet, then it fetches it from the API
             * after getting it from the API it saves it in the `_schema` class variable,
             so it can be easily and efficiently gotten next time
+        3. if `etag` or `last_modified` of a cached schema are given, the request is conditional
+            * returns `None` if the server reports that the cached schema is still up-to-date
         """
 
         # check if db schema is already saved
         if bool(self._db_schema):
             return self._db_schema
 
+        # revalidate a cached schema instead of downloading it again
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
         # fetch db_schema from API
         self._api.logger.info(f"Loading node validation schema from {self._api.host}/schema/")
         # fetch db schema from API
-        response: dict = self._api._capsule_request(url_path="/schema/", method="GET").json()
+        raw_response: requests.Response = self._api._capsule_request(url_path="/schema/", method="GET", headers=headers)
+
+        if raw_response.status_code == 304:
+            self._api.logger.info(f"Cached node validation schema of {self._api.host}/schema/ is up-to-date.")
+            return None
+
+        response: dict = raw_response.json()
 
         # raise error if not HTTP 200
         if response["code"] != 200:
@@ -67,11 +200,205 @@ class DataSchema:
 
         self._api.logger.info(f"Loading node validation schema from {self._api.host}/schema/ was successful.")
 
+        self._schema_etag = raw_response.headers.get("ETag")
+        self._schema_last_modified = raw_response.headers.get("Last-Modified")
+        self._schema_fetched_at = time.time()
+
         # get the data from the API JSON response
         db_schema = response["data"]
 
         return db_schema
 
+    def _load_db_schema(self) -> Optional[str]:
+        """
+        Loads the DB schema from the on-disk cache or from the server.
+
+        1. a cached schema younger than `schema_cache_ttl` is used without any request
+        1. an older cached schema is revalidated with a conditional request
+            * if the server cannot be reached and the offline fallback is enabled, the older cached schema is used,
+            so nodes can be built offline
+        1. without a cached schema, the schema is downloaded
+
+        Returns
+        -------
+        Optional[str]
+            version of the schema if it was loaded from the cache, `None` if it was downloaded
+        """
+        cached_entry: Optional[dict] = None
+        if self._schema_cache is not None:
+            cached_entry = self._schema_cache.load()
+
+        if cached_entry is None:
+            self._db_schema = self._get_db_schema()
+            return None
+
+        if _SchemaCache.is_fresh(cached_entry, self.schema_cache_ttl):
+            self._api.logger.info(f"Loading node validation schema from cache {self._schema_cache.file_path}")  # type: ignore
+            return self._restore_schema_cache_entry(cached_entry, restore_vocabulary=True)
+
+        try:
+            db_schema = self._get_db_schema(etag=cached_entry.get("etag"), last_modified=cached_entry.get("last_modified"))
+        except requests.exceptions.RequestException as exc:
+            if not self._cache_offline_fallback:
+                raise
+            self._api.logger.warning(f"Could not revalidate the cached node validation schema ({exc}), using the cached schema offline.")
+            return self._restore_schema_cache_entry(cached_entry, restore_vocabulary=True)
+
+        if db_schema is not None:
+            self._db_schema = db_schema
+            return None
+
+        # The schema is unchanged, but the vocabulary may not be, so only the schema is reused
+        schema_version = self._restore_schema_cache_entry(cached_entry, restore_vocabulary=False)
+        self._schema_fetched_at = time.time()
+        self._store_schema_cache()
+        return schema_version
+
+    def _restore_schema_cache_entry(self, entry: dict, restore_vocabulary: bool) -> str:
+        """
+        Sets the DB schema, and optionally the vocabulary, from an on-disk cache entry or warm-start bundle.
+
+        Returns
+        -------
+        str
+            version of the restored schema
+        """
+        self._db_schema = entry["db_schema"]
+        self._schema_version = entry.get("schema_version") or self._get_db_schema_version()
+        self._schema_fetched_at = float(entry.get("fetched_at", 0))
+        self._schema_etag = entry.get("etag")
+        self._schema_last_modified = entry.get("last_modified")
+
+        if restore_vocabulary:
+            for category_value, vocabulary in entry.get("vocabulary", {}).items():
+                self._vocabulary[category_value] = vocabulary
+                self._vocabulary_index[category_value] = {vocab_dict.get("name"): vocab_dict for vocab_dict in vocabulary}
+
+        return self._schema_version
+
+    def _get_schema_cache_entry(self) -> dict:
+        """
+        The DB schema and all vocabulary fetched so far, in the format of the on-disk cache and warm-start bundles.
+        """
+        return {
+            "format_version": _SCHEMA_CACHE_FORMAT_VERSION,
+            "db_schema": self._db_schema,
+            "schema_version": self._schema_version,
+            "vocabulary": self._vocabulary,
+            "fetched_at": self._schema_fetched_at,
+            "etag": self._schema_etag,
+            "last_modified": self._schema_last_modified,
+        }
+
+    def _store_schema_cache(self) -> None:
+        """
+        Writes the DB schema and all vocabulary fetched so far to the on-disk cache, if it is enabled.
+        """
+        if self._schema_cache is not None:
+            self._schema_cache.store(self._get_schema_cache_entry())
+
+    @beartype
+    def export_bundle(self, file_path: Union[str, Path], include_vocabulary: bool = True) -> None:
+        """
+        Writes a warm-start bundle of the DB schema and the controlled vocabulary to a file.
+
+        Processes that load the bundle with `cript.API(..., schema_bundle=file_path)`
+        do not send any request to get the schema or vocabulary, and can build and validate nodes offline.
+        This is useful to start many short-lived workers from a single download.
+
+        Examples
+        --------
+        >>> import os
+        >>> import cript
+        >>> with cript.API(
+        ...     host="https://api.criptapp.org/",
+        ...     api_token=os.getenv("CRIPT_TOKEN"),
+        ...     storage_token=os.getenv("CRIPT_STORAGE_TOKEN")
+        ... ) as api:
+        ...     api.schema.export_bundle("cript_schema_bundle.json")  # doctest: +SKIP
+
+        Parameters
+        ----------
+        file_path: Union[str, Path]
+            file the bundle is written to
+        include_vocabulary: bool
+            fetch all controlled vocabulary categories and include them in the bundle,
+            otherwise only the already fetched categories are included
+
+        Returns
+        -------
+        None
+        """
+        if include_vocabulary:
+            self.prefetch_vocabulary()
+
+        entry = self._get_schema_cache_entry()
+        entry["host"] = f"{self._api.host}/{self._api.api_prefix}/{self._api.api_version}"
+        _write_schema_cache_file(file_path, entry)
+
+    def _build_node_validator(self, schema_definition: str) -> jsonschema.protocols.Validator:
+        """
+        Compiles a validator for a single definition (e.g. `MaterialPost`) of the DB schema.
+
+        The validator references the definition via `$ref` on a shallow copy of the DB schema,
+        so the shared `_db_schema` dict is never modified and `$defs` are not copied.
+        """
+        return _compile_node_validator(self._db_schema, schema_definition)
+
+    def _build_node_validators(self, check_schema: bool = True) -> Dict[str, jsonschema.protocols.Validator]:
+        """
+        Checks the DB schema against its meta-schema once and compiles a validator
+        for every `{NodeType}Post` and `{NodeType}Patch` definition in it.
+
+        Parameters
+        ----------
+        check_schema: bool
+            check the DB schema against its meta-schema, not needed for schemas that were checked before caching them
+
+        Returns
+        -------
+        Dict[str, jsonschema.protocols.Validator]
+            validators keyed by their schema definition name, e.g. `{"MaterialPost": <Validator>}`
+        """
+        if check_schema:
+            jsonschema.validators.validator_for(self._db_schema).check_schema(self._db_schema)
+
+        node_validators = {}
+        for schema_definition in self._db_schema.get("$defs", {}):
+            if schema_definition.endswith("Post") or schema_definition.endswith("Patch"):
+                node_validators[schema_definition] = self._build_node_validator(schema_definition)
+
+        return node_validators
+
+    @staticmethod
+    def _get_schema_definition(node_type: str, is_patch: bool = False) -> str:
+        """
+        Name of the DB schema definition for a node type and HTTP method, e.g. `MaterialPost`.
+        """
+        # set the schema to test against http POST or PATCH of DB Schema
+        schema_http_method: str
+
+        if is_patch:
+            schema_http_method = "Patch"
+        else:
+            schema_http_method = "Post"
+
+        return f"{node_type}{schema_http_method}"
+
+    def _get_node_validator(self, node_type: str, is_patch: bool = False) -> jsonschema.protocols.Validator:
+        """
+        Returns the compiled validator for a node type and HTTP method.
+        Unknown definitions are compiled on demand and then cached like the others.
+        """
+        schema_definition: str = self._get_schema_definition(node_type=node_type, is_patch=is_patch)
+
+        try:
+            return self._node_validators[schema_definition]
+        except KeyError:
+            node_validator = self._build_node_validator(schema_definition)
+            self._node_validators[schema_definition] = node_validator
+            return node_validator
+
     def _fetch_vocab_entry(self, category: VocabCategories):
         """
         Fetches one the CRIPT controlled vocabulary and stores it in self._vocabulary
@@ -84,8 +411,50 @@ class DataSchema:
         if response["code"] != 200:
             raise APIError(api_error=str(response), http_method="GET", api_url=vocabulary_category_url)
         # add to cache
+        self._vocabulary_index[category.value] = {vocab_dict.get("name"): vocab_dict for vocab_dict in response["data"]}
         self._vocabulary[category.value] = response["data"]
 
+    @beartype
+    def prefetch_vocabulary(self, categories: Optional[List[VocabCategories]] = None, max_workers: int = 8) -> None:
+        """
+        Fetches multiple CRIPT controlled vocabulary categories concurrently and caches them,
+        instead of fetching each category lazily with a blocking request when it is first needed.
+
+        Examples
+        --------
+        >>> import os
+        >>> import cript
+        >>> with cript.API(
+        ...     host="https://api.criptapp.org/",
+        ...     api_token=os.getenv("CRIPT_TOKEN"),
+        ...     storage_token=os.getenv("CRIPT_STORAGE_TOKEN")
+        ... ) as api:
+        ...     api.schema.prefetch_vocabulary()  # doctest: +SKIP
+
+        Parameters
+        ----------
+        categories: Optional[List[VocabCategories]]
+            categories to fetch, all categories if `None`. Already cached categories are not fetched again.
+        max_workers: int
+            maximum number of concurrent requests
+
+        Returns
+        -------
+        None
+        """
+        if categories is None:
+            categories = list(VocabCategories)
+
+        missing_categories = [category for category in categories if category.value not in self._vocabulary]
+        if len(missing_categories) == 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results, so exceptions of the requests are raised here
+            list(executor.map(self._fetch_vocab_entry, missing_categories))
+
+        self._store_schema_cache()
+
     @beartype
     def get_vocab_by_category(self, category: VocabCategories) -> list:
         """
@@ -116,6 +485,7 @@ class DataSchema:
             return self._vocabulary[category.value]
         except KeyError:
             self._fetch_vocab_entry(category)
+            self._store_schema_cache()
             return self._vocabulary[category.value]
 
     @beartype
@@ -154,16 +524,111 @@ class DataSchema:
         # get just the category needed
         controlled_vocabulary = self.get_vocab_by_category(vocab_category)
 
-        # TODO this can be faster with a dict of dicts that can do o(1) look up
-        #  looping through an unsorted list is an O(n) look up which is slow
-        # loop through the list
-        for vocab_dict in controlled_vocabulary:
-            # check the name exists within the dict
-            if vocab_dict.get("name") == vocab_word:
-                return True
+        if vocab_word in self._vocabulary_index[vocab_category.value]:
+            return True
 
         raise InvalidVocabulary(vocab=vocab_word, possible_vocab=list(controlled_vocabulary))
 
+    def find_invalid_vocab(self, node) -> Dict[VocabCategories, Set[str]]:
+        """
+        Collects all CRIPT controlled vocabulary words used in a node graph,
+        and checks them against the controlled vocabulary at once.
+
+        All needed vocabulary categories are fetched concurrently
+        and every category is checked with a single set difference.
+
+        Examples
+        --------
+        >>> import cript
+        >>> my_project = cript.Project(name="my project")
+        >>> invalid_vocab = api.schema.find_invalid_vocab(my_project)  # doctest: +SKIP
+
+        Parameters
+        ----------
+        node: BaseNode
+            root node of the graph to check, for example a `Project`
+
+        Returns
+        -------
+        Dict[VocabCategories, Set[str]]
+            invalid words by vocabulary category, empty if all vocabulary in the graph is valid
+        """
+        from cript.nodes.core import BaseNode
+        from cript.nodes.node_iterator import NodeIterator
+
+        def add_words(category: VocabCategories, value) -> None:
+            # keywords are lists of vocabulary, other attributes are single words
+            if not isinstance(value, list):
+                value = [value]
+            for word in value:
+                if isinstance(word, str) and word:
+                    used_vocab.setdefault(category, set()).add(word)
+
+        used_vocab: Dict[VocabCategories, Set[str]] = {}
+        for graph_node in NodeIterator(node):
+            for attribute, category in _NODE_VOCAB_ATTRIBUTES.get(graph_node.node_type, {}).items():
+                add_words(category, getattr(graph_node._json_attrs, attribute))
+
+            property_key_category = _PROPERTY_KEY_VOCAB.get(graph_node.node_type)
+            if property_key_category is not None:
+                for property_node in graph_node._json_attrs.property:
+                    if isinstance(property_node, BaseNode):
+                        add_words(property_key_category, property_node._json_attrs.key)
+
+        self.prefetch_vocabulary(categories=list(used_vocab))
+
+        invalid_vocab: Dict[VocabCategories, Set[str]] = {}
+        for category, words in used_vocab.items():
+            invalid_words = words - self._vocabulary_index[category.value].keys()
+            if invalid_words:
+                invalid_vocab[category] = invalid_words
+
+        return invalid_vocab
+
+    @beartype
+    def iter_node_schema_errors(self, node_json: str, is_patch: bool = False) -> Iterator[jsonschema.exceptions.ValidationError]:
+        """
+        Yields every schema error of a node JSON, instead of raising only the most relevant one.
+
+        This ignores `skip_validation`, since it is only called if errors are explicitly requested.
+
+        Parameters
+        ----------
+        node_json: str
+            a node in JSON form string
+        is_patch: bool
+            a boolean flag checking if it needs to validate against `NodePost` or `NodePatch`
+
+        Returns
+        -------
+        Iterator[jsonschema.exceptions.ValidationError]
+            the most relevant error of each violated part of the schema, nothing if the node is valid
+        """
+        cache_key: str = self._validation_cache.get_key(node_json=node_json, is_patch=is_patch)
+        if self._validation_cache.is_known_valid(cache_key):
+            return
+
+        yield from self._iter_uncached_node_schema_errors(node_json, is_patch=is_patch, cache_key=cache_key)
+
+    def _iter_uncached_node_schema_errors(self, node_json: str, is_patch: bool, cache_key: str) -> Iterator[jsonschema.exceptions.ValidationError]:
+        """
+        `iter_node_schema_errors` for a node JSON that is not in the validation cache, its cache key is already known.
+        """
+        node_dict = json.loads(node_json)
+        node_type: str = _get_node_type_from_json(node_json=node_dict)
+
+        generated_node_validator = self._generated_node_validators.get(self._get_schema_definition(node_type=node_type, is_patch=is_patch))
+        if generated_node_validator is None or not generated_node_validator(node_dict):
+            is_valid = True
+            for error in self._get_node_validator(node_type=node_type, is_patch=is_patch).iter_errors(node_dict):
+                is_valid = False
+                # For errors of `anyOf` and similar, descend to the error that explains the problem best
+                yield jsonschema.exceptions.best_match([error])
+            if not is_valid:
+                return
+
+        self._validation_cache.add(cache_key)
+
     @beartype
     def is_node_schema_valid(self, node_json: str, is_patch: bool = False, force_validation: bool = False) -> Union[bool, None]:
         """
@@ -203,12 +668,15 @@ class DataSchema:
         if self.skip_validation and not force_validation:
             return None
 
-        db_schema = self._db_schema
-
-        node_type: str = _get_node_type_from_json(node_json=node_json)
+        # Nodes that did not change since their last successful validation, are still valid
+        cache_key: str = self._validation_cache.get_key(node_json=node_json, is_patch=is_patch)
+        if self._validation_cache.is_known_valid(cache_key):
+            return True
 
         node_dict = json.loads(node_json)
 
+        node_type: str = _get_node_type_from_json(node_json=node_dict)
+
         # logging out info to the terminal for the user feedback
         # (improve UX because the program is currently slow)
         log_message = f"Validating {node_type} graph"
@@ -229,21 +697,18 @@ class DataSchema:
 
         self._api.logger.info(log_message)
 
-        # set the schema to test against http POST or PATCH of DB Schema
-        schema_http_method: str
+        # the generated validator is a lot faster, but can only tell if the node is valid.
+        generated_node_validator = self._generated_node_validators.get(self._get_schema_definition(node_type=node_type, is_patch=is_patch))
+        if generated_node_validator is None or not generated_node_validator(node_dict):
+            # get the pre-compiled validator for this node type, instead of re-checking the whole DB schema
+            node_validator = self._get_node_validator(node_type=node_type, is_patch=is_patch)
 
-        if is_patch:
-            schema_http_method = "Patch"
-        else:
-            schema_http_method = "Post"
+            # `best_match` picks the same error that `jsonschema.validate` would raise
+            error = jsonschema.exceptions.best_match(node_validator.iter_errors(node_dict))
+            if error is not None:
+                raise CRIPTNodeSchemaError(node_type=node_dict["node"], json_schema_validation_error=str(error)) from error
 
-        # set which node you are using schema validation for
-        db_schema["$ref"] = f"#/$defs/{node_type}{schema_http_method}"
-
-        try:
-            jsonschema.validate(instance=node_dict, schema=db_schema)
-        except jsonschema.exceptions.ValidationError as error:
-            raise CRIPTNodeSchemaError(node_type=node_dict["node"], json_schema_validation_error=str(error)) from error
+        self._validation_cache.add(cache_key)
 
         # if validation goes through without any problems return True
         return True
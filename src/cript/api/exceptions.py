@@ -284,3 +284,22 @@ class FileDownloadError(CRIPTException):
 
     def __str__(self) -> str:
         return self.error_message
+
+
+class CRIPTSchemaBundleError(CRIPTException):
+    """
+    ## Definition
+    Raised when a warm-start bundle of the DB schema and vocabulary cannot be loaded.
+
+    ## Troubleshooting
+    Check that the path points to a file written by `cript.API.schema.export_bundle()`
+    with the same version of the CRIPT Python SDK.
+    """
+
+    bundle_path: str = ""
+
+    def __init__(self, bundle_path: str) -> None:
+        self.bundle_path = bundle_path
+
+    def __str__(self) -> str:
+        return f"The schema bundle `{self.bundle_path}` does not exist, is corrupt, or was written by an incompatible version of the CRIPT Python SDK."
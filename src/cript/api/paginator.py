@@ -6,7 +6,8 @@ import requests
 from beartype import beartype
 
 from cript.api.exceptions import APIError
-from cript.nodes.util import load_nodes_from_json
+from cript.nodes.util import LazyNode, load_nodes_from_json
+from cript.nodes.util.json_backend import _json_loads
 
 
 def _get_uuid_score_from_json(node_dict: Dict) -> Tuple[str, Optional[float]]:
@@ -35,6 +36,11 @@ class Paginator:
         Please note that you are not required or advised to create a paginator object, and instead the
         Python SDK API object will create a paginator for you, return it, and let you simply use it
 
+    With `auto_load_nodes` disabled, the paginator returns the JSON dicts of the nodes as the API sent them.
+    With `lazy_load_nodes` enabled, it returns a `cript.LazyNode` for every result instead,
+    that reads plain attributes like `name` from the JSON and creates the node with all its children only on first use.
+    This is much faster for searches, where most results are only looked at briefly.
+
     """
 
     _url_path: str
@@ -47,6 +53,7 @@ class Paginator:
     _start_after_uuid: Optional[str] = None
     _start_after_score: Optional[float] = None
     auto_load_nodes: bool = True
+    lazy_load_nodes: bool = False
 
     @beartype
     def __init__(self, api, url_path: str, query: str, limit_node_fetches: Optional[int] = None):
@@ -145,7 +152,7 @@ class Paginator:
         # it is expected that the response will be JSON
         # try to convert response to JSON
         try:
-            api_response: Dict = response.json()
+            api_response: Dict = _json_loads(response.content)
 
         # if converting API response to JSON gives an error
         # then there must have been an API error, so raise the requests error
@@ -190,8 +197,12 @@ class Paginator:
             # The iteration stops
             raise StopIteration from exc
 
-        if self.auto_load_nodes:
-            return_data = load_nodes_from_json(next_node_json)
+        if self.auto_load_nodes and self.lazy_load_nodes:
+            return_data = LazyNode(next_node_json, api=self._api)
+        elif self.auto_load_nodes:
+            # Nodes sent by the API are validated after loading, their constructors don't need to check them
+            return_data = load_nodes_from_json(next_node_json, trusted=True)
+            self._api._record_loaded_nodes(next_node_json)
         else:
             return_data = next_node_json
 
@@ -0,0 +1,86 @@
+"""
+Validation of node JSON in a pool of worker processes.
+
+Every worker receives the DB schema once when it starts, and compiles its own validators.
+Afterwards only lists of node JSON strings are sent to the workers, and lists of errors are sent back.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jsonschema
+
+from cript.api.data_schema import _compile_node_validator
+from cript.api.utils.helper_functions import _get_node_type_from_json
+from cript.api.utils.schema_codegen import compile_schema_validators
+
+# DB schema and validators of a worker process, set by `_init_validation_worker` when the worker starts.
+_worker_db_schema: dict = {}
+_worker_node_validators: Dict[str, jsonschema.protocols.Validator] = {}
+_worker_generated_node_validators: Dict[str, Callable[[Any], bool]] = {}
+
+
+def _init_validation_worker(db_schema: dict) -> None:
+    global _worker_db_schema, _worker_node_validators, _worker_generated_node_validators
+
+    _worker_db_schema = db_schema
+    _worker_node_validators = {}
+    schema_definitions = [schema_definition for schema_definition in db_schema.get("$defs", {}) if schema_definition.endswith("Post") or schema_definition.endswith("Patch")]
+    _worker_generated_node_validators = compile_schema_validators(db_schema, schema_definitions)
+
+
+def _validate_node_json_partition(partition: List[str], is_patch: bool) -> List[List[Tuple[str, str]]]:
+    """
+    Validates the node JSON strings of one partition inside a worker process.
+
+    Returns
+    -------
+    List[List[Tuple[str, str]]]
+        JSON path and message of every error, for each node JSON of the partition
+    """
+    schema_http_method: str = "Patch" if is_patch else "Post"
+
+    partition_errors: List[List[Tuple[str, str]]] = []
+    for node_json in partition:
+        node_dict = json.loads(node_json)
+        schema_definition: str = f"{_get_node_type_from_json(node_json=node_dict)}{schema_http_method}"
+
+        node_errors: List[Tuple[str, str]] = []
+        generated_node_validator = _worker_generated_node_validators.get(schema_definition)
+        if generated_node_validator is None or not generated_node_validator(node_dict):
+            try:
+                node_validator = _worker_node_validators[schema_definition]
+            except KeyError:
+                node_validator = _compile_node_validator(_worker_db_schema, schema_definition)
+                _worker_node_validators[schema_definition] = node_validator
+
+            for error in node_validator.iter_errors(node_dict):
+                error = jsonschema.exceptions.best_match([error])
+                node_errors.append((error.json_path, error.message))
+        partition_errors.append(node_errors)
+
+    return partition_errors
+
+
+def validate_node_json_partitions(db_schema: dict, partitions: List[List[str]], is_patch: bool = False, max_workers: Optional[int] = None) -> List[List[List[Tuple[str, str]]]]:
+    """
+    Validates partitions of node JSON strings in a pool of worker processes.
+
+    Parameters
+    ----------
+    db_schema: dict
+        DB schema to validate against
+    partitions: List[List[str]]
+        node JSON strings, grouped into the units of work that are sent to the workers
+    is_patch: bool
+        validate against the `Patch` instead of the `Post` definitions
+    max_workers: Optional[int]
+        number of worker processes, one per CPU if `None`
+
+    Returns
+    -------
+    List[List[List[Tuple[str, str]]]]
+        JSON path and message of every error, for each node JSON of each partition, in the order of the input
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_validation_worker, initargs=(db_schema,)) as executor:
+        return list(executor.map(_validate_node_json_partition, partitions, [is_patch] * len(partitions)))
@@ -1,8 +1,17 @@
+import hashlib
 import json
 import re
 import uuid
 from dataclasses import dataclass, field
-from typing import Dict, Set
+from typing import Any, Dict, List, Set
+
+from cript.nodes.core import _DEFAULT_CONDENSE_TO_UUID, BaseNode
+from cript.nodes.field_metadata import _get_field_metadata
+from cript.nodes.util.jsonl import _iter_child_nodes
+from cript.nodes.uuid_base import UUIDBaseNode
+
+# Attributes that stay in a PATCH, even if they did not change
+_PATCH_IDENTITY_ATTRIBUTES = ("node", "uid", "uuid")
 
 
 @dataclass
@@ -162,3 +171,145 @@ def _identify_suppress_attributes(node, response: Dict) -> Dict[str, Set[str]]:
         except KeyError:
             suppress_attributes[str(node.uuid)] = attributes
     return suppress_attributes
+
+
+@dataclass
+class _KnownServerState:
+    """
+    State of a node, as it was last saved to or loaded from the API.
+    """
+
+    # Hash of every attribute that was not at its default value, child nodes are represented by their UUID
+    attribute_hashes: Dict[str, str]
+
+
+def _get_attribute_hashes(node) -> Dict[str, str]:
+    """
+    Hashes the attributes of a node, that are not at their default value.
+
+    The attributes are serialized afresh every time, instead of using cached JSON or content hashes,
+    because lists returned by the getters of nodes can be modified in place, without the node noticing.
+    Child nodes are represented by their UUID, changes below them are found by `_find_unchanged_uuids`.
+    """
+
+    def to_json_value(value):
+        if isinstance(value, BaseNode):
+            return {"uuid": str(value.uuid)}
+        if isinstance(value, (list, tuple)):
+            return [to_json_value(element) for element in value]
+        if isinstance(value, dict):
+            return {key: to_json_value(element) for key, element in value.items()}
+        return value
+
+    field_metadata = _get_field_metadata(type(node._json_attrs))
+    attribute_hashes: Dict[str, str] = {}
+    for field_name in field_metadata.field_names:
+        field_value = getattr(node._json_attrs, field_name)
+        if not field_metadata.is_default(field_name, field_value):
+            attribute_json = json.dumps(to_json_value(field_value), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+            attribute_hashes[field_name] = hashlib.sha256(attribute_json.encode()).hexdigest()
+    return attribute_hashes
+
+
+def _find_unchanged_uuids(node, known_server_states: Dict[str, _KnownServerState]) -> Set[str]:
+    """
+    Finds the nodes of a graph, that did not change since they were last saved or loaded, and nothing below them either.
+    They can be sent as UUID edges.
+    Children that `get_json` always writes as UUID edges are not followed, their changes are not sent with this graph anyway.
+    """
+    visited_uuids: Set[str] = set()
+    changed_uuids: List[str] = []
+    parent_uuids: Dict[str, List[str]] = {}
+    stack = [node]
+    while stack:
+        graph_node = stack.pop()
+        node_uuid = str(graph_node.uuid)
+        if node_uuid in visited_uuids:
+            continue
+        visited_uuids.add(node_uuid)
+
+        known_state = known_server_states.get(node_uuid)
+        if known_state is None or known_state.attribute_hashes != _get_attribute_hashes(graph_node):
+            changed_uuids.append(node_uuid)
+        condensed_field_names = _DEFAULT_CONDENSE_TO_UUID.get(graph_node.node_type, ())
+        for field_name in _get_field_metadata(type(graph_node._json_attrs)).child_field_names:
+            if field_name in condensed_field_names:
+                continue
+            value = getattr(graph_node._json_attrs, field_name)
+            for child_node in value if isinstance(value, list) else [value]:
+                if isinstance(child_node, BaseNode):
+                    parent_uuids.setdefault(str(child_node.uuid), []).append(node_uuid)
+                    stack.append(child_node)
+
+    # Nodes that contain a changed node have to be sent in full as well
+    outdated_uuids = set(changed_uuids)
+    while changed_uuids:
+        for parent_uuid in parent_uuids.get(changed_uuids.pop(), ()):
+            if parent_uuid not in outdated_uuids:
+                outdated_uuids.add(parent_uuid)
+                changed_uuids.append(parent_uuid)
+    return visited_uuids - outdated_uuids
+
+
+def _get_patch_diff(node, json_dict: Dict, known_server_states: Dict[str, _KnownServerState], unchanged_uuids: Set[str]) -> Dict:
+    """
+    Reduces the JSON of a node to the attributes that changed since it was last saved or loaded,
+    or that contain a child node that is not in `unchanged_uuids`.
+    Returns the JSON unchanged, if the state of the node on the server is not known.
+    """
+    known_state = known_server_states.get(str(node.uuid))
+    if known_state is None:
+        return json_dict
+
+    def contains_changed_node(key: str) -> bool:
+        value = getattr(node._json_attrs, key, None)
+        return any(isinstance(element, BaseNode) and str(element.uuid) not in unchanged_uuids for element in (value if isinstance(value, list) else [value]))
+
+    attribute_hashes = _get_attribute_hashes(node)
+    return {
+        key: value
+        for key, value in json_dict.items()
+        if key in _PATCH_IDENTITY_ATTRIBUTES or attribute_hashes.get(key) != known_state.attribute_hashes.get(key) or contains_changed_node(key)
+    }
+
+
+def _record_server_state(node, handled_ids: Set[str], save_values: _InternalSaveValues, known_server_states: Dict[str, _KnownServerState]) -> None:
+    """
+    Remembers the state of all nodes that were sent in full with a successful save.
+    Nodes that were sent as edges are not visited, their known state did not change.
+    Nodes with suppressed attributes are not stored completely by the API, so their state is forgotten.
+    """
+    visited_uuids: Set[str] = set()
+    stack = [node]
+    while stack:
+        graph_node = stack.pop()
+        node_uuid = str(graph_node.uuid)
+        if node_uuid in visited_uuids or graph_node.uid not in handled_ids:
+            continue
+        visited_uuids.add(node_uuid)
+
+        if node_uuid in save_values.suppress_attributes:
+            known_server_states.pop(node_uuid, None)
+        else:
+            known_server_states[node_uuid] = _KnownServerState(_get_attribute_hashes(graph_node))
+        stack.extend(_iter_child_nodes(graph_node))
+
+
+def _record_loaded_state(node_json: Any, known_server_states: Dict[str, _KnownServerState]) -> None:
+    """
+    Remembers the state of the nodes of an API response, right after they were loaded from it.
+    Only nodes with attributes in the response are recorded.
+    Nodes that are only referenced by their UUID might have local changes, that the server does not know.
+    """
+    stack = [node_json]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            node_uuid = value.get("uuid")
+            if node_uuid and value.keys() - _PATCH_IDENTITY_ATTRIBUTES:
+                loaded_node = UUIDBaseNode._uuid_cache.get(node_uuid)
+                if loaded_node is not None:
+                    known_server_states[node_uuid] = _KnownServerState(_get_attribute_hashes(loaded_node))
+            stack.extend(value.values())
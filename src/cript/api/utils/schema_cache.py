@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+# Increase whenever the layout of the cache files changes, older files are then ignored.
+_SCHEMA_CACHE_FORMAT_VERSION: int = 1
+
+
+def get_default_schema_cache_dir() -> Path:
+    """
+    Directory of the on-disk schema and vocabulary cache.
+
+    1. the environment variable `CRIPT_SCHEMA_CACHE_DIR`
+    1. `$XDG_CACHE_HOME/cript/schema`
+    1. `~/.cache/cript/schema`
+
+    Returns
+    -------
+    Path
+        cache directory, it is created when the first entry is written
+    """
+    cache_dir = os.environ.get("CRIPT_SCHEMA_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "cript" / "schema"
+
+
+def _read_schema_cache_file(file_path: Union[str, Path]) -> Optional[dict]:
+    """
+    Reads a cache entry or warm-start bundle.
+
+    Returns
+    -------
+    Optional[dict]
+        the entry, or `None` if the file does not exist, is corrupt, or was written by an incompatible version
+    """
+    try:
+        with open(file_path, "r") as file_handle:
+            entry = json.load(file_handle)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get("format_version") != _SCHEMA_CACHE_FORMAT_VERSION or not entry.get("db_schema"):
+        return None
+
+    return entry
+
+
+def _write_schema_cache_file(file_path: Union[str, Path], entry: dict) -> None:
+    """
+    Writes a cache entry or warm-start bundle atomically,
+    so many processes sharing a cache directory never read a half written file.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=file_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file_handle:
+            json.dump(entry, file_handle)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class _SchemaCache:
+    """
+    On-disk cache of the DB schema and the controlled vocabulary of one CRIPT host.
+
+    Each host has its own file in the cache directory. An entry contains
+
+    * `db_schema`: the node validation schema
+    * `vocabulary`: every controlled vocabulary category fetched so far
+    * `fetched_at`: time stamp of the last download or successful revalidation
+    * `etag` and `last_modified`: validators of the `/schema/` response for conditional requests
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], host: str):
+        self._host = host
+        host_hash: str = hashlib.sha256(host.encode()).hexdigest()[:32]
+        self.file_path: Path = Path(cache_dir) / f"{host_hash}.json"
+
+    def load(self) -> Optional[dict]:
+        """
+        Returns the cached entry of this host, or `None` if there is no usable entry.
+        """
+        entry = _read_schema_cache_file(self.file_path)
+        if entry is None or entry.get("host") != self._host:
+            return None
+        return entry
+
+    def store(self, entry: dict) -> None:
+        """
+        Stores the entry of this host. Failing to write the cache is not an error, the cache is an optimization only.
+        """
+        entry = dict(entry, format_version=_SCHEMA_CACHE_FORMAT_VERSION, host=self._host)
+        try:
+            _write_schema_cache_file(self.file_path, entry)
+        except OSError:
+            pass
+
+    @staticmethod
+    def is_fresh(entry: dict, ttl: float) -> bool:
+        """
+        Checks if an entry is younger than the time to live in seconds, and can be used without asking the server.
+        """
+        return time.time() - float(entry.get("fetched_at", 0)) < ttl
@@ -0,0 +1,399 @@
+"""
+Generates specialized plain-Python validation functions from the DB schema.
+
+The generic `jsonschema` validators interpret the schema for every node they validate.
+For the flat node shapes of the DB schema, a function that was generated for one definition,
+e.g. `MaterialPost`, checks a node with a few `isinstance` checks and set operations instead.
+
+The generated functions only answer *if* a node is valid.
+If a node is invalid, the `jsonschema` validator is still used to produce the error message,
+so the error messages do not change.
+
+Only the subset of JSON schema keywords that the generated code implements exactly is supported.
+Definitions that use any other keyword (or reference a definition that does) are not generated,
+and are validated with `jsonschema` as before.
+"""
+
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import jsonschema
+
+# Keywords that do not influence if an instance is valid.
+_ANNOTATION_KEYWORDS: Set[str] = {
+    "$schema",
+    "$comment",
+    "$defs",
+    "definitions",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "deprecated",
+    "readOnly",
+    "writeOnly",
+    "format",
+    "contentEncoding",
+    "contentMediaType",
+    "contentSchema",
+}
+
+# Keywords the generated code implements.
+_SUPPORTED_KEYWORDS: Set[str] = {
+    "$ref",
+    "type",
+    "enum",
+    "const",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "minItems",
+    "maxItems",
+    "minLength",
+    "maxLength",
+    "pattern",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "allOf",
+    "anyOf",
+    "oneOf",
+    "not",
+    "if",
+    "then",
+    "else",
+}
+
+# Draft 7 and older ignore all keywords next to `$ref`.
+_LEGACY_REF_VALIDATORS = (jsonschema.Draft4Validator, jsonschema.Draft6Validator, jsonschema.Draft7Validator)
+
+_TYPE_CHECKS: Dict[str, str] = {
+    "string": "isinstance({0}, str)",
+    "object": "isinstance({0}, dict)",
+    "array": "isinstance({0}, list)",
+    "boolean": "isinstance({0}, bool)",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    # Since draft 6, floats without fractional part are integers too.
+    "integer": "((isinstance({0}, int) and not isinstance({0}, bool)) or (isinstance({0}, float) and {0}.is_integer()))",
+}
+
+
+class _UnsupportedSchemaError(Exception):
+    """
+    Raised if a schema cannot be turned into code, that behaves exactly like `jsonschema`.
+    """
+
+
+def _json_equal(one: Any, two: Any) -> bool:
+    """
+    Equality as defined by JSON schema for `enum` and `const`: `True` is not `1`, and `False` is not `0`.
+    """
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_json_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return one.keys() == two.keys() and all(_json_equal(one[key], two[key]) for key in one)
+    return one == two
+
+
+class _SchemaCodeGenerator:
+    """
+    Generates the source code of one Python module, with one function per schema and definition.
+    Every function takes a JSON instance and returns `True` if it is valid.
+    """
+
+    def __init__(self, db_schema: dict):
+        validator_class = jsonschema.validators.validator_for(db_schema)
+        if validator_class is jsonschema.Draft3Validator:
+            raise _UnsupportedSchemaError("Draft 3 schemas are not supported")
+        self._legacy_ref: bool = validator_class in _LEGACY_REF_VALIDATORS
+        self._integer_check: str = _TYPE_CHECKS["integer"] if validator_class is not jsonschema.Draft4Validator else "(isinstance({0}, int) and not isinstance({0}, bool))"
+        self._is_draft4: bool = validator_class is jsonschema.Draft4Validator
+
+        self._definitions: Dict[str, Any] = {}
+        for definitions_keyword in ("$defs", "definitions"):
+            for definition_name, definition in db_schema.get(definitions_keyword, {}).items():
+                self._definitions[f"#/{definitions_keyword}/{definition_name}"] = definition
+
+        self._lines: List[str] = []
+        self._constants: Dict[str, Any] = {"_json_equal": _json_equal}
+        self._function_names: Dict[int, str] = {}
+        self._ref_function_names: Dict[str, str] = {}
+        self._unsupported_refs: Set[str] = set()
+
+    def _add_constant(self, value: Any) -> str:
+        constant_name = f"_constant_{len(self._constants)}"
+        self._constants[constant_name] = value
+        return constant_name
+
+    def _check_keywords(self, schema: Any) -> None:
+        """
+        Checks the keywords of a schema without following references.
+        """
+        if isinstance(schema, bool):
+            return
+        if not isinstance(schema, dict):
+            raise _UnsupportedSchemaError(f"Invalid schema {schema!r}")
+
+        for keyword in schema:
+            if keyword not in _SUPPORTED_KEYWORDS and keyword not in _ANNOTATION_KEYWORDS:
+                raise _UnsupportedSchemaError(f"Keyword {keyword} is not supported")
+
+        if "$ref" in schema and schema["$ref"] not in self._definitions:
+            raise _UnsupportedSchemaError(f"Reference {schema['$ref']} is not supported")
+        if "items" in schema and not isinstance(schema["items"], (dict, bool)):
+            raise _UnsupportedSchemaError("Tuple validation with `items` is not supported")
+        if self._is_draft4 and ("exclusiveMinimum" in schema or "exclusiveMaximum" in schema):
+            raise _UnsupportedSchemaError("Boolean exclusive limits of draft 4 are not supported")
+        for number_keyword in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"):
+            if number_keyword in schema and (isinstance(schema[number_keyword], bool) or not isinstance(schema[number_keyword], (int, float))):
+                raise _UnsupportedSchemaError(f"Invalid {number_keyword}")
+
+    def _get_ref_function(self, ref: str) -> str:
+        if ref in self._unsupported_refs:
+            raise _UnsupportedSchemaError(f"Reference {ref} is not supported")
+        try:
+            return self._ref_function_names[ref]
+        except KeyError:
+            pass
+
+        # Everything generated for an unsupported definition is rolled back
+        number_of_lines = len(self._lines)
+        function_names = dict(self._function_names)
+        ref_function_names = dict(self._ref_function_names)
+
+        # Reserve the name first, so recursive references call the function that is being generated
+        function_name = f"_validate_definition_{len(self._ref_function_names)}"
+        self._ref_function_names[ref] = function_name
+        try:
+            self._generate_function(function_name, self._definitions[ref])
+        except _UnsupportedSchemaError:
+            del self._lines[number_of_lines:]
+            self._function_names = function_names
+            self._ref_function_names = ref_function_names
+            self._unsupported_refs.add(ref)
+            raise
+        return function_name
+
+    def _get_expression(self, schema: Any, variable: str) -> str:
+        """
+        Python expression that is `True` if `variable` is valid against the schema.
+        """
+        if schema is True or schema == {}:
+            return "True"
+        if schema is False:
+            return "False"
+
+        self._check_keywords(schema)
+        keywords = {keyword for keyword in schema if keyword not in _ANNOTATION_KEYWORDS}
+        # Inline the most common trivial schemas, instead of calling a function
+        if keywords == {"$ref"} or (self._legacy_ref and "$ref" in keywords):
+            return f"{self._get_ref_function(schema['$ref'])}({variable})"
+        if keywords == {"type"}:
+            return self._get_type_expression(schema["type"], variable)
+
+        function_name = self._function_names.get(id(schema))
+        if function_name is None:
+            function_name = f"_validate_schema_{len(self._function_names)}"
+            self._function_names[id(schema)] = function_name
+            self._generate_function(function_name, schema)
+        return f"{function_name}({variable})"
+
+    def _get_type_expression(self, schema_type: Any, variable: str) -> str:
+        if isinstance(schema_type, str):
+            schema_type = [schema_type]
+        type_expressions = []
+        for single_type in schema_type:
+            if single_type == "integer":
+                type_expressions.append(self._integer_check.format(variable))
+            elif single_type in _TYPE_CHECKS:
+                type_expressions.append(_TYPE_CHECKS[single_type].format(variable))
+            else:
+                raise _UnsupportedSchemaError(f"Type {single_type} is not supported")
+        if not type_expressions:
+            return "False"
+        return "(" + " or ".join(type_expressions) + ")"
+
+    def _generate_function(self, function_name: str, schema: Any) -> None:
+        self._check_keywords(schema)
+        # Generate the body first, nested functions are appended to the module while doing so
+        body: List[str] = []
+        self._generate_statements(schema, "instance", body)
+
+        self._lines.append(f"def {function_name}(instance):")
+        self._lines.extend("    " + line for line in body)
+        self._lines.append("    return True")
+        self._lines.append("")
+
+    def _generate_statements(self, schema: Any, variable: str, body: List[str]) -> None:
+        """
+        Appends statements that `return False` if `variable` is invalid against the schema.
+        """
+        if schema is False:
+            body.append("return False")
+            return
+        if schema is True:
+            return
+
+        if "$ref" in schema:
+            body.append(f"if not {self._get_ref_function(schema['$ref'])}({variable}):")
+            body.append("    return False")
+            if self._legacy_ref:
+                return
+
+        if "type" in schema:
+            body.append(f"if not {self._get_type_expression(schema['type'], variable)}:")
+            body.append("    return False")
+
+        if "const" in schema:
+            body.append(f"if not _json_equal({variable}, {self._add_constant(schema['const'])}):")
+            body.append("    return False")
+
+        if "enum" in schema:
+            enum = schema["enum"]
+            if all(isinstance(value, str) for value in enum):
+                body.append(f"if not (isinstance({variable}, str) and {variable} in {self._add_constant(frozenset(enum))}):")
+            else:
+                body.append(f"if not any(_json_equal({variable}, value) for value in {self._add_constant(list(enum))}):")
+            body.append("    return False")
+
+        object_body: List[str] = []
+        if schema.get("required"):
+            object_body.append(f"if not {self._add_constant(frozenset(schema['required']))}.issubset({variable}):")
+            object_body.append("    return False")
+        properties: Dict[str, Any] = schema.get("properties", {})
+        for property_name, property_schema in properties.items():
+            property_variable = f"{variable}[{property_name!r}]"
+            property_expression = self._get_expression(property_schema, property_variable)
+            if property_expression != "True":
+                object_body.append(f"if {property_name!r} in {variable} and not {property_expression}:")
+                object_body.append("    return False")
+        if "additionalProperties" in schema:
+            additional_properties = schema["additionalProperties"]
+            property_names = self._add_constant(frozenset(properties))
+            if additional_properties is False:
+                object_body.append(f"if not {property_names}.issuperset({variable}):")
+                object_body.append("    return False")
+            elif additional_properties is not True:
+                additional_expression = self._get_expression(additional_properties, "value")
+                object_body.append(f"for key, value in {variable}.items():")
+                object_body.append(f"    if key not in {property_names} and not {additional_expression}:")
+                object_body.append("        return False")
+        self._add_type_block(body, object_body, f"isinstance({variable}, dict)")
+
+        array_body: List[str] = []
+        if "minItems" in schema:
+            array_body.append(f"if len({variable}) < {int(schema['minItems'])}:")
+            array_body.append("    return False")
+        if "maxItems" in schema:
+            array_body.append(f"if len({variable}) > {int(schema['maxItems'])}:")
+            array_body.append("    return False")
+        if "items" in schema:
+            item_expression = self._get_expression(schema["items"], "item")
+            if item_expression != "True":
+                array_body.append(f"for item in {variable}:")
+                array_body.append(f"    if not {item_expression}:")
+                array_body.append("        return False")
+        self._add_type_block(body, array_body, f"isinstance({variable}, list)")
+
+        string_body: List[str] = []
+        if "minLength" in schema:
+            string_body.append(f"if len({variable}) < {int(schema['minLength'])}:")
+            string_body.append("    return False")
+        if "maxLength" in schema:
+            string_body.append(f"if len({variable}) > {int(schema['maxLength'])}:")
+            string_body.append("    return False")
+        if "pattern" in schema:
+            string_body.append(f"if {self._add_constant(re.compile(schema['pattern']))}.search({variable}) is None:")
+            string_body.append("    return False")
+        self._add_type_block(body, string_body, f"isinstance({variable}, str)")
+
+        number_body: List[str] = []
+        for keyword, operator in (("minimum", "<"), ("maximum", ">"), ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">=")):
+            if keyword in schema:
+                number_body.append(f"if {variable} {operator} {self._add_constant(schema[keyword])}:")
+                number_body.append("    return False")
+        self._add_type_block(body, number_body, _TYPE_CHECKS["number"].format(variable))
+
+        for sub_schema in schema.get("allOf", []):
+            body.append(f"if not {self._get_expression(sub_schema, variable)}:")
+            body.append("    return False")
+        if "anyOf" in schema:
+            body.append("if not (" + " or ".join(self._get_expression(sub_schema, variable) for sub_schema in schema["anyOf"]) + "):")
+            body.append("    return False")
+        if "oneOf" in schema:
+            body.append("if [" + ", ".join(self._get_expression(sub_schema, variable) for sub_schema in schema["oneOf"]) + "].count(True) != 1:")
+            body.append("    return False")
+        if "not" in schema:
+            body.append(f"if {self._get_expression(schema['not'], variable)}:")
+            body.append("    return False")
+        if "if" in schema:
+            then_expression = self._get_expression(schema.get("then", True), variable)
+            else_expression = self._get_expression(schema.get("else", True), variable)
+            body.append(f"if {self._get_expression(schema['if'], variable)}:")
+            body.append(f"    if not {then_expression}:")
+            body.append("        return False")
+            body.append(f"elif not {else_expression}:")
+            body.append("    return False")
+
+    @staticmethod
+    def _add_type_block(body: List[str], type_body: List[str], type_check: str) -> None:
+        """
+        Keywords for objects, arrays, strings and numbers only apply to instances of that type.
+        """
+        if type_body:
+            body.append(f"if {type_check}:")
+            body.extend("    " + line for line in type_body)
+
+    def compile(self, schema_definitions: List[str]) -> Dict[str, Callable[[Any], bool]]:
+        """
+        Generates and compiles validation functions for definitions of the DB schema.
+
+        Returns
+        -------
+        Dict[str, Callable[[Any], bool]]
+            validation functions keyed by definition name, unsupported definitions are left out
+        """
+        function_names: Dict[str, str] = {}
+        for schema_definition in schema_definitions:
+            ref: Optional[str] = next((ref for ref in (f"#/$defs/{schema_definition}", f"#/definitions/{schema_definition}") if ref in self._definitions), None)
+            if ref is None:
+                continue
+            try:
+                function_names[schema_definition] = self._get_ref_function(ref)
+            except _UnsupportedSchemaError:
+                continue
+
+        namespace: Dict[str, Any] = dict(self._constants)
+        exec(compile("\n".join(self._lines), "<cript schema validators>", "exec"), namespace)
+        return {schema_definition: namespace[function_name] for schema_definition, function_name in function_names.items()}
+
+
+def compile_schema_validators(db_schema: dict, schema_definitions: List[str]) -> Dict[str, Callable[[Any], bool]]:
+    """
+    Generates a plain-Python validation function for each definition of the DB schema, if possible.
+
+    Parameters
+    ----------
+    db_schema: dict
+        DB schema with the definitions in `$defs` or `definitions`
+    schema_definitions: List[str]
+        names of the definitions to generate functions for, e.g. `["MaterialPost", "MaterialPatch"]`
+
+    Returns
+    -------
+    Dict[str, Callable[[Any], bool]]
+        functions that return `True` if a node JSON dict is valid, keyed by definition name.
+        Definitions that cannot be generated exactly are left out.
+    """
+    try:
+        return _SchemaCodeGenerator(db_schema).compile(schema_definitions)
+    except _UnsupportedSchemaError:
+        return {}
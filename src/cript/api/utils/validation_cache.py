@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class ValidationCacheInfo(NamedTuple):
+    """
+    Statistics of the validation cache, modelled after `functools.lru_cache().cache_info()`.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ValidationCache:
+    """
+    LRU cache that remembers which node JSON documents passed the schema validation.
+
+    Entries are keyed by a hash of the node JSON, the DB schema version, and whether it was validated as `Post` or `Patch`.
+    Only successful validations are stored, invalid nodes are validated again to produce the error message.
+    The cache can be shared by threads, all access to the entries and counters holds a lock.
+    """
+
+    def __init__(self, schema_version: str, maxsize: int):
+        self._schema_version = schema_version
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_key(self, node_json: str, is_patch: bool) -> str:
+        """
+        Stable key of a node JSON.
+        Graphs are validated node by node, with the children of each node as UID edges.
+        The key of a node then only changes with its own attributes and the UIDs of its children.
+        """
+        node_hash = hashlib.sha256()
+        node_hash.update(self._schema_version.encode())
+        node_hash.update(b"Patch" if is_patch else b"Post")
+        node_hash.update(node_json.encode())
+        return node_hash.hexdigest()
+
+    def is_known_valid(self, key: str) -> bool:
+        """
+        Checks if a key passed validation before and counts hits and misses.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, key: str) -> None:
+        """
+        Stores a key that passed validation, evicting the least recently used entry if the cache is full.
+        """
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = True
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> ValidationCacheInfo:
+        with self._lock:
+            return ValidationCacheInfo(hits=self.hits, misses=self.misses, maxsize=self._maxsize, currsize=len(self._entries))
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict
 
 
 class VocabCategories(Enum):
@@ -96,3 +97,31 @@ class VocabCategories(Enum):
     REFERENCE_TYPE: str = "reference_type"
     SET_TYPE: str = "set_type"
     UNCERTAINTY_TYPE: str = "uncertainty_type"
+
+
+# Node attributes that hold CRIPT controlled vocabulary, by node type and attribute name.
+_NODE_VOCAB_ATTRIBUTES: Dict[str, Dict[str, VocabCategories]] = {
+    "Algorithm": {"key": VocabCategories.ALGORITHM_KEY, "type": VocabCategories.ALGORITHM_TYPE},
+    "Citation": {"type": VocabCategories.CITATION_TYPE},
+    "Computation": {"type": VocabCategories.COMPUTATION_TYPE},
+    "ComputationProcess": {"type": VocabCategories.COMPUTATIONAL_PROCESS_TYPE},
+    "ComputationalForcefield": {"key": VocabCategories.COMPUTATIONAL_FORCEFIELD_KEY, "building_block": VocabCategories.BUILDING_BLOCK},
+    "Condition": {"key": VocabCategories.CONDITION_KEY, "uncertainty_type": VocabCategories.UNCERTAINTY_TYPE},
+    "Data": {"type": VocabCategories.DATA_TYPE},
+    "Equipment": {"key": VocabCategories.EQUIPMENT_KEY},
+    "File": {"type": VocabCategories.FILE_TYPE},
+    "Ingredient": {"keyword": VocabCategories.INGREDIENT_KEYWORD},
+    "Material": {"keyword": VocabCategories.MATERIAL_KEYWORD},
+    "Parameter": {"key": VocabCategories.PARAMETER_KEY},
+    "Process": {"type": VocabCategories.PROCESS_TYPE, "keyword": VocabCategories.PROCESS_KEYWORD},
+    "Property": {"method": VocabCategories.PROPERTY_METHOD, "uncertainty_type": VocabCategories.UNCERTAINTY_TYPE},
+    "Quantity": {"key": VocabCategories.QUANTITY_KEY, "uncertainty_type": VocabCategories.UNCERTAINTY_TYPE},
+    "Reference": {"type": VocabCategories.REFERENCE_TYPE},
+}
+
+# The vocabulary of a `Property.key` depends on the node type the property belongs to.
+_PROPERTY_KEY_VOCAB: Dict[str, VocabCategories] = {
+    "Material": VocabCategories.MATERIAL_PROPERTY_KEY,
+    "Process": VocabCategories.PROCESS_PROPERTY_KEY,
+    "ComputationProcess": VocabCategories.COMPUTATIONAL_PROCESS_PROPERTY_KEY,
+}
@@ -1,4 +1,10 @@
 # trunk-ignore-all(ruff/F401)
+import sys
+
+from cript.nodes.node_registry import (
+    _register_module_node_classes,
+    register_node_class,
+)
 from cript.nodes.primary_nodes import (
     Collection,
     Computation,
@@ -26,7 +32,22 @@ from cript.nodes.subobjects import (
 )
 from cript.nodes.supporting_nodes import File, User
 from cript.nodes.util import (
+    LazyNode,
     NodeEncoder,
     add_orphaned_nodes_to_project,
+    deferred_validation,
+    dump_jsonl,
+    dump_snapshot,
+    find_orphaned_nodes,
+    find_schema_errors,
+    get_json_backend,
+    incremental_serialization,
+    load_jsonl,
     load_nodes_from_json,
+    load_snapshot,
+    set_json_backend,
+    stream_nodes_from_json,
 )
+
+# JSON decoding creates nodes with the node classes of this module
+_register_module_node_classes(sys.modules[__name__])
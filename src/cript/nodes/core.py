@@ -1,21 +1,54 @@
 import copy
 import dataclasses
+import hashlib
 import json
 import re
 import uuid
+import weakref
 from abc import ABC
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, replace
-from typing import Dict, List, Optional, Set
+from typing import IO, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from cript.nodes.exceptions import (
     CRIPTAttributeModificationError,
     CRIPTExtraJsonAttributes,
     CRIPTJsonSerializationError,
 )
+from cript.nodes.field_metadata import _get_field_metadata
 from cript.nodes.node_iterator import NodeIterator
 
 tolerated_extra_json = []
 
+# Attributes of each node type, whose child nodes `get_json` writes as UUID edges by default
+_DEFAULT_CONDENSE_TO_UUID: Dict[str, Set[str]] = {
+    "Material": {"parent_material", "component"},
+    "Experiment": {"data"},
+    "Inventory": {"material"},
+    "Ingredient": {"material"},
+    "Property": {"component"},
+    "ComputationProcess": {"material"},
+    "Data": {"material"},
+    "Process": {"product", "waste"},
+    "Project": {"member", "admin"},
+    "Collection": {"member", "admin"},
+}
+
+# Number of characters `write_expanded_json` collects before each write to the file
+_WRITE_CHUNK_SIZE: int = 64 * 1024
+
+# Nodes modified inside a `deferred_validation` block, keyed by `id(node)`. `None` outside of such a block.
+# A context variable keeps the state local to the current thread (and asyncio task).
+_deferred_validation_nodes: ContextVar[Optional[Dict[int, "BaseNode"]]] = ContextVar("_deferred_validation_nodes", default=None)
+
+# Nodes that hold a cached JSON fragment or are tracked for invalidating one, keyed by `id(node)`.
+# `None` outside of an `incremental_serialization` block.
+_incremental_serialization_nodes: ContextVar[Optional[Dict[int, "BaseNode"]]] = ContextVar("_incremental_serialization_nodes", default=None)
+
+# `True` while loading JSON from a trusted source, then `_from_json` creates nodes directly from their attributes.
+_trusted_json_construction: ContextVar[bool] = ContextVar("_trusted_json_construction", default=False)
+
 
 def add_tolerated_extra_json(additional_tolerated_json: str):
     """
@@ -39,6 +72,72 @@ class classproperty(object):
         return self.f(obj)
 
 
+class _JsonFragment:
+    """
+    Serialized JSON dict of a node and the part of its graph that it contains in full.
+
+    A fragment can be reused by a later serialization with the same settings,
+    as long as none of the contained nodes is already serialized, a known UUID, or has suppressed attributes.
+    Then the serialization of the subgraph does not depend on anything outside it.
+    """
+
+    __slots__ = ("json_dict", "sort_keys", "condense_to_uuid", "serialized", "_uids", "_uuids")
+
+    def __init__(self, json_dict: dict, sort_keys: bool, condense_to_uuid: Dict, serialized: Tuple[Tuple[str, str], ...]):
+        self.json_dict: dict = json_dict
+        self.sort_keys: bool = sort_keys
+        self.condense_to_uuid: Dict = condense_to_uuid
+        # (uid, uuid) of every node serialized in full, in the order of serialization
+        self.serialized: Tuple[Tuple[str, str], ...] = serialized
+        # Sets are built on first use, fragments of frequently modified nodes are often dropped before they are used
+        self._uids: Optional[FrozenSet[str]] = None
+        self._uuids: Optional[FrozenSet[str]] = None
+
+    @property
+    def uids(self) -> FrozenSet[str]:
+        if self._uids is None:
+            self._uids = frozenset(uid for uid, _ in self.serialized)
+        return self._uids
+
+    @property
+    def uuids(self) -> FrozenSet[str]:
+        if self._uuids is None:
+            self._uuids = frozenset(node_uuid for _, node_uuid in self.serialized)
+        return self._uuids
+
+
+class ReturnTuple:
+    """
+    Result of `BaseNode.get_json`.
+
+    Usually the JSON string is encoded directly from the nodes in a single pass,
+    and the JSON dict is only parsed from it when `json_dict` is accessed for the first time.
+    Patches and serializations inside of `incremental_serialization` blocks build the JSON dict instead,
+    and the JSON string is only encoded from it when `json` is accessed for the first time.
+    """
+
+    __slots__ = ("_json_dict", "handled_ids", "_json", "_json_kwargs")
+
+    def __init__(self, json_dict: Optional[dict], handled_ids: Set[str], json_kwargs: Dict, json_str: Optional[str] = None):
+        self._json_dict: Optional[dict] = json_dict
+        self.handled_ids: Set[str] = handled_ids
+        self._json: Optional[str] = json_str
+        self._json_kwargs: Dict = json_kwargs
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            # Always the standard library, so that the string is the same for every JSON backend
+            self._json = json.dumps(self._json_dict, **self._json_kwargs)
+        return self._json
+
+    @property
+    def json_dict(self) -> dict:
+        if self._json_dict is None:
+            self._json_dict = json.loads(self._json)  # type: ignore
+        return self._json_dict
+
+
 class BaseNode(ABC):
     """
     This abstract class is the base of all CRIPT nodes.
@@ -53,6 +152,14 @@ class BaseNode(ABC):
         uid: str = ""
 
     _json_attrs: JsonAttributes = JsonAttributes()
+    # Cached serialization of this node, only used inside of `incremental_serialization` blocks
+    _json_fragment: Optional[_JsonFragment] = None
+    # Cached `content_hash` of this node, and the identities of its list attributes and their elements when it was hashed
+    _content_hash: Optional[str] = None
+    _content_hash_lists: Tuple[Tuple[int, ...], ...] = ()
+    # Nodes whose cached serialization or content hash contains this node, they are invalidated with it.
+    # Weak references, so that children do not keep old graphs of their parents alive.
+    _cache_parents: Optional["weakref.WeakSet[BaseNode]"] = None
 
     @classproperty
     def node_type(self):
@@ -73,8 +180,43 @@ class BaseNode(ABC):
     def __setattr__(self, key, value):
         if not hasattr(self, key):
             raise CRIPTAttributeModificationError(self.node_type, key, value)
+        if key == "_json_attrs":
+            self._invalidate_caches()
         super().__setattr__(key, value)
 
+    def _invalidate_caches(self) -> None:
+        """
+        Drops the cached serialization and content hash of this node and of every node whose cache contains it.
+        Propagation stops at nodes that are not part of any cache.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._json_fragment is not None:
+                object.__setattr__(node, "_json_fragment", None)
+            if node._content_hash is not None:
+                object.__setattr__(node, "_content_hash", None)
+            parents = node._cache_parents
+            if parents:
+                object.__setattr__(node, "_cache_parents", None)
+                stack.extend(list(parents))
+
+    def _register_with_children(self, tracked_nodes: Optional[Dict[int, "BaseNode"]] = None) -> None:
+        """
+        Registers this node with its direct children, so that modifying a child invalidates the caches of this node.
+        """
+        for field_name in _get_field_metadata(type(self._json_attrs)).child_field_names:
+            value = getattr(self._json_attrs, field_name)
+            if not isinstance(value, list):
+                value = [value]
+            for element in value:
+                if isinstance(element, BaseNode):
+                    if element._cache_parents is None:
+                        object.__setattr__(element, "_cache_parents", weakref.WeakSet())
+                    element._cache_parents.add(self)
+                    if tracked_nodes is not None:
+                        tracked_nodes[id(element)] = element
+
     def __init__(self, **kwargs):
         for kwarg in kwargs:
             if kwarg not in tolerated_extra_json:
@@ -134,19 +276,37 @@ class BaseNode(ABC):
         -------
         None
         """
+        # Inside a `deferred_validation` block, we only record the node to validate it at the end of the block
+        deferred_validation_nodes = _deferred_validation_nodes.get()
+        if deferred_validation_nodes is not None:
+            self._json_attrs = new_json_attr
+            deferred_validation_nodes[id(self)] = self
+            return
+
         old_json_attrs = self._json_attrs
         self._json_attrs = new_json_attr
 
         try:
-            self.validate()
+            # Only the modified node needs validation, its children were validated when they were modified.
+            # The full graph is validated before saving it to the API.
+            self.validate(is_shallow=True)
         except Exception as exc:
             self._json_attrs = old_json_attrs
             raise exc
 
-    def validate(self, api=None, is_patch: bool = False, force_validation: bool = False) -> None:
+    def validate(self, api=None, is_patch: bool = False, force_validation: bool = False, is_shallow: bool = False) -> None:
         """
         Validate this node (and all its children) against the schema provided by the data bank.
 
+        The graph is validated node by node, each with its children as UID edges.
+        Since valid node JSON documents are cached, only nodes that changed since their last validation are validated again.
+
+        Parameters
+        ----------
+        is_shallow: bool
+            Only validate this node itself. All child nodes are represented as UID edges in the JSON,
+            so the cost of the validation does not grow with the size of the graph below this node.
+
         Raises:
         -------
         Exception with more error information.
@@ -155,7 +315,76 @@ class BaseNode(ABC):
 
         if api is None:
             api = _get_global_cached_api()
-        api.schema.is_node_schema_valid(self.get_json(is_patch=is_patch).json, is_patch=is_patch, force_validation=force_validation)
+
+        # Fast exit, without serializing the node, if it wouldn't be validated anyway
+        if api.schema.skip_validation and not force_validation:
+            return
+
+        if not is_shallow:
+            self._validate_graph(api=api, is_patch=is_patch)
+            return
+
+        # Children marked as handled are serialized as `{"uid": ...}` edges only.
+        api.schema.is_node_schema_valid(self.get_json(handled_ids=self._get_child_uids(), is_patch=is_patch).json, is_patch=is_patch, force_validation=force_validation)
+
+    def _validate_graph(self, api, is_patch: bool, max_workers: Optional[int] = 1) -> None:
+        """
+        Validates every node of the graph below this node, and raises the first schema error.
+
+        The JSON of each node only contains its own attributes and the UIDs of its children,
+        so the validation cache is keyed per node and unchanged parts of the graph are not validated again.
+        """
+        from cript.nodes.exceptions import CRIPTNodeSchemaError
+        from cript.nodes.util.core import find_schema_errors
+
+        schema_errors = find_schema_errors(self, api=api, is_patch=is_patch, max_workers=max_workers)
+        if schema_errors:
+            schema_error = schema_errors[0]
+            raise CRIPTNodeSchemaError(node_type=schema_error.node_type, json_schema_validation_error=f"{schema_error.message} at {schema_error.json_path} of node {schema_error.node_uuid} ({len(schema_errors)} errors in total)")
+
+    def _get_child_uids(self) -> Set[str]:
+        """
+        Collects the UIDs of all direct children of this node, without descending further into the graph.
+        """
+        child_uids = set()
+        for field_name in _get_field_metadata(type(self._json_attrs)).child_field_names:
+            value = getattr(self._json_attrs, field_name)
+            if not isinstance(value, list):
+                value = [value]
+            for element in value:
+                if isinstance(element, BaseNode):
+                    child_uids.add(element.uid)
+        # A node can never be an edge to itself
+        child_uids.discard(self.uid)
+        return child_uids
+
+    @contextmanager
+    def batch_edit(self):
+        """
+        Context manager to modify this node (and others) without validating after every change.
+
+        Works like [`cript.deferred_validation()`](../../../utility_functions/#cript.nodes.util.core.deferred_validation),
+        but this node is always validated at the end of the block, even if it was not modified itself.
+
+        Examples
+        --------
+        >>> import cript
+        >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+        >>> with my_material.batch_edit():
+        ...     my_material.name = "my new material name"
+        ...     my_material.smiles = "CC"
+
+        Raises
+        ------
+        CRIPTNodeSchemaError
+            At the end of the block, if the modified graph is invalid.
+            Modifications are not reverted in this case.
+        """
+        from cript.nodes.util.core import deferred_validation
+
+        with deferred_validation():
+            _deferred_validation_nodes.get()[id(self)] = self  # type: ignore
+            yield self
 
     @classmethod
     def _from_json(cls, json_dict: dict):
@@ -166,13 +395,9 @@ class BaseNode(ABC):
         # We create manually a dict that contains all elements from the send dict.
         # That eliminates additional fields and doesn't require asdict.
         arguments = {}
-        default_dataclass = cls.JsonAttributes()
+        field_metadata = _get_field_metadata(cls.JsonAttributes)
         for field in json_dict:
-            try:
-                getattr(default_dataclass, field)
-            except AttributeError:
-                pass
-            else:
+            if field in field_metadata.field_name_set:
                 arguments[field] = json_dict[field]
         try:  # TODO remove this hack to work with compatible model versions
             del arguments["model_version"]
@@ -180,9 +405,12 @@ class BaseNode(ABC):
             pass
 
         # add omitted fields from default (necessary if they are required)
-        for field_name in [field.name for field in dataclasses.fields(default_dataclass)]:
+        for field_name in field_metadata.field_names:
             if field_name not in arguments:
-                arguments[field_name] = getattr(default_dataclass, field_name)
+                arguments[field_name] = field_metadata.get_default(field_name)
+
+        if _trusted_json_construction.get():
+            return cls._from_trusted_json_attrs(arguments)
 
         try:
             node = cls(**arguments)
@@ -195,10 +423,10 @@ class BaseNode(ABC):
         attrs = cls.JsonAttributes(**arguments)
 
         # Handle default attributes manually.
-        for field in attrs.__dict__:
-            # Conserve newly assigned uid if uid is default (empty)
-            if getattr(attrs, field) == getattr(default_dataclass, field):
-                attrs = replace(attrs, **{str(field): getattr(node, field)})
+        # Conserve newly assigned uid if uid is default (empty)
+        default_fields = {field: getattr(node, field) for field in field_metadata.field_names if field_metadata.is_default(field, getattr(attrs, field))}
+        if default_fields:
+            attrs = replace(attrs, **default_fields)
 
         try:  # TODO remove this temporary solution
             if not attrs.uid.startswith("_:"):
@@ -211,13 +439,42 @@ class BaseNode(ABC):
 
         return node
 
+    @classmethod
+    def _from_trusted_json_attrs(cls, arguments: dict):
+        """
+        Creates a node from the complete attributes of trusted JSON, in one step.
+
+        The `JsonAttributes` are built once and assigned directly, without `__init__`, its type checks,
+        intermediate copies or validation. The result is the same node `_from_json` creates otherwise.
+        """
+        # The defaults, that `__init__` replaces
+        uid = arguments["uid"]
+        if not uid:
+            arguments["uid"] = get_new_uid()
+        elif not uid.startswith("_:"):
+            arguments["uid"] = "_:" + uid
+        if not arguments["node"]:
+            arguments["node"] = [cls.node_type]
+
+        return cls._new_with_json_attrs(cls.JsonAttributes(**arguments))
+
+    @classmethod
+    def _new_with_json_attrs(cls, json_attrs: JsonAttributes):
+        """
+        Creates a node with the given attributes, without calling `__init__`.
+        """
+        node = object.__new__(cls)
+        # A new node has no caches to invalidate
+        object.__setattr__(node, "_json_attrs", json_attrs)
+        return node
+
     def __deepcopy__(self, memo):
         from cript.nodes.util.core import get_uuid_from_uid
 
         # Ideally I would call `asdict`, but that is not allowed inside a deepcopy chain.
         # Making a manual transform into a dictionary here.
         arguments = {}
-        for field in self.JsonAttributes().__dataclass_fields__:
+        for field in _get_field_metadata(self.JsonAttributes).field_names:
             arguments[field] = copy.deepcopy(getattr(self._json_attrs, field), memo)
         # TODO URL handling
 
@@ -251,6 +508,138 @@ class BaseNode(ABC):
 
         return json_string
 
+    @property
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 hash of the attributes of this node and of the content hashes of its children (Merkle hash).
+
+        Two nodes have the same content hash if they have the same type, attributes and children,
+        independent of the Python session and of the order of the attributes.
+        The local `uid` is not part of the hash, attributes with default values are left out.
+        The hash is cached, and modifying a node through its attributes drops the cached hashes of the node
+        and of all nodes that contain it. After a change only the modified nodes and the nodes containing them are hashed again.
+
+        Lists returned by node attributes can also be modified in place (e.g. `my_project.material.append(my_material)`).
+        Every call compares the list attributes of the graph with the ones that were hashed, and drops outdated hashes.
+        This only walks the graph, so checking an unchanged project again is still a lot faster than hashing it.
+        Nodes that are part of circular references are hashed again every time,
+        a child node that closes the circle is represented by its UUID.
+
+        Examples
+        --------
+        >>> import cript
+        >>> my_project = cript.Project(name="my project")
+        >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+        >>> my_project.material = [my_material]
+        >>> saved_hash = my_project.content_hash
+        >>> my_material.name = "my renamed material"
+        >>> my_project.content_hash != saved_hash
+        True
+
+        Returns
+        -------
+        str
+            hexadecimal SHA-256 hash
+        """
+        self._invalidate_modified_content_hashes()
+        if self._content_hash is not None:
+            return self._content_hash
+        content_hash, _ = self._compute_content_hash({})
+        return content_hash
+
+    def _get_list_identities(self, children: Optional[List["BaseNode"]] = None) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Identities of the list attributes of this node and of their elements, to detect lists that were modified in place.
+        The child nodes of this node are added to `children`, if it is given.
+        """
+        # All fields of the frozen dataclass are set in its `__init__`, in definition order
+        field_values = vars(self._json_attrs)
+        if children is not None:
+            for field_name in _get_field_metadata(type(self._json_attrs)).child_field_names:
+                value = field_values[field_name]
+                if isinstance(value, list):
+                    children.extend(element for element in value if isinstance(element, BaseNode))
+                elif isinstance(value, BaseNode):
+                    children.append(value)
+        return tuple((id(value), *map(id, value)) for value in field_values.values() if isinstance(value, list))
+
+    def _invalidate_modified_content_hashes(self) -> None:
+        """
+        Drops the cached content hashes in the graph below this node, whose list attributes were modified in place since they were hashed.
+        Comparing the identities is a lot faster than hashing the graph again.
+        """
+        visited_ids: Set[int] = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) in visited_ids:
+                continue
+            visited_ids.add(id(node))
+            list_identities = node._get_list_identities(children=stack)
+            if node._content_hash is not None and node._content_hash_lists != list_identities:
+                node._invalidate_caches()
+
+    def _compute_content_hash(self, path_depths: Dict[int, int]):
+        """
+        Computes the content hash of this node, and caches it if it does not depend on the nodes that lead to this node.
+
+        Parameters
+        ----------
+        path_depths: Dict[int, int]
+            depth of each node on the path from the node where hashing started to this node, keyed by `id(node)`
+
+        Returns
+        -------
+        Tuple[str, float]
+            the content hash, and the smallest depth of a node on the path that is referenced by UUID below this node
+        """
+        # Delayed import to avoid circular imports
+        from cript.nodes.util.json import UIDProxy
+
+        depth = len(path_depths)
+        path_depths[id(self)] = depth
+        min_referenced_depth = float("inf")
+
+        def hash_value(value):
+            nonlocal min_referenced_depth
+            if isinstance(value, BaseNode):
+                if value._content_hash is not None:
+                    return {"content_hash": value._content_hash}
+                if id(value) in path_depths:
+                    # The child closes a circle, the hash would depend on itself
+                    min_referenced_depth = min(min_referenced_depth, path_depths[id(value)])
+                    return {"uuid": str(value.uuid)}
+                child_hash, child_min_referenced_depth = value._compute_content_hash(path_depths)
+                min_referenced_depth = min(min_referenced_depth, child_min_referenced_depth)
+                return {"content_hash": child_hash}
+            if isinstance(value, (list, tuple)):
+                return [hash_value(element) for element in value]
+            if isinstance(value, dict):
+                return {key: hash_value(element) for key, element in value.items()}
+            if isinstance(value, UIDProxy):
+                return {"uid": value.uid}
+            return value
+
+        field_metadata = _get_field_metadata(type(self._json_attrs))
+        content = {"node": self._json_attrs.node}
+        for field_name in field_metadata.field_names:
+            if field_name == "uid":
+                continue
+            field_value = getattr(self._json_attrs, field_name)
+            if not field_metadata.is_default(field_name, field_value):
+                content[field_name] = hash_value(field_value)
+        del path_depths[id(self)]
+
+        # The standard library is used independent of the JSON backend, so that the hash is the same everywhere
+        content_json = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        content_hash = hashlib.sha256(content_json.encode()).hexdigest()
+
+        self._register_with_children()
+        if min_referenced_depth > depth:
+            object.__setattr__(self, "_content_hash", content_hash)
+            object.__setattr__(self, "_content_hash_lists", self._get_list_identities())
+        return content_hash, min_referenced_depth
+
     def get_expanded_json(self, **kwargs) -> str:
         """
         Generates a long-form JSON representation of the current node and its hierarchy.
@@ -409,24 +798,65 @@ class BaseNode(ABC):
         """
         return self.get_json(handled_ids=None, known_uuid=None, suppress_attributes=None, is_patch=False, condense_to_uuid={}, **kwargs).json
 
+    def write_expanded_json(self, fp: IO[str], **kwargs) -> None:
+        """
+        Writes the long-form JSON of the current node and its hierarchy to a file-like object.
+
+        The output is the same as [`get_expanded_json()`](./#cript.nodes.core.BaseNode.get_expanded_json),
+        but it is encoded incrementally and written in chunks, instead of building the whole document in memory first.
+        This keeps the memory bounded for very large exports.
+
+        Parameters
+        ----------
+        fp : IO[str]
+            File-like object opened for writing text, for example `open("my_project.json", "w")`.
+        **kwargs : dict, optional
+            Additional keyword arguments for `json.dumps()` to customize the JSON output, such as `indent`
+            for pretty-printing.
+
+        Raises
+        ------
+        CRIPTJsonSerializationError
+            If the node graph cannot be serialized.
+
+        Examples
+        --------
+        >>> import cript
+        >>> import io
+        >>> my_project = cript.Project(name="my_Project")
+        >>> file_handle = io.StringIO()
+        >>> my_project.write_expanded_json(file_handle, indent=4)
+        >>> file_handle.getvalue() == my_project.get_expanded_json(indent=4)
+        True
+        """
+        # Delayed import to avoid circular imports
+        from cript.nodes.util import NodeEncoder
+
+        kwargs["check_circular"] = kwargs.get("check_circular", False)
+        encoder = NodeEncoder(condense_to_uuid={}, **kwargs)
+
+        try:
+            # The encoder yields many small chunks, collect them to write the file in larger blocks
+            chunks: List[str] = []
+            chunks_size = 0
+            for chunk in encoder.iterencode(self):
+                chunks.append(chunk)
+                chunks_size += len(chunk)
+                if chunks_size >= _WRITE_CHUNK_SIZE:
+                    fp.write("".join(chunks))
+                    chunks.clear()
+                    chunks_size = 0
+            fp.write("".join(chunks))
+        except Exception as exc:
+            raise CRIPTJsonSerializationError(str(type(self)), str(self._json_attrs)) from exc
+
     def get_json(
         self,
         handled_ids: Optional[Set[str]] = None,
         known_uuid: Optional[Set[str]] = None,
         suppress_attributes: Optional[Dict[str, Set[str]]] = None,
         is_patch: bool = False,
-        condense_to_uuid: Dict[str, Set[str]] = {
-            "Material": {"parent_material", "component"},
-            "Experiment": {"data"},
-            "Inventory": {"material"},
-            "Ingredient": {"material"},
-            "Property": {"component"},
-            "ComputationProcess": {"material"},
-            "Data": {"material"},
-            "Process": {"product", "waste"},
-            "Project": {"member", "admin"},
-            "Collection": {"member", "admin"},
-        },
+        condense_to_uuid: Dict[str, Set[str]] = _DEFAULT_CONDENSE_TO_UUID,
         **kwargs
     ):
         """
@@ -436,53 +866,40 @@ class BaseNode(ABC):
         We also accept `kwargs`, that are passed on to the JSON decoding via `json.dumps()` this can be used for example to prettify the output.
 
 
-        Returns named tuple with json and handled ids as result.
+        Returns a `ReturnTuple` with json, json_dict and handled ids as result.
+        The JSON string is encoded right away, the JSON dict is only parsed from it when it is accessed.
         """
 
-        @dataclass(frozen=True)
-        class ReturnTuple:
-            json: str
-            json_dict: dict
-            handled_ids: set
-
         # Do not check for circular references, since we handle them manually
         kwargs["check_circular"] = kwargs.get("check_circular", False)
 
         # Delayed import to avoid circular imports
         from cript.nodes.util import NodeEncoder
 
-        if handled_ids is None:
-            handled_ids = set()
-        previous_handled_nodes = copy.deepcopy(NodeEncoder.handled_ids)
-        NodeEncoder.handled_ids = handled_ids
-
-        # Similar to uid, we handle pre-saved known uuid such that they are UUID edges only
-        if known_uuid is None:
-            known_uuid = set()
-        previous_known_uuid = copy.deepcopy(NodeEncoder.known_uuid)
-        NodeEncoder.known_uuid = known_uuid
-        previous_suppress_attributes = copy.deepcopy(NodeEncoder.suppress_attributes)
-        NodeEncoder.suppress_attributes = suppress_attributes
-        previous_condense_to_uuid = copy.deepcopy(NodeEncoder.condense_to_uuid)
-        NodeEncoder.condense_to_uuid = condense_to_uuid
+        # Every call has its own encoder, so concurrent serializations do not share any state.
+        # Similar to uid, we handle pre-saved known uuid such that they are UUID edges only.
+        # Inside of `incremental_serialization` blocks, only store fragments of serializations the user asked for.
+        # Validations serialize with `handled_ids` or as patch, after every modification, and need no fragments.
+        store_fragments = handled_ids is None and not is_patch
+        encoder = NodeEncoder(handled_ids=handled_ids, known_uuid=known_uuid, suppress_attributes=suppress_attributes, condense_to_uuid=condense_to_uuid, _store_fragments=store_fragments, **kwargs)
 
         try:
-            tmp_json = json.dumps(self, cls=NodeEncoder, **kwargs)
-            tmp_dict = json.loads(tmp_json)
+            if not is_patch and encoder._fragment_nodes is None:
+                # Encode the string in a single pass, without holding the JSON dict of the whole graph in memory
+                return ReturnTuple(None, encoder.handled_ids, kwargs, json_str=encoder.encode(self))
+
+            # Build the JSON dict in a single pass, the string is only encoded if it is requested
+            tmp_dict = encoder.encode_to_dict(self)
             if is_patch:
+                tmp_dict = dict(tmp_dict)  # the dict might be a cached fragment, that must not be modified
                 del tmp_dict["uuid"]  # patches do not allow UUID is the parent most node
 
-            return ReturnTuple(json.dumps(tmp_dict, **kwargs), tmp_dict, NodeEncoder.handled_ids)
+            return ReturnTuple(tmp_dict, encoder.handled_ids, kwargs)
         except Exception as exc:
             # TODO this handling that doesn't tell the user what happened and how they can fix it
             #   this just tells the user that something is wrong
             #   this should be improved to tell the user what went wrong and where
             raise CRIPTJsonSerializationError(str(type(self)), str(self._json_attrs)) from exc
-        finally:
-            NodeEncoder.handled_ids = previous_handled_nodes
-            NodeEncoder.known_uuid = previous_known_uuid
-            NodeEncoder.suppress_attributes = previous_suppress_attributes
-            NodeEncoder.condense_to_uuid = previous_condense_to_uuid
 
     def find_children(self, search_attr: dict, search_depth: int = -1, handled_nodes: Optional[List] = None) -> List:
         """
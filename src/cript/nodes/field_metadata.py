@@ -0,0 +1,98 @@
+"""
+Field metadata of the `JsonAttributes` dataclasses of nodes, computed once per class.
+
+Serialization, deserialization, copying and iterating over node graphs need the field names and default values
+of every node they touch. Computing them with `dataclasses.fields()` and a default `JsonAttributes()` instance per node
+is expensive, so it is done once per class here.
+"""
+import dataclasses
+import functools
+import numbers
+import typing
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Tuple
+
+# Types that can never be or contain a node
+_SCALAR_TYPES: Tuple[type, ...] = (str, bool, int, float, numbers.Number, type(None))
+
+
+class _FieldMetadata(NamedTuple):
+    """
+    Field metadata of one `JsonAttributes` dataclass.
+    """
+
+    # Field names in definition order
+    field_names: Tuple[str, ...]
+    field_name_set: FrozenSet[str]
+    # Names of fields that can hold child nodes according to their type annotation, sorted by name
+    child_field_names: Tuple[str, ...]
+    # Default value of every field. Values of default factories are shared, they must not be modified or handed out.
+    defaults: Dict[str, Any]
+    # Default factories, to create fresh default values
+    default_factories: Dict[str, Callable[[], Any]]
+    # Fields whose default factory creates a different value every time, like a new UUID.
+    # No existing value is equal to their default.
+    unique_default_fields: FrozenSet[str]
+
+    def get_default(self, field_name: str) -> Any:
+        """
+        Fresh default value of a field, that can be safely modified.
+        """
+        try:
+            return self.default_factories[field_name]()
+        except KeyError:
+            return self.defaults[field_name]
+
+    def is_default(self, field_name: str, value: Any) -> bool:
+        """
+        Checks if a value is equal to the default of a field, as a comparison with a default `JsonAttributes()` instance would.
+        """
+        return field_name not in self.unique_default_fields and value == self.defaults[field_name]
+
+
+def _can_hold_node(annotation: Any) -> bool:
+    """
+    Checks if a field annotation allows nodes. Annotations that are not understood are assumed to allow nodes.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, _SCALAR_TYPES):
+        return False
+
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, list, tuple):
+        return any(_can_hold_node(argument) for argument in typing.get_args(annotation) if argument is not Ellipsis)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _get_field_metadata(json_attributes_class: type) -> _FieldMetadata:
+    """
+    Returns the field metadata of a `JsonAttributes` dataclass, it is computed on the first call only.
+    """
+    fields = dataclasses.fields(json_attributes_class)
+    try:
+        annotations = typing.get_type_hints(json_attributes_class)
+    except Exception:  # unresolvable forward references, use the raw annotations
+        annotations = {field.name: field.type for field in fields}
+
+    defaults: Dict[str, Any] = {}
+    default_factories: Dict[str, Callable[[], Any]] = {}
+    unique_default_fields = set()
+    for field in fields:
+        if field.default_factory is not dataclasses.MISSING:
+            default_factories[field.name] = field.default_factory
+            defaults[field.name] = field.default_factory()
+            if field.default_factory() != defaults[field.name]:
+                unique_default_fields.add(field.name)
+        else:
+            defaults[field.name] = field.default
+
+    field_names = tuple(field.name for field in fields)
+    child_field_names = tuple(sorted(field.name for field in fields if _can_hold_node(annotations.get(field.name, field.type))))
+
+    return _FieldMetadata(
+        field_names=field_names,
+        field_name_set=frozenset(field_names),
+        child_field_names=child_field_names,
+        defaults=defaults,
+        default_factories=default_factories,
+        unique_default_fields=frozenset(unique_default_fields),
+    )
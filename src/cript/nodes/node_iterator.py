@@ -1,6 +1,7 @@
-from dataclasses import fields
 from typing import Any, List, Set
 
+from cript.nodes.field_metadata import _get_field_metadata
+
 
 class NodeIterator:
     def __init__(self, root, max_recursion_depth=-1):
@@ -42,8 +43,8 @@ class NodeIterator:
         if self._max_recursion_depth >= 0 and recursion_depth >= self._max_recursion_depth:
             return
 
-        field_names = [field.name for field in fields(node._json_attrs)]
-        for attr_name in sorted(field_names):
+        # Only fields that can hold child nodes, in sorted order
+        for attr_name in _get_field_metadata(type(node._json_attrs)).child_field_names:
             attr = getattr(node._json_attrs, attr_name)
             if not isinstance(attr, list):
                 attr = [attr]
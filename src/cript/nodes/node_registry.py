@@ -0,0 +1,68 @@
+"""
+Registry of the node classes, that JSON decoding creates nodes with.
+
+Every node JSON names its type in the `node` field, like `"node": ["Material"]`.
+The registry maps these type names to their classes, so decoding finds the class of a node with one dict lookup.
+It is filled once when `cript.nodes` is imported, extensions can add their own node types with `register_node_class`.
+"""
+import inspect
+from types import ModuleType
+from typing import Dict, Optional
+
+from cript.nodes.core import BaseNode
+
+_node_classes: Dict[str, type] = {}
+
+
+def register_node_class(node_class: type, node_type: Optional[str] = None) -> type:
+    """
+    Registers a node class, so that JSON with its node type is decoded into instances of it.
+
+    Can be used as a class decorator. Registering a class for a node type that is already registered replaces the previous class.
+
+    Parameters
+    ----------
+    node_class: type
+        subclass of `BaseNode` to register
+    node_type: Optional[str]
+        node type name in the `node` field of the JSON, by default the name of the class
+
+    Returns
+    -------
+    type
+        the registered class
+
+    Raises
+    ------
+    TypeError
+        If the class is not a subclass of `BaseNode`.
+
+    Examples
+    --------
+    >>> import cript
+    >>> @cript.register_node_class
+    ... class MyMaterial(cript.Material):
+    ...     pass
+    """
+    if not (inspect.isclass(node_class) and issubclass(node_class, BaseNode)):
+        raise TypeError(f"Only subclasses of BaseNode can be registered as node classes, not {node_class!r}.")
+    if node_type is None:
+        node_type = node_class.__name__
+    _node_classes[node_type] = node_class
+    return node_class
+
+
+def _get_node_class(node_type: str) -> Optional[type]:
+    """
+    Returns the class registered for a node type, or None if the type is unknown.
+    """
+    return _node_classes.get(node_type)
+
+
+def _register_module_node_classes(module: ModuleType) -> None:
+    """
+    Registers every node class of a module under the name it has in the module.
+    """
+    for name, member in inspect.getmembers(module, inspect.isclass):
+        if issubclass(member, BaseNode):
+            register_node_class(member, name)
@@ -202,8 +202,8 @@ class Material(PrimaryBaseNode):
         )
         self._update_json_attrs_if_valid(new_json_attrs)
 
-    def validate(self, api=None, is_patch: bool = False, force_validation: bool = False) -> None:
-        super().validate(api=api, is_patch=is_patch, force_validation=force_validation)
+    def validate(self, api=None, is_patch: bool = False, force_validation: bool = False, is_shallow: bool = False) -> None:
+        super().validate(api=api, is_patch=is_patch, force_validation=force_validation, is_shallow=is_shallow)
 
         if (
             self.amino_acid is None
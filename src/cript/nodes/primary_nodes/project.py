@@ -106,47 +106,37 @@ class Project(PrimaryBaseNode):
         new_json_attrs = replace(self._json_attrs, name=name, collection=collection, material=material)
         self._update_json_attrs_if_valid(new_json_attrs)
 
-    def validate(self, api=None, is_patch=False, force_validation: bool = False):
-        from cript.nodes.exceptions import CRIPTOrphanedMaterialWarning
-        from cript.nodes.util.core import get_orphaned_experiment_exception
-
-        # First validate like other nodes
-        super().validate(api=api, is_patch=is_patch, force_validation=force_validation)
-
-        # Check graph for orphaned nodes, that should be listed in project
-        # Project.materials should contain all material nodes
-        project_graph_materials = self.find_children({"node": ["Material"]})
-        # Combine all materials listed in the project inventories
-        project_inventory_materials = []
-        for inventory in self.find_children({"node": ["Inventory"]}):
-            for material in inventory.material:
-                project_inventory_materials.append(material)
-        for material in project_graph_materials:
-            if material not in self.material and material not in project_inventory_materials:
-                warnings.warn(CRIPTOrphanedMaterialWarning(material))
-
-        # Check graph for orphaned nodes, that should be listed in the experiments
-        project_experiments = self.find_children({"node": ["Experiment"]})
-        # There are 4 different types of nodes Experiments are collecting.
-        node_types = ("Process", "Computation", "ComputationProcess", "Data")
-        # We loop over them with the same logic
-        for node_type in node_types:
-            # All in the graph has to be in at least one experiment
-            project_graph_nodes = self.find_children({"node": [node_type]})
-            node_type_attr = node_type.lower()
-            # Non-consistent naming makes this necessary for Computation Process
-            if node_type == "ComputationProcess":
-                node_type_attr = "computation_process"
-
-            # Concatenation of all experiment attributes (process, computation, etc.)
-            # Every node of the graph must be present somewhere in this concatenated list.
-            experiment_nodes = []
-            for experiment in project_experiments:
-                for ex_node in getattr(experiment, node_type_attr):
-                    experiment_nodes.append(ex_node)
-            for node in project_graph_nodes:
-                if node not in experiment_nodes:
-                    warnings.warn(get_orphaned_experiment_exception(node))
+    def validate(self, api=None, is_patch=False, force_validation: bool = False, is_shallow: bool = False, max_workers: Optional[int] = 1):
+        """
+        Validate this project and its graph against the schema, and check the graph for orphaned nodes.
+
+        Parameters
+        ----------
+        max_workers: Optional[int]
+            number of processes that validate large graphs in parallel, one per CPU if `None`.
+            See `cript.find_schema_errors` for details.
+
+        Raises
+        ------
+        CRIPTNodeSchemaError
+            if a node of the graph is invalid
+        """
+        from cript.api.api import _get_global_cached_api
+        from cript.nodes.util.core import find_orphaned_nodes
+
+        # Orphaned nodes can only be identified with the full graph
+        if is_shallow:
+            super().validate(api=api, is_patch=is_patch, force_validation=force_validation, is_shallow=is_shallow)
+            return
+
+        if api is None:
+            api = _get_global_cached_api()
+        if not api.schema.skip_validation or force_validation:
+            self._validate_graph(api=api, is_patch=is_patch, max_workers=max_workers)
+
+        # Check graph for orphaned nodes, that should be listed in the project or in one of the experiments
+        for orphan_warning in find_orphaned_nodes(self).get_warnings():
+            warnings.warn(orphan_warning)
 
     @property
     @beartype
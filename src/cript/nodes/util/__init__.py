@@ -1,9 +1,20 @@
 # trunk-ignore-begin(ruff/F401)
 from .core import (
+    NodeSchemaErrorInfo,
+    OrphanReport,
     add_orphaned_nodes_to_project,
+    deferred_validation,
+    find_orphaned_nodes,
+    find_schema_errors,
     get_orphaned_experiment_exception,
     get_uuid_from_uid,
+    incremental_serialization,
 )
 from .json import NodeEncoder, load_nodes_from_json
+from .json_backend import get_json_backend, set_json_backend
+from .json_stream import stream_nodes_from_json
+from .jsonl import dump_jsonl, load_jsonl
+from .lazy import LazyNode
+from .snapshot import dump_snapshot, load_snapshot
 
 # trunk-ignore-end(ruff/F401)
@@ -1,5 +1,9 @@
+import os
 import uuid
 import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from cript.nodes.exceptions import (
     CRIPTOrphanedComputationalProcessWarning,
@@ -15,6 +19,218 @@ def get_uuid_from_uid(uid):
     return str(uuid.UUID(uid[2:]))
 
 
+@dataclass
+class OrphanReport:
+    """
+    Orphaned nodes of a project graph, as found by `find_orphaned_nodes`.
+
+    Materials are orphaned if they are neither listed in `project.material` nor in any inventory of the project.
+    Process, Computation, ComputationProcess and Data nodes are orphaned if they are not listed in any experiment of the project.
+    Each node is listed once, in the order of the project graph.
+    """
+
+    material: List = field(default_factory=list)
+    process: List = field(default_factory=list)
+    computation: List = field(default_factory=list)
+    computation_process: List = field(default_factory=list)
+    data: List = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """
+        True if the project graph has any orphaned node.
+        """
+        return any((self.material, self.process, self.computation, self.computation_process, self.data))
+
+    def get_warnings(self) -> List:
+        """
+        One `CRIPTOrphanedNodesWarning` per orphaned node, materials first.
+        """
+        orphan_warnings: List = [CRIPTOrphanedMaterialWarning(material) for material in self.material]
+        for experiment_attr in _EXPERIMENT_ORPHAN_ATTRIBUTES.values():
+            orphan_warnings += [get_orphaned_experiment_exception(node) for node in getattr(self, experiment_attr)]
+        return orphan_warnings
+
+
+# Node types that have to be listed in an experiment, and the attribute of the experiment that lists them.
+_EXPERIMENT_ORPHAN_ATTRIBUTES: Dict[str, str] = {
+    "Process": "process",
+    "Computation": "computation",
+    "ComputationProcess": "computation_process",
+    "Data": "data",
+}
+
+
+class NodeSchemaErrorInfo(NamedTuple):
+    """
+    A single schema error of a node graph, as found by `find_schema_errors`.
+    """
+
+    node_type: str
+    node_uuid: str
+    # JSON path of the invalid value inside the node JSON, e.g. `$.quantity[0].value`
+    json_path: str
+    message: str
+
+
+# Graphs with fewer nodes are validated in the current process, starting worker processes would take longer.
+_PARALLEL_VALIDATION_MIN_NODES: int = 2000
+
+
+def find_schema_errors(node, api=None, is_patch: bool = False, max_workers: Optional[int] = 1) -> List[NodeSchemaErrorInfo]:
+    """
+    Validates every node of a graph once and collects all schema errors, instead of stopping at the first one.
+
+    Each node is validated on its own with its children as UID edges, so every error is reported
+    with the uuid of the node it belongs to and the JSON path inside that node.
+    This allows fixing all problems of a large graph after a single validation run.
+
+    Large graphs can be validated in parallel by multiple processes.
+    The nodes are serialized in the current process, and the nodes that are not known to be valid
+    from the validation cache are split into partitions, which are validated by a pool of worker processes.
+
+    Examples
+    --------
+    >>> import cript
+    >>> my_project = cript.Project(name="my project")
+    >>> cript.find_schema_errors(my_project)
+    []
+
+    Parameters
+    ----------
+    node: BaseNode
+        root node of the graph to validate, for example a `Project`
+    api: cript.API, optional
+        API with the schema to validate against, the currently active API by default
+    is_patch: bool
+        validate against the `Patch` instead of the `Post` definitions of the schema
+    max_workers: Optional[int]
+        number of worker processes, one per CPU if `None`.
+        With `1` (default), or if less than 2000 nodes need to be validated, the graph is validated in the current process.
+        Worker processes import the `__main__` module of the program again (except with the `fork` start method),
+        so scripts using them need an `if __name__ == "__main__":` guard.
+
+    Returns
+    -------
+    List[NodeSchemaErrorInfo]
+        all schema errors of the graph in the order of the graph, empty if the graph is valid
+    """
+    from cript.api.api import _get_global_cached_api
+    from cript.nodes.node_iterator import NodeIterator
+
+    if api is None:
+        api = _get_global_cached_api()
+
+    graph_nodes = list(NodeIterator(node))
+    if max_workers == 1 or len(graph_nodes) < _PARALLEL_VALIDATION_MIN_NODES:
+        schema_errors: List[NodeSchemaErrorInfo] = []
+        for graph_node in graph_nodes:
+            node_json: str = graph_node.get_json(handled_ids=graph_node._get_child_uids(), is_patch=is_patch).json
+            for error in api.schema.iter_node_schema_errors(node_json, is_patch=is_patch):
+                schema_errors.append(NodeSchemaErrorInfo(node_type=graph_node.node_type, node_uuid=graph_node.uuid, json_path=error.json_path, message=error.message))
+        return schema_errors
+
+    return _find_schema_errors_in_parallel(graph_nodes, api=api, is_patch=is_patch, max_workers=max_workers)
+
+
+def _find_schema_errors_in_parallel(graph_nodes: List, api, is_patch: bool, max_workers: Optional[int]) -> List[NodeSchemaErrorInfo]:
+    """
+    Implementation of `find_schema_errors` with a pool of worker processes.
+    """
+    from cript.api.utils.parallel_validation import validate_node_json_partitions
+
+    # Serialize the nodes in this process, since the validation cache is keyed by the node JSON.
+    # Only the JSON strings of nodes that are not known to be valid are sent to the workers.
+    validation_cache = api.schema._validation_cache
+    uncached_nodes: List[Tuple] = []
+    for graph_node in graph_nodes:
+        node_json: str = graph_node.get_json(handled_ids=graph_node._get_child_uids(), is_patch=is_patch).json
+        cache_key: str = validation_cache.get_key(node_json=node_json, is_patch=is_patch)
+        if not validation_cache.is_known_valid(cache_key):
+            uncached_nodes.append((graph_node, node_json, cache_key))
+
+    errors_by_uuid: Dict[str, List[NodeSchemaErrorInfo]] = {}
+    if len(uncached_nodes) < _PARALLEL_VALIDATION_MIN_NODES:
+        # After small changes to a large graph, starting worker processes would take longer than the validation
+        for graph_node, node_json, cache_key in uncached_nodes:
+            node_errors = [NodeSchemaErrorInfo(node_type=graph_node.node_type, node_uuid=graph_node.uuid, json_path=error.json_path, message=error.message) for error in api.schema._iter_uncached_node_schema_errors(node_json, is_patch=is_patch, cache_key=cache_key)]
+            if node_errors:
+                errors_by_uuid[graph_node.uuid] = node_errors
+    else:
+        # Every node is validated on its own, so the nodes are split into contiguous slices of the graph order.
+        # A few partitions per worker balance nodes with different validation costs.
+        number_of_partitions = 4 * (max_workers or os.cpu_count() or 1)
+        partition_size = -(-len(uncached_nodes) // number_of_partitions)
+        partitions = [uncached_nodes[start : start + partition_size] for start in range(0, len(uncached_nodes), partition_size)]
+        partition_results = validate_node_json_partitions(api.schema._db_schema, [[node_json for _, node_json, _ in partition] for partition in partitions], is_patch=is_patch, max_workers=max_workers)
+
+        for partition, partition_errors in zip(partitions, partition_results):
+            for (graph_node, _, cache_key), node_errors in zip(partition, partition_errors):
+                if not node_errors:
+                    validation_cache.add(cache_key)
+                    continue
+                errors_by_uuid[graph_node.uuid] = [NodeSchemaErrorInfo(node_type=graph_node.node_type, node_uuid=graph_node.uuid, json_path=json_path, message=message) for json_path, message in node_errors]
+
+    # Report the errors in the order of the graph, like the validation in a single process
+    schema_errors: List[NodeSchemaErrorInfo] = []
+    for graph_node in graph_nodes:
+        schema_errors.extend(errors_by_uuid.get(graph_node.uuid, []))
+    return schema_errors
+
+
+def find_orphaned_nodes(project) -> OrphanReport:
+    """
+    Finds all orphaned nodes of a project graph in a single traversal.
+
+    While traversing the graph, the uuids of all materials listed in the project or its inventories
+    and of all nodes listed in its experiments are indexed.
+    All candidate nodes are then checked against this index, instead of searching lists.
+
+    Examples
+    --------
+    >>> import cript
+    >>> my_project = cript.Project(name="my project")
+    >>> orphans = cript.find_orphaned_nodes(my_project)
+    >>> bool(orphans)
+    False
+
+    Parameters
+    ----------
+    project: Project
+        project whose graph is checked
+
+    Returns
+    -------
+    OrphanReport
+        orphaned nodes by type
+    """
+    from cript.nodes.node_iterator import NodeIterator
+
+    def get_listed_uuids(nodes) -> List[str]:
+        # Lists may contain unresolved UIDProxy, that do not have a uuid
+        return [node.uuid for node in nodes if hasattr(node, "uuid")]
+
+    listed_material_uuids = set(get_listed_uuids(project.material))
+    listed_experiment_uuids = set()
+    candidates: Dict[str, List] = {"Material": []}
+    candidates.update({node_type: [] for node_type in _EXPERIMENT_ORPHAN_ATTRIBUTES})
+
+    for node in NodeIterator(project):
+        node_type = node.node_type
+        if node_type in candidates:
+            candidates[node_type].append(node)
+        elif node_type == "Inventory":
+            listed_material_uuids.update(get_listed_uuids(node.material))
+        elif node_type == "Experiment":
+            for experiment_attr in _EXPERIMENT_ORPHAN_ATTRIBUTES.values():
+                listed_experiment_uuids.update(get_listed_uuids(getattr(node, experiment_attr)))
+
+    orphan_report = OrphanReport(material=[material for material in candidates["Material"] if material.uuid not in listed_material_uuids])
+    for node_type, experiment_attr in _EXPERIMENT_ORPHAN_ATTRIBUTES.items():
+        setattr(orphan_report, experiment_attr, [node for node in candidates[node_type] if node.uuid not in listed_experiment_uuids])
+
+    return orphan_report
+
+
 def add_orphaned_nodes_to_project(project, active_experiment, max_iteration: int = -1):
     """
     Helper function that adds all orphaned material nodes of the project graph to the
@@ -22,34 +238,24 @@ def add_orphaned_nodes_to_project(project, active_experiment, max_iteration: int
     Material additions only is permissible with `active_experiment is None`.
     This function also adds all orphaned data, process, computation and computational process nodes
     of the project graph to the `active_experiment`.
+    All orphans are found with a single traversal of the graph and added at once,
+    afterwards the project is validated once.
     This functions call `project.validate` and might raise Exceptions from there.
+
+    `max_iteration` is only kept for backwards compatibility, since no iterations are necessary anymore.
     """
     if active_experiment is not None and active_experiment not in project.find_children({"node": ["Experiment"]}):
         raise RuntimeError(f"The provided active experiment {active_experiment} is not part of the project graph. Choose an active experiment that is part of a collection of this project.")
 
-    counter = 0
-    # Convert Errors into exceptions, so we can catch and fix them
-    with warnings.catch_warnings():
-        warnings.simplefilter("error")
-        while True:
-            if counter > max_iteration >= 0:
-                break  # Emergency stop
-            try:
-                project.validate()
-            except CRIPTOrphanedMaterialWarning as exc:
-                # because calling the setter calls `validate` we have to force add the material.
-                project._json_attrs.material.append(exc.orphaned_node)
-            except CRIPTOrphanedDataWarning as exc:
-                active_experiment.data += [exc.orphaned_node]
-            except CRIPTOrphanedProcessWarning as exc:
-                active_experiment.process += [exc.orphaned_node]
-            except CRIPTOrphanedComputationWarning as exc:
-                active_experiment.computation += [exc.orphaned_node]
-            except CRIPTOrphanedComputationalProcessWarning as exc:
-                active_experiment.computation_process += [exc.orphaned_node]
-            else:
-                break
-            counter += 1
+    orphan_report = find_orphaned_nodes(project)
+
+    # because calling the setter calls `validate` we have to force add the orphans, the project is validated at the end.
+    project._json_attrs = replace(project._json_attrs, material=project._json_attrs.material + orphan_report.material)
+    if active_experiment is not None:
+        new_experiment_attrs = {experiment_attr: getattr(active_experiment._json_attrs, experiment_attr) + getattr(orphan_report, experiment_attr) for experiment_attr in _EXPERIMENT_ORPHAN_ATTRIBUTES.values()}
+        active_experiment._json_attrs = replace(active_experiment._json_attrs, **new_experiment_attrs)
+
+    project.validate()
 
 
 def get_orphaned_experiment_exception(orphaned_node):
@@ -73,6 +279,121 @@ def get_orphaned_experiment_exception(orphaned_node):
     return CRIPTOrphanedExperimentWarning(orphaned_node)
 
 
+@contextmanager
+def deferred_validation():
+    """
+    Context manager that suspends the validation of nodes while they are created or modified.
+
+    Every node that is created or modified inside the block is recorded instead.
+    At the end of the block the graphs of the modified nodes are validated once.
+    This is a lot faster than validating after every single change, when large graphs are built.
+
+    Opposed to `api.schema.skip_validation`, this only affects the current thread and can't be left on by accident.
+    Nested blocks are part of the outermost block, which validates at its end.
+    If an exception is raised inside the block, no validation happens.
+
+    Examples
+    --------
+    >>> import cript
+    >>> with cript.deferred_validation():
+    ...     my_project = cript.Project(name="my project")
+    ...     my_project.material = [
+    ...         cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}") for i in range(10)
+    ...     ]
+
+    Raises
+    ------
+    CRIPTNodeSchemaError
+        At the end of the block, if one of the modified graphs is invalid.
+        Modifications are not reverted in this case.
+    """
+    from cript.nodes.core import _deferred_validation_nodes
+
+    if _deferred_validation_nodes.get() is not None:
+        # Nested block, the outermost block validates all nodes
+        yield
+        return
+
+    modified_nodes: Dict = {}
+    token = _deferred_validation_nodes.set(modified_nodes)
+    try:
+        yield
+    finally:
+        _deferred_validation_nodes.reset(token)
+
+    for root_node in _find_graph_roots(list(modified_nodes.values())):
+        root_node.validate()
+
+
+@contextmanager
+def incremental_serialization():
+    """
+    Context manager that makes repeated serialization of mostly unchanged node graphs incremental.
+
+    Inside the block, `get_json` (and with it `node.json`) stores the serialized JSON dict of every node.
+    Later serializations reuse the stored dicts of all nodes that did not change since,
+    so only modified nodes and the nodes containing them are serialized again.
+    Modifying a node through its attributes drops its stored dict and those of the nodes that contain it.
+    All stored dicts are released at the end of the block.
+
+    Inside the block, the lists returned by node attributes must not be modified in place,
+    and the `json_dict` returned by `get_json` must be treated as read-only, since it shares the stored dicts.
+    The stored dicts are only used by the thread that entered the block.
+    Nested blocks are part of the outermost block.
+
+    Examples
+    --------
+    >>> import cript
+    >>> my_project = cript.Project(name="my project")
+    >>> my_project.material = [cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}") for i in range(10)]
+    >>> with cript.incremental_serialization():
+    ...     first_json = my_project.json
+    ...     my_project.material[0].name = "my renamed material"
+    ...     second_json = my_project.json  # only the first material and the project are serialized again
+    """
+    from cript.nodes.core import _incremental_serialization_nodes
+
+    if _incremental_serialization_nodes.get() is not None:
+        # Nested block, the outermost block releases the stored dicts
+        yield
+        return
+
+    tracked_nodes: Dict = {}
+    token = _incremental_serialization_nodes.set(tracked_nodes)
+    try:
+        yield
+    finally:
+        _incremental_serialization_nodes.reset(token)
+        # The links to parent nodes are kept, they also invalidate cached content hashes
+        for node in tracked_nodes.values():
+            object.__setattr__(node, "_json_fragment", None)
+
+
+def _find_graph_roots(nodes: List) -> List:
+    """
+    Reduces a list of nodes to the ones that are not part of the graph of another node in the list.
+    Validating these roots validates all nodes of the list.
+
+    Nodes are usually created bottom-up, so we start with the last modified nodes.
+    Their graphs typically contain all nodes modified before, which are then skipped.
+    """
+    from cript.nodes.node_iterator import NodeIterator
+
+    covered_uuid = set()
+    roots: Dict = {}
+    for node in reversed(nodes):
+        if node.uuid in covered_uuid:
+            continue
+        for child in NodeIterator(node):
+            # A previous root is part of this graph, so this node supersedes it.
+            if child is not node:
+                roots.pop(child.uuid, None)
+            covered_uuid.add(child.uuid)
+        roots[node.uuid] = node
+
+    return list(roots.values())
+
+
 def iterate_leaves(obj):
     """Helper function that iterates over all leaves of nested dictionaries or lists."""
 
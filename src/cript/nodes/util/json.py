@@ -2,21 +2,32 @@
 This module contains classes and functions that help with the json serialization and deserialization of nodes.
 """
 import dataclasses
-import inspect
 import json
+import math
 import uuid
-from typing import Dict, List, Optional, Set, Union
-
-import cript.nodes
-from cript.nodes.core import BaseNode
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from cript.nodes.core import (
+    BaseNode,
+    _incremental_serialization_nodes,
+    _JsonFragment,
+    _trusted_json_construction,
+)
 from cript.nodes.exceptions import (
     CRIPTDeserializationUIDError,
     CRIPTJsonDeserializationError,
     CRIPTJsonNodeError,
 )
+from cript.nodes.field_metadata import _get_field_metadata
+from cript.nodes.node_registry import _get_node_class
 from cript.nodes.util.core import iterate_leaves
+from cript.nodes.util.json_backend import _json_loads
 from cript.nodes.uuid_base import UUIDBaseNode
 
+# Types that are encoded by `json.dumps` as they are, including subclasses like `bool`.
+_JSON_SCALAR_TYPES = (str, int, float, type(None))
+
 
 @dataclasses.dataclass(frozen=True)
 class UIDProxy:
@@ -32,6 +43,7 @@ class UIDProxy:
 class NodeEncoder(json.JSONEncoder):
     """
     Custom JSON encoder for serializing CRIPT nodes to JSON.
+    Each serialization uses its own encoder instance, which holds the state of the serialization.
 
     This encoder is used to convert CRIPT nodes into JSON format while handling unique identifiers (UUIDs) and
     condensed representations to avoid redundancy in the JSON output.
@@ -62,10 +74,58 @@ class NodeEncoder(json.JSONEncoder):
     ```
     """
 
-    handled_ids: Set[str] = set()
-    known_uuid: Set[str] = set()
-    condense_to_uuid: Dict[str, Set[str]] = dict()
-    suppress_attributes: Optional[Dict[str, Set[str]]] = None
+    def __init__(
+        self,
+        *args,
+        handled_ids: Optional[Set[str]] = None,
+        known_uuid: Optional[Set[str]] = None,
+        condense_to_uuid: Optional[Dict[str, Set[str]]] = None,
+        suppress_attributes: Optional[Dict[str, Set[str]]] = None,
+        _store_fragments: bool = True,
+        **kwargs,
+    ):
+        """
+        Creates an encoder for one serialization.
+
+        The state lives in the encoder instance, so many threads can serialize nodes at the same time.
+        The encoder state can also be passed on by `json.dumps(node, cls=NodeEncoder, handled_ids=...)`.
+
+        Parameters
+        ----------
+        handled_ids : Optional[set[str]]
+            UIDs of nodes that are already serialized and are represented as UID edges only.
+            The set is updated with the nodes serialized by this encoder.
+        known_uuid : Optional[set[str]]
+            UUIDs of pre-saved nodes, that are represented as UUID edges only.
+        condense_to_uuid : Optional[dict[str, set[str]]]
+            Node types and their attributes, whose child nodes are condensed to UUID edges.
+        suppress_attributes : Optional[dict[str, set[str]]]
+            UUIDs of nodes and their attributes, that are left out of the JSON.
+        _store_fragments : bool
+            Inside of `incremental_serialization` blocks, store the fragments of the serialized nodes for later calls.
+            Cached fragments are reused either way.
+        *args, **kwargs
+            passed on to `json.JSONEncoder`
+        """
+        super().__init__(*args, **kwargs)
+        self.handled_ids: Set[str] = set() if handled_ids is None else handled_ids
+        self.known_uuid: Set[str] = set() if known_uuid is None else known_uuid
+        self.condense_to_uuid: Dict[str, Set[str]] = {} if condense_to_uuid is None else condense_to_uuid
+        self.suppress_attributes: Optional[Dict[str, Set[str]]] = suppress_attributes
+
+        # Inside of `incremental_serialization` blocks, `encode_to_dict` reuses and stores serialized fragments of nodes
+        self._fragment_nodes: Optional[Dict[int, BaseNode]] = _incremental_serialization_nodes.get()
+        self._store_fragments: bool = _store_fragments
+        if self._fragment_nodes is not None:
+            self._fragment_condense_to_uuid: Dict[str, FrozenSet[str]] = {key: frozenset(value) for key, value in self.condense_to_uuid.items()}
+            # Order in which the nodes were added to `handled_ids` by this encoder
+            self._handled_order: Dict[str, int] = {}
+            self._handled_count: int = 0
+            # (uid, uuid) of all nodes serialized in full so far
+            self._serialized: List[Tuple[str, str]] = []
+            # Smallest `_handled_order` of a node the current subgraph references as UID edge,
+            # -1 if it depends on a node outside of this encoder.
+            self._min_dependency: float = math.inf
 
     def default(self, obj):
         """
@@ -115,7 +175,7 @@ class NodeEncoder(json.JSONEncoder):
             except AttributeError:
                 pass
             else:
-                if uid in NodeEncoder.handled_ids:
+                if uid in self.handled_ids:
                     return {"uid": uid}
 
             # When saving graphs, some nodes can be pre-saved.
@@ -125,31 +185,141 @@ class NodeEncoder(json.JSONEncoder):
             except AttributeError:
                 pass
             else:
-                if uuid_str in NodeEncoder.known_uuid:
+                if uuid_str in self.known_uuid:
                     return {"uuid": uuid_str}
 
-            default_dataclass = obj.JsonAttributes()
+            field_metadata = _get_field_metadata(obj.JsonAttributes)
+            json_attrs = obj._json_attrs
             serialize_dict = {}
             # Remove default values from serialization
-            for field_name in [field.name for field in dataclasses.fields(default_dataclass)]:
-                if getattr(default_dataclass, field_name) != getattr(obj._json_attrs, field_name):
-                    serialize_dict[field_name] = getattr(obj._json_attrs, field_name)
+            for field_name in field_metadata.field_names:
+                field_value = getattr(json_attrs, field_name)
+                if not field_metadata.is_default(field_name, field_value):
+                    serialize_dict[field_name] = field_value
             # add the default node type
             serialize_dict["node"] = obj._json_attrs.node
 
             # check if further modifications to the dict is needed before considering it done
             serialize_dict, condensed_uid = self._apply_modifications(serialize_dict)
             if uid not in condensed_uid:  # We can uid (node) as handled if we don't condense it to uuid
-                NodeEncoder.handled_ids.add(uid)
+                self.handled_ids.add(uid)
 
             # Remove suppressed attributes
-            if NodeEncoder.suppress_attributes is not None and str(obj.uuid) in NodeEncoder.suppress_attributes:
-                for attr in NodeEncoder.suppress_attributes[str(obj.uuid)]:
+            if self.suppress_attributes is not None and str(obj.uuid) in self.suppress_attributes:
+                for attr in self.suppress_attributes[str(obj.uuid)]:
                     del serialize_dict[attr]
 
             return serialize_dict
         return json.JSONEncoder.default(self, obj)
 
+    def encode_to_dict(self, obj):
+        """
+        Converts an object, e.g. a node, into JSON compatible Python objects in a single pass,
+        without encoding it into a string and parsing it again.
+
+        The graph is traversed in the same order as `json.dumps(obj, cls=NodeEncoder)` would,
+        so the same nodes are serialized in full and the same nodes become edges.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to convert.
+
+        Returns
+        -------
+        Any
+            dicts, lists, strings, numbers, booleans and None only.
+            Encoding it with `json.dumps` gives the same JSON as `json.dumps(obj, cls=NodeEncoder)`.
+        """
+        if isinstance(obj, _JSON_SCALAR_TYPES):
+            return obj
+        if isinstance(obj, dict):
+            items = sorted(obj.items()) if self.sort_keys else obj.items()
+            encoded_dict = {}
+            for key, value in items:
+                if not isinstance(key, str):
+                    key = self._encode_key(key)
+                # Scalars are the most common values, skip the recursive call for them
+                encoded_dict[key] = value if isinstance(value, _JSON_SCALAR_TYPES) else self.encode_to_dict(value)
+            return encoded_dict
+        if isinstance(obj, (list, tuple)):
+            return [element if isinstance(element, _JSON_SCALAR_TYPES) else self.encode_to_dict(element) for element in obj]
+        if self._fragment_nodes is not None and isinstance(obj, BaseNode):
+            return self._encode_node_incrementally(obj)
+        return self.encode_to_dict(self.default(obj))
+
+    def _can_reuse_fragment(self, fragment: _JsonFragment) -> bool:
+        """
+        Checks if a cached fragment is exactly what serializing its node would produce in the current state.
+        """
+        if fragment.sort_keys != self.sort_keys:
+            return False
+        if fragment.condense_to_uuid is not self._fragment_condense_to_uuid and fragment.condense_to_uuid != self._fragment_condense_to_uuid:
+            return False
+        if not self.handled_ids.isdisjoint(fragment.uids):
+            return False
+        if self.known_uuid and not self.known_uuid.isdisjoint(fragment.uuids):
+            return False
+        if self.suppress_attributes and not fragment.uuids.isdisjoint(self.suppress_attributes):
+            return False
+        return True
+
+    def _encode_node_incrementally(self, node: BaseNode):
+        """
+        `encode_to_dict` of a node, that reuses the cached fragment of the node if possible.
+        Otherwise, the node is serialized and its fragment is stored,
+        if the result does not depend on nodes serialized before it.
+        """
+        fragment = node._json_fragment
+        if fragment is not None and self._can_reuse_fragment(fragment):
+            self.handled_ids.update(fragment.uids)
+            for uid in fragment.uids:
+                self._handled_order[uid] = self._handled_count
+            self._handled_count += 1
+            self._serialized.extend(fragment.serialized)
+            return fragment.json_dict
+
+        uid = node.uid
+        was_handled = uid in self.handled_ids
+        outer_min_dependency = self._min_dependency
+        self._min_dependency = math.inf
+        handled_count_before = self._handled_count
+        serialized_before = len(self._serialized)
+
+        node_dict = self.default(node)
+        serialized_in_full = not was_handled and uid in self.handled_ids
+        if serialized_in_full:
+            self._handled_order[uid] = self._handled_count
+            self._handled_count += 1
+            self._serialized.append((uid, str(node.uuid)))
+            if self.suppress_attributes is not None and str(node.uuid) in self.suppress_attributes:
+                self._min_dependency = -1
+            if self._store_fragments:
+                node._register_with_children(self._fragment_nodes)  # type: ignore
+        elif was_handled:
+            self._min_dependency = self._handled_order.get(uid, -1)
+        else:
+            # UUID edge of a known UUID, or a node that condensed itself
+            self._min_dependency = -1
+
+        encoded_dict = self.encode_to_dict(node_dict)
+
+        min_dependency = self._min_dependency
+        if self._store_fragments and serialized_in_full and min_dependency >= handled_count_before:
+            serialized = tuple(self._serialized[serialized_before:])
+            object.__setattr__(node, "_json_fragment", _JsonFragment(encoded_dict, self.sort_keys, self._fragment_condense_to_uuid, serialized))
+            self._fragment_nodes[id(node)] = node  # type: ignore
+        self._min_dependency = min(outer_min_dependency, min_dependency)
+        return encoded_dict
+
+    def _encode_key(self, key):
+        """
+        Converts dict keys, that are not strings, like `json.dumps` does.
+        """
+        if key is None or isinstance(key, (int, float)):
+            return json.dumps(key)
+        raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
     def _apply_modifications(self, serialize_dict: Dict):
         """
         Checks the serialize_dict to see if any other operations are required before it
@@ -300,20 +470,53 @@ class _NodeDecoderHook:
         else:
             raise CRIPTJsonNodeError(node_type_list, str(node_str))
 
-        # Iterate over all nodes in cript to find the correct one here
-        for key, pyclass in inspect.getmembers(cript.nodes, inspect.isclass):
-            if BaseNode in inspect.getmro(pyclass):
-                if key == node_type_str:
-                    try:
-                        json_node = pyclass._from_json(node_dict)
-                        self._uid_cache[json_node.uid] = json_node
-                        return json_node
-                    except Exception as exc:
-                        raise CRIPTJsonDeserializationError(key, str(node_type_str)) from exc
-        # Fall back
-        return node_dict
+        pyclass = _get_node_class(node_type_str)
+        if pyclass is None:
+            # Fall back
+            return node_dict
+        try:
+            json_node = pyclass._from_json(node_dict)
+            self._uid_cache[json_node.uid] = json_node
+            return json_node
+        except Exception as exc:
+            raise CRIPTJsonDeserializationError(node_type_str, str(node_type_str)) from exc
+
+    def decode(self, obj):
+        """
+        Converts already parsed JSON, like dicts returned by the API, into nodes.
+
+        Dicts and lists are visited bottom-up in document order, so the hook is called in the same order
+        as for `json.loads(json.dumps(obj), object_hook=self)`, but without encoding and parsing the JSON again.
+        The given dicts and lists are not modified.
+
+        Parameters
+        ----------
+        obj : Any
+            parsed JSON, typically a dict or a list of dicts
+
+        Returns
+        -------
+        Any
+            the same structure, where the dicts of nodes are replaced by nodes
+        """
+        if isinstance(obj, dict):
+            return self({key: value if isinstance(value, _JSON_SCALAR_TYPES) else self.decode(value) for key, value in obj.items()})
+        if isinstance(obj, (list, tuple)):
+            return [element if isinstance(element, _JSON_SCALAR_TYPES) else self.decode(element) for element in obj]
+        return obj
 
     def resolve_unresolved_uids(self, node_iter):
+        for node_leaves in iterate_leaves(node_iter):
+            if isinstance(node_leaves, BaseNode):
+                for node in node_leaves:
+                    self._resolve_node_uids(node)
+        return node_iter
+
+    def _resolve_node_uids(self, node: BaseNode) -> None:
+        """
+        Replaces the `UIDProxy` attributes of a single node, without descending into its children.
+        """
+
         def handle_uid_replacement(node, name, attr):
             if isinstance(attr, UIDProxy):
                 unresolved_uid = attr.uid
@@ -324,31 +527,63 @@ class _NodeDecoderHook:
                 updated_attrs = dataclasses.replace(node._json_attrs, **{name: uid_node})
                 node._update_json_attrs_if_valid(updated_attrs)
 
-        for node_leaves in iterate_leaves(node_iter):
-            if isinstance(node_leaves, BaseNode):
-                for node in node_leaves:
-                    field_names = [field.name for field in dataclasses.fields(node._json_attrs)]
-                    for field_name in field_names:
-                        field_attr = getattr(node._json_attrs, field_name)
-                        handle_uid_replacement(node, field_name, field_attr)
-                        if isinstance(field_attr, list):
-                            for i in range(len(field_attr)):
-                                if isinstance(field_attr[i], UIDProxy):
-                                    try:
-                                        field_attr[i] = self.uid_cache[field_attr[i].uid]
-                                    except KeyError as exc:
-                                        raise CRIPTDeserializationUIDError("Unknown", field_attr[i].uid) from exc
-        return node_iter
+        for field_name in _get_field_metadata(type(node._json_attrs)).field_names:
+            field_attr = getattr(node._json_attrs, field_name)
+            handle_uid_replacement(node, field_name, field_attr)
+            if isinstance(field_attr, list):
+                for i in range(len(field_attr)):
+                    if isinstance(field_attr[i], UIDProxy):
+                        try:
+                            field_attr[i] = self.uid_cache[field_attr[i].uid]
+                        except KeyError as exc:
+                            raise CRIPTDeserializationUIDError("Unknown", field_attr[i].uid) from exc
 
 
-def load_nodes_from_json(nodes_json: Union[str, Dict], api=None, _use_uuid_cache: Optional[Dict] = None, skip_validation: bool = False):
+@contextmanager
+def _deserialization_context(api, uuid_cache: Optional[Dict] = None, trusted: bool = False):
+    """
+    Prepares the SDK for loading nodes from JSON.
+
+    Validation is disabled while the nodes are created, and if requested a custom UUID cache is used.
+    For trusted JSON, nodes are created directly from their attributes, see `BaseNode._from_json`.
+    Everything is restored at the end, even if loading fails.
+
+    Yields
+    ------
+    bool
+        the `skip_validation` setting of the API before loading
+    """
+    # Store previous UUIDBaseNode Cache state
+    previous_uuid_cache = UUIDBaseNode._uuid_cache
+
+    if uuid_cache is not None:  # If requested use a custom cache.
+        UUIDBaseNode._uuid_cache = uuid_cache
+
+    previous_skip_validation = api.schema.skip_validation
+    # Temporarily disable validation while loading nodes from JSON
+    api.schema.skip_validation = True
+    trusted_token = _trusted_json_construction.set(trusted)
+    try:
+        yield previous_skip_validation
+    finally:
+        # Definitively restore the old cache state
+        UUIDBaseNode._uuid_cache = previous_uuid_cache
+        api.schema.skip_validation = previous_skip_validation
+        _trusted_json_construction.reset(trusted_token)
+
+
+def load_nodes_from_json(nodes_json: Union[str, Dict], api=None, _use_uuid_cache: Optional[Dict] = None, skip_validation: bool = False, trusted: bool = False):
     """
     User facing function, that return a node and all its children from a json string input.
 
     Parameters
     ----------
     nodes_json: Union[str, dict]
-        JSON string representation of a CRIPT node
+        JSON string representation of a CRIPT node, or its already parsed dict
+    trusted: bool
+        the JSON comes from a trusted source, like the API or an archive written by the SDK.
+        Nodes are then created directly from their attributes, without the type checks of their constructors.
+        The loaded nodes are still validated at the end, unless validation is skipped.
 
     Examples
     --------
@@ -397,27 +632,13 @@ def load_nodes_from_json(nodes_json: Union[str, Dict], api=None, _use_uuid_cache
     # Initialize the custom decoder hook for JSON deserialization
     node_json_hook = _NodeDecoderHook()
 
-    # Convert everything into a string. This is slightly inefficient for already encoded dicts,
-    # but catches a lot of odd cases. And at the moment performance is not bottle necked here
-    if not isinstance(nodes_json, str):
-        nodes_json = json.dumps(nodes_json)
-
-    # Store previous UUIDBaseNode Cache state
-    previous_uuid_cache = UUIDBaseNode._uuid_cache
-
-    if _use_uuid_cache is not None:  # If requested use a custom cache.
-        UUIDBaseNode._uuid_cache = _use_uuid_cache
-
-    previous_skip_validation = api.schema.skip_validation
-    # Temporarily disable validation while loading nodes from JSON
-    api.schema.skip_validation = True
-    try:
-        loaded_nodes = json.loads(nodes_json, object_hook=node_json_hook)
+    with _deserialization_context(api, _use_uuid_cache, trusted=trusted) as previous_skip_validation:
+        if isinstance(nodes_json, str):
+            loaded_nodes = _json_loads(nodes_json, object_hook=node_json_hook)
+        else:
+            # Already parsed JSON, like the results of the `Paginator`, is decoded directly
+            loaded_nodes = node_json_hook.decode(nodes_json)
         loaded_nodes = node_json_hook.resolve_unresolved_uids(loaded_nodes)
-    finally:
-        # Definitively restore the old cache state
-        UUIDBaseNode._uuid_cache = previous_uuid_cache
-        api.schema.skip_validation = previous_skip_validation
 
     # If nodes are actually expected to be checked, do it now
     if not previous_skip_validation and not skip_validation:
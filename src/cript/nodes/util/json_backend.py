@@ -0,0 +1,234 @@
+"""
+Pluggable JSON backend, used wherever the SDK decodes large JSON documents or encodes request bodies.
+
+The standard library `json` module is the default.
+A faster library can be selected with `set_json_backend` or the environment variable `CRIPT_JSON_BACKEND`:
+
+* `"json"`: the standard library, always available
+* `"orjson"`, `"ujson"`, `"msgspec"`: the respective library, it has to be installed
+* `"auto"`: the fastest installed library of the above
+
+All backends decode to the same Python objects.
+Encoding with a faster backend parses to the same values in the same key order, honouring `sort_keys` and `indent`,
+but the text differs from `json.dumps`: there are no spaces after `,` and `:` without `indent`,
+and floats are formatted differently, like `1e-7` instead of `1e-07`.
+The backend therefore only encodes request bodies, where only the values matter.
+JSON strings the user sees, like `get_json().json`, JSON Lines archives and content hashes,
+are always encoded by the standard library and are the same for every backend.
+Anything a backend cannot do identically, like other `json.dumps` arguments, non ASCII text (which `json.dumps` escapes),
+integers that do not fit into 64 bit, or the non-standard `NaN` and `Infinity` literals (which orjson and msgspec encode as `null`),
+falls back to the standard library.
+"""
+import importlib
+import json
+import math
+import os
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# Backends in order of preference for "auto"
+_JSON_BACKEND_NAMES: List[str] = ["orjson", "msgspec", "ujson", "json"]
+
+# `json.dumps` arguments every backend supports, anything else is passed to the standard library
+_BACKEND_DUMPS_KWARGS = frozenset({"sort_keys", "indent", "check_circular"})
+
+
+class _JSONBackend:
+    """
+    Standard library backend, and base class of the other backends.
+    """
+
+    name: str = "json"
+
+    def dumps(self, obj: Any, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+        return json.dumps(obj, sort_keys=sort_keys, indent=indent)
+
+    def loads(self, json_str: Union[str, bytes]) -> Any:
+        return json.loads(json_str)
+
+
+class _OrjsonBackend(_JSONBackend):
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = importlib.import_module("orjson")
+
+    def dumps(self, obj: Any, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+        if indent not in (None, 2):
+            return super().dumps(obj, sort_keys=sort_keys, indent=indent)
+        option = 0
+        if sort_keys:
+            option |= self._orjson.OPT_SORT_KEYS
+        if indent == 2:
+            option |= self._orjson.OPT_INDENT_2
+        return self._orjson.dumps(obj, option=option).decode()
+
+    def loads(self, json_str: Union[str, bytes]) -> Any:
+        return self._orjson.loads(json_str)
+
+
+class _UjsonBackend(_JSONBackend):
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = importlib.import_module("ujson")
+
+    def dumps(self, obj: Any, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+        return self._ujson.dumps(obj, sort_keys=sort_keys, indent=indent or 0, escape_forward_slashes=False)
+
+    def loads(self, json_str: Union[str, bytes]) -> Any:
+        return self._ujson.loads(json_str)
+
+
+class _MsgspecBackend(_JSONBackend):
+    name = "msgspec"
+
+    def __init__(self):
+        self._msgspec_json = importlib.import_module("msgspec.json")
+        self._encoder = self._msgspec_json.Encoder()
+        self._sorted_encoder = self._msgspec_json.Encoder(order="sorted")
+        self._decoder = self._msgspec_json.Decoder()
+
+    def dumps(self, obj: Any, sort_keys: bool = False, indent: Optional[int] = None) -> str:
+        encoded = (self._sorted_encoder if sort_keys else self._encoder).encode(obj)
+        if indent is not None:
+            encoded = self._msgspec_json.format(encoded, indent=indent)
+        return encoded.decode()
+
+    def loads(self, json_str: Union[str, bytes]) -> Any:
+        return self._decoder.decode(json_str)
+
+
+_JSON_BACKEND_CLASSES: Dict[str, Callable[[], _JSONBackend]] = {
+    "json": _JSONBackend,
+    "orjson": _OrjsonBackend,
+    "ujson": _UjsonBackend,
+    "msgspec": _MsgspecBackend,
+}
+
+_stdlib_backend = _JSONBackend()
+_json_backend: _JSONBackend = _stdlib_backend
+
+
+def set_json_backend(name: str = "json") -> str:
+    """
+    Selects the JSON library used by the SDK.
+
+    Parameters
+    ----------
+    name: str
+        One of `"json"`, `"orjson"`, `"ujson"`, `"msgspec"` or `"auto"` for the fastest installed library.
+
+    Returns
+    -------
+    str
+        Name of the selected backend.
+
+    Raises
+    ------
+    ValueError
+        If the name is unknown.
+    ImportError
+        If the requested library is not installed.
+
+    Examples
+    --------
+    >>> import cript
+    >>> cript.set_json_backend("json")
+    'json'
+    """
+    global _json_backend
+
+    if name == "auto":
+        for backend_name in _JSON_BACKEND_NAMES:
+            try:
+                return set_json_backend(backend_name)
+            except ImportError:
+                continue
+
+    try:
+        backend_class = _JSON_BACKEND_CLASSES[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown JSON backend {name!r}, choose one of {sorted(_JSON_BACKEND_CLASSES)} or 'auto'.") from exc
+
+    _json_backend = _stdlib_backend if backend_class is _JSONBackend else backend_class()
+    return _json_backend.name
+
+
+def get_json_backend() -> str:
+    """
+    Name of the JSON library used by the SDK.
+    """
+    return _json_backend.name
+
+
+def _json_dumps(obj: Any, **kwargs) -> str:
+    """
+    `json.dumps` with the selected backend, for JSON that is only parsed again, like request bodies.
+
+    The values are the same as with `json.dumps`, but whitespace and the formatting of floats may differ.
+    """
+    if _json_backend is not _stdlib_backend and _BACKEND_DUMPS_KWARGS.issuperset(kwargs) and not _contains_non_finite_float(obj):
+        try:
+            json_str = _json_backend.dumps(obj, sort_keys=kwargs.get("sort_keys", False), indent=kwargs.get("indent"))
+        except (TypeError, ValueError, OverflowError):
+            pass  # e.g. large integers, let the standard library handle it or raise the error
+        else:
+            if json_str.isascii():
+                return json_str
+    return json.dumps(obj, **kwargs)
+
+
+def _contains_non_finite_float(obj: Any) -> bool:
+    """
+    Checks for NaN and Infinity anywhere in an object, which `json.dumps` writes as `NaN` and `Infinity`, but some backends as `null`.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _json_loads(json_str: Union[str, bytes, bytearray], object_hook: Optional[Callable[[Dict], Any]] = None) -> Any:
+    """
+    `json.loads` with the selected backend.
+
+    The `object_hook` is applied to every decoded dict in the same order as `json.loads` does,
+    innermost dicts first.
+    """
+    if _json_backend is _stdlib_backend:
+        return json.loads(json_str, object_hook=object_hook)
+
+    try:
+        decoded = _json_backend.loads(json_str)
+    except (TypeError, ValueError, OverflowError):
+        # Let the standard library decode what the backend does not support, or raise the usual `json.JSONDecodeError`
+        return json.loads(json_str, object_hook=object_hook)
+
+    if object_hook is None:
+        return decoded
+    return _apply_object_hook(decoded, object_hook)
+
+
+def _apply_object_hook(obj: Any, object_hook: Callable[[Dict], Any]) -> Any:
+    """
+    Applies an `object_hook` to already decoded JSON, children before their parents.
+    """
+    if isinstance(obj, dict):
+        return object_hook({key: _apply_object_hook(value, object_hook) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return [_apply_object_hook(element, object_hook) for element in obj]
+    return obj
+
+
+# Select the backend from the environment, unknown or missing libraries fall back to the standard library
+try:
+    set_json_backend(os.environ.get("CRIPT_JSON_BACKEND", "json"))
+except (ValueError, ImportError):
+    _json_backend = _stdlib_backend
@@ -0,0 +1,489 @@
+"""
+Streaming decoder for large JSON documents of nodes.
+
+`load_nodes_from_json` parses a whole document at once, so the JSON text, the parsed dicts and the nodes
+are all in memory at the same time. `stream_nodes_from_json` instead reads a document chunk by chunk,
+from a file or an HTTP response, and decodes the items of one JSON array of the document one at a time.
+Every item is handed out as soon as it is complete. Items are decoded as they are read, so neither the text
+of the document nor its parsed dicts are ever held as a whole, only the current chunk and the nodes decoded so far.
+The nodes of an item are all in memory until the item is complete, though, so a single huge item,
+like one large project, needs as much memory as its nodes do.
+
+Items can reference nodes of other items by their UID. References to nodes that were already decoded are
+resolved directly. Items with references to nodes further down the stream are held back until those nodes arrive,
+so the items are still handed out in document order and without any `UIDProxy` left in them.
+"""
+import codecs
+import dataclasses
+import json
+import os
+import re
+import weakref
+from collections import deque
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+from cript.nodes.core import BaseNode
+from cript.nodes.exceptions import CRIPTDeserializationUIDError
+from cript.nodes.field_metadata import _get_field_metadata
+from cript.nodes.util.core import iterate_leaves
+from cript.nodes.util.json import UIDProxy, _deserialization_context, _NodeDecoderHook
+from cript.nodes.util.json_backend import _json_loads
+
+# Size of the chunks read from files and HTTP responses
+_DEFAULT_CHUNK_SIZE: int = 1 << 20
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# Characters that open or close strings, objects and arrays
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+# Rest of a string up to its closing quote, or to a backslash at the end of the chunk
+_STRING_REST_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# Numbers, `true`, `false` and `null`
+_SCALAR_RE = re.compile(r'[^,:\[\]{}" \t\n\r]*')
+
+# Parses values that are completely inside of a chunk, with the C scanner of the standard library
+_RAW_DECODER = json.JSONDecoder()
+
+
+def _iter_text_chunks(source, chunk_size: int) -> Iterator[str]:
+    """
+    Reads text chunks from a path, a file-like object, a `requests.Response` or an iterable of chunks.
+    Chunks of bytes are decoded as UTF-8.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file_handle:
+            yield from _iter_text_chunks(file_handle, chunk_size)
+        return
+
+    if hasattr(source, "iter_content"):
+        # `requests.Response` of a request with `stream=True`, this also undoes the content encoding
+        chunks: Iterable = source.iter_content(chunk_size=chunk_size)
+    elif hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    rest = decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+
+class _JSONTextStream:
+    """
+    Splits JSON text, that arrives in chunks, into single values.
+
+    Values that are completely inside of a chunk are parsed directly.
+    For values that span chunks, only the structure of the text is scanned to find their end,
+    keeping the scanning state across chunk boundaries, and the collected text is parsed afterwards.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._chunk: str = ""
+        self._pos: int = 0
+
+    def _next_chunk(self) -> bool:
+        """
+        Replaces the current chunk by the next one. Returns False at the end of the stream.
+        """
+        for chunk in self._chunks:
+            self._chunk = chunk
+            self._pos = 0
+            return True
+        self._chunk = ""
+        self._pos = 0
+        return False
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next character without consuming it, or an empty string at the end of the stream.
+        """
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._chunk, self._pos).end()  # type: ignore
+            if self._pos < len(self._chunk):
+                return self._chunk[self._pos]
+            if not self._next_chunk():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Consumes the next character, which has to be `char`.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON stream: expected {char!r} but found {found or 'the end of the stream'!r}.")
+        self._pos += 1
+
+    def read_value(self, keep: bool = True) -> str:
+        """
+        Consumes the next JSON value and returns its text.
+        With `keep=False`, the value is skipped without collecting its text, and an empty string is returned.
+        """
+        first_char = self.peek()
+        if not first_char:
+            raise ValueError("Invalid JSON stream: expected a value but found the end of the stream.")
+
+        pieces: List[str] = []
+        start = self._pos
+        depth = 0
+        in_string = False
+        escape_pending = False
+        is_scalar = first_char not in '"{['
+
+        while True:
+            chunk = self._chunk
+            pos = self._pos
+            end = -1
+            if is_scalar:
+                pos = _SCALAR_RE.match(chunk, pos).end()  # type: ignore
+                if pos < len(chunk):
+                    end = pos
+            while end < 0 and pos < len(chunk):
+                if in_string:
+                    if escape_pending:
+                        pos += 1
+                        escape_pending = False
+                    pos = _STRING_REST_RE.match(chunk, pos).end()  # type: ignore
+                    if pos == len(chunk):
+                        break
+                    if chunk[pos] == "\\":
+                        # The escaped character is in the next chunk
+                        escape_pending = True
+                        pos += 1
+                        continue
+                    pos += 1
+                    in_string = False
+                    if depth == 0:
+                        end = pos
+                    continue
+
+                match = _STRUCTURE_RE.search(chunk, pos)
+                if match is None:
+                    pos = len(chunk)
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        end = pos
+
+            if end >= 0:
+                if keep:
+                    pieces.append(chunk[start:end])
+                self._pos = end
+                return "".join(pieces)
+
+            if keep:
+                pieces.append(chunk[start:])
+            if not self._next_chunk():
+                if is_scalar:
+                    return "".join(pieces)
+                raise ValueError("Invalid JSON stream: the stream ended inside of a value.")
+            start = 0
+
+    def read_decoded_value(self, decoder: _NodeDecoderHook) -> Any:
+        """
+        Consumes the next JSON value and returns it decoded by `decoder`.
+
+        Values that end within the current chunk are parsed at once. Objects and arrays that continue in later chunks
+        are decoded member by member instead, so the dicts of their nodes only hold the decoded child nodes,
+        and never the text or parsed dicts of the whole value.
+        The decoder is called in the same order as `decoder.decode` would call it for the whole value.
+        """
+        char = self.peek()
+        # Numbers and literals have no closing character. A prefix of a number, like `1.` of `1.5`, parses as well,
+        # so only the scanner can tell if they continue in the next chunk.
+        if char and char in '"{[':
+            try:
+                value, end = _RAW_DECODER.raw_decode(self._chunk, self._pos)
+            except json.JSONDecodeError:
+                end = len(self._chunk)
+            if end < len(self._chunk):
+                self._pos = end
+                return decoder.decode(value)
+
+        if char == "{":
+            self.expect("{")
+            obj = {}
+            if self.peek() != "}":
+                while True:
+                    key = json.loads(self.read_value())
+                    self.expect(":")
+                    obj[key] = self.read_decoded_value(decoder)
+                    if self.peek() == "}":
+                        break
+                    self.expect(",")
+            self.expect("}")
+            return decoder(obj)
+
+        if char == "[":
+            self.expect("[")
+            array = []
+            if self.peek() != "]":
+                while True:
+                    array.append(self.read_decoded_value(decoder))
+                    if self.peek() == "]":
+                        break
+                    self.expect(",")
+            self.expect("]")
+            return array
+
+        # The value continues in the next chunk, or it is invalid, which parsing its whole text reports
+        return _json_loads(self.read_value())
+
+    def iter_array_items(self, path: Sequence[str], read_item: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Items of the array at `path`, a sequence of keys leading from the root object to the array.
+        Each item is consumed by `read_item`, which returns it.
+        A value at `path` that is not an array is returned as the only item. Nothing is returned if `path` does not exist.
+        Everything after the array is not read.
+        """
+        for key in path:
+            self.expect("{")
+            while True:
+                if self.peek() == "}":
+                    return
+                name = json.loads(self.read_value())
+                self.expect(":")
+                if name == key:
+                    break
+                self.read_value(keep=False)
+                if self.peek() == ",":
+                    self.expect(",")
+
+        if self.peek() != "[":
+            if self.peek():
+                yield read_item()
+            return
+
+        self.expect("[")
+        if self.peek() == "]":
+            return
+        while True:
+            yield read_item()
+            if self.peek() == "]":
+                return
+            self.expect(",")
+
+
+@dataclasses.dataclass
+class _PendingItem:
+    """
+    Decoded item of the stream, and the number of its nodes that still wait for nodes of later items.
+    """
+
+    value: Any
+    num_waiting_nodes: int = 0
+
+
+class _StreamingNodeDecoder(_NodeDecoderHook):
+    """
+    Decodes all items of a stream with one UID cache, so UID edges between items are resolved.
+
+    Nodes with UID edges to nodes that have not arrived yet are registered by the missing UIDs,
+    and resolved in place when the last of their missing nodes is created.
+    """
+
+    def __init__(self):
+        # Nodes are only kept alive by the caller or the UUID cache, not by the stream
+        super().__init__(uid_cache=weakref.WeakValueDictionary())
+        # Nodes created for the current item, only inspected if the item has unresolved UID edges
+        self._item_nodes: List[BaseNode] = []
+        self._item_has_proxy: bool = False
+        # Nodes waiting for a node, by its UID
+        self._waiting_nodes: Dict[str, List[BaseNode]] = {}
+        # UIDs each waiting node is still missing, and the item it belongs to, by the `id` of the node
+        self._missing_uids: Dict[int, Set[str]] = {}
+        self._node_items: Dict[int, _PendingItem] = {}
+        self._pending_items: Deque[_PendingItem] = deque()
+
+    def __call__(self, node_dict: Dict):
+        loaded = super().__call__(node_dict)
+        if isinstance(loaded, UIDProxy):
+            self._item_has_proxy = True
+        elif isinstance(loaded, BaseNode) and "node" in node_dict:
+            self._item_nodes.append(loaded)
+            if self._waiting_nodes:
+                for waiting_node in self._waiting_nodes.pop(loaded.uid, ()):
+                    self._uid_arrived(waiting_node, loaded.uid)
+        return loaded
+
+    def _uid_arrived(self, node: BaseNode, uid: str) -> None:
+        missing_uids = self._missing_uids[id(node)]
+        missing_uids.discard(uid)
+        if not missing_uids:
+            del self._missing_uids[id(node)]
+            self._resolve_node_uids(node)
+            self._node_items.pop(id(node)).num_waiting_nodes -= 1
+
+    @staticmethod
+    def _get_proxy_uids(node: BaseNode) -> Set[str]:
+        """
+        UIDs of the `UIDProxy` attributes of a node, without descending into its children.
+        """
+        proxy_uids = set()
+        for field_name in _get_field_metadata(type(node._json_attrs)).field_names:
+            value = getattr(node._json_attrs, field_name)
+            for element in value if isinstance(value, list) else (value,):
+                if isinstance(element, UIDProxy):
+                    proxy_uids.add(element.uid)
+        return proxy_uids
+
+    def decode_item(self, text_stream: _JSONTextStream) -> None:
+        """
+        Decodes the next item of the stream, and queues it until all its UID edges are resolved.
+        """
+        self._item_nodes = []
+        self._item_has_proxy = False
+        item = _PendingItem(text_stream.read_decoded_value(self))
+
+        if self._item_has_proxy:
+            uid_cache = self.uid_cache
+            for node in self._item_nodes:
+                proxy_uids = self._get_proxy_uids(node)
+                if not proxy_uids:
+                    continue
+                missing_uids = {uid for uid in proxy_uids if uid not in uid_cache}
+                if not missing_uids:
+                    self._resolve_node_uids(node)
+                    continue
+                self._missing_uids[id(node)] = missing_uids
+                self._node_items[id(node)] = item
+                item.num_waiting_nodes += 1
+                for uid in missing_uids:
+                    self._waiting_nodes.setdefault(uid, []).append(node)
+        self._item_nodes = []
+
+        self._pending_items.append(item)
+
+    def pop_complete_items(self) -> Iterator[Any]:
+        """
+        Decoded items without unresolved UID edges, in the order of the stream.
+        """
+        while self._pending_items and self._pending_items[0].num_waiting_nodes == 0:
+            yield self._pending_items.popleft().value
+
+    def check_all_resolved(self) -> None:
+        """
+        Raises an error at the end of the stream, if a node references a UID that never arrived.
+        """
+        for uid in self._waiting_nodes:
+            raise CRIPTDeserializationUIDError("Unknown", uid)
+
+
+def stream_nodes_from_json(
+    source: Union[str, os.PathLike, IO, Iterable[Union[str, bytes]]],
+    path: Sequence[str] = (),
+    api=None,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    _use_uuid_cache: Optional[Dict] = None,
+    skip_validation: bool = False,
+    trusted: bool = False,
+) -> Iterator[Any]:
+    """
+    Reads a large JSON document in chunks, and returns the nodes of one of its arrays one by one.
+
+    Only one chunk of the text is held in memory, and the nodes are created while it is read,
+    without the parsed dicts of whole items. Documents of many gigabytes, like exports or big API responses,
+    can be loaded without reading them at once. Memory then only grows with the nodes that are kept.
+    Every item is returned as a whole though, so the nodes of one item are all in memory at the same time.
+    Streaming a single large project avoids the text and parsed dicts, but not the memory of its nodes.
+    Each item is decoded like `load_nodes_from_json` does and returned as soon as it is complete.
+    UID edges are resolved across items. Items that reference nodes of later items are held back
+    until these nodes arrive, so the items always come in the order of the document.
+
+    The nodes are decoded with validation disabled, and validated one item at a time before they are returned.
+
+    The stream itself does not keep returned nodes alive. They stay in the UUID cache though, as all loaded nodes do.
+    To keep the memory bounded for the nodes as well, load into a separate cache that does not hold them,
+    like `_use_uuid_cache=weakref.WeakValueDictionary()`. UID edges can then only refer to nodes that are still in use.
+
+    Parameters
+    ----------
+    source: Union[str, os.PathLike, IO, Iterable[Union[str, bytes]]]
+        path of a JSON file, a file-like object opened for reading text or bytes,
+        a `requests.Response` of a request with `stream=True`, or any iterable of text or UTF-8 chunks
+    path: Sequence[str]
+        keys that lead from the root object of the document to the array of nodes, like `("data",)` for API responses.
+        By default the document itself is the array. A value at `path` that is not an array is returned as the only item.
+    api: Optional[cript.API]
+        API used for validation, by default the currently active API
+    chunk_size: int
+        number of bytes or characters to read from files and responses at once
+    skip_validation: bool
+        do not validate the loaded nodes
+    trusted: bool
+        the document comes from a trusted source, like the API.
+        Nodes are then created directly from their attributes, without the type checks of their constructors.
+
+    Returns
+    -------
+    Iterator[Any]
+        the decoded items, typically one CRIPT node each
+
+    Raises
+    ------
+    ValueError
+        If the document is not valid JSON around the array.
+    CRIPTJsonNodeError
+        If there is an issue with the JSON of the node field.
+    CRIPTJsonDeserializationError
+        If there is an error during deserialization of a specific node.
+    CRIPTDeserializationUIDError
+        If a node references a UID that is not part of the document.
+
+    Examples
+    --------
+    >>> import cript
+    >>> import io
+    >>> my_materials = [cript.Material(name=f"my material {i}", bigsmiles="{[][$]CC[$][]}") for i in range(3)]
+    >>> file_handle = io.StringIO('{"data": [' + ", ".join(material.get_json().json for material in my_materials) + "]}")
+    >>> [material.name for material in cript.stream_nodes_from_json(file_handle, path=("data",))]
+    ['my material 0', 'my material 1', 'my material 2']
+
+    Large API responses can be read while they are downloaded, with `stream=True`:
+
+    >>> import requests
+    >>> response = requests.get(
+    ...     url=f"{api.host}/{api.api_prefix}/{api.api_version}/project/{project_uuid}",
+    ...     headers={"Authorization": f"Bearer {api_token}"},
+    ...     stream=True,
+    ... ) # doctest: +SKIP
+    >>> for my_project in cript.stream_nodes_from_json(response, path=("data",)): # doctest: +SKIP
+    ...     print(my_project.name)
+    """
+    from cript.api.api import _get_global_cached_api
+
+    if api is None:
+        api = _get_global_cached_api()
+
+    text_stream = _JSONTextStream(_iter_text_chunks(source, chunk_size))
+    decoder = _StreamingNodeDecoder()
+
+    previous_skip_validation = False
+
+    def decode_next_item() -> None:
+        nonlocal previous_skip_validation
+        # The SDK is only prepared for loading while decoding, not while the caller works with the returned nodes
+        with _deserialization_context(api, _use_uuid_cache, trusted=trusted) as previous_skip_validation:
+            decoder.decode_item(text_stream)
+
+    for _ in text_stream.iter_array_items(path, decode_next_item):
+        for item in decoder.pop_complete_items():
+            if not previous_skip_validation and not skip_validation:
+                for node in iterate_leaves(item):
+                    if isinstance(node, BaseNode):
+                        node.validate()
+            yield item
+
+    decoder.check_all_resolved()
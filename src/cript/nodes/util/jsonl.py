@@ -0,0 +1,193 @@
+"""
+Flat JSON Lines archive format of node graphs.
+
+Every node of a graph is written as one line of JSON. Child nodes are not nested,
+but referenced with UUID edges like `{"uuid": "..."}`.
+Children are written before their parents, so the root node is the last line.
+This allows to write and read large graphs line by line, to split or concatenate archives,
+and to compare them with line based tools.
+"""
+import json
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set
+
+from cript.nodes.core import BaseNode
+from cript.nodes.field_metadata import _get_field_metadata
+from cript.nodes.util.json import (
+    NodeEncoder,
+    UIDProxy,
+    _deserialization_context,
+    _NodeDecoderHook,
+)
+from cript.nodes.util.json_backend import _json_loads
+
+
+def _iter_child_nodes(node: BaseNode) -> Iterator[BaseNode]:
+    """
+    Direct children of a node, ordered by the names of the attributes holding them.
+    """
+    for field_name in _get_field_metadata(type(node._json_attrs)).child_field_names:
+        value = getattr(node._json_attrs, field_name)
+        if not isinstance(value, list):
+            value = [value]
+        for element in value:
+            if isinstance(element, BaseNode):
+                yield element
+
+
+def _iter_nodes_children_first(root: BaseNode) -> Iterator[BaseNode]:
+    """
+    Every node of a graph once, children before their parents.
+    For circular references, the node that closes the circle comes first.
+    """
+    visited: Set[str] = {str(root.uuid)}
+    stack = [(root, _iter_child_nodes(root))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            child_uuid = str(child.uuid)
+            if child_uuid not in visited:
+                visited.add(child_uuid)
+                stack.append((child, _iter_child_nodes(child)))
+                break
+        else:
+            stack.pop()
+            yield node
+
+
+def _to_uuid_edge(value):
+    """
+    Replaces nodes, and nodes in lists, by UUID edges.
+    """
+    if isinstance(value, BaseNode):
+        return {"uuid": str(value.uuid)}
+    if isinstance(value, list):
+        return [_to_uuid_edge(element) for element in value]
+    return value
+
+
+def dump_jsonl(node: BaseNode, fp: IO[str], sort_keys: bool = False) -> None:
+    """
+    Writes a node and all its children as a flat JSON Lines archive, one node per line.
+
+    Child nodes are referenced with UUID edges (`{"uuid": "..."}`) instead of being nested,
+    and they are written before their parents, so the last line is the node itself.
+    Only one node at a time is held in memory as JSON.
+
+    Parameters
+    ----------
+    node: BaseNode
+        root node of the graph to write, for example a project
+    fp: IO[str]
+        file-like object opened for writing text
+    sort_keys: bool
+        sort the attributes of each node
+
+    Examples
+    --------
+    >>> import cript
+    >>> import io
+    >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+    >>> my_project = cript.Project(name="my project", material=[my_material])
+    >>> file_handle = io.StringIO()
+    >>> cript.dump_jsonl(my_project, file_handle)
+    >>> len(file_handle.getvalue().splitlines())
+    2
+    """
+    # Nothing is condensed by the encoder itself, every child becomes a UUID edge below
+    encoder = NodeEncoder(condense_to_uuid={}, sort_keys=sort_keys)
+    for graph_node in _iter_nodes_children_first(node):
+        node_dict = {key: _to_uuid_edge(value) for key, value in encoder.default(graph_node).items()}
+        fp.write(json.dumps(encoder.encode_to_dict(node_dict), sort_keys=sort_keys))
+        fp.write("\n")
+
+
+def load_jsonl(fp: Iterable[str], api=None, _use_uuid_cache: Optional[Dict] = None, skip_validation: bool = False, trusted: bool = False):
+    """
+    Loads a flat JSON Lines archive written by `dump_jsonl`, line by line.
+
+    Parameters
+    ----------
+    fp: Iterable[str]
+        file-like object opened for reading text, or any other iterable of lines
+    api: Optional[cript.API]
+        API used for validation, by default the currently active API
+    skip_validation: bool
+        do not validate the loaded graph
+    trusted: bool
+        the archive comes from a trusted source, nodes are then created without the type checks of their constructors
+
+    Returns
+    -------
+    BaseNode
+        node of the last line, that is the root node of the archive, with all its children
+
+    Raises
+    ------
+    ValueError
+        If the archive contains no nodes.
+    CRIPTJsonNodeError
+        If there is an issue with the JSON of the node field.
+    CRIPTJsonDeserializationError
+        If there is an error during deserialization of a specific node.
+    CRIPTDeserializationUIDError
+        If a UUID edge references a node that is not in the archive.
+
+    Examples
+    --------
+    >>> import cript
+    >>> import io
+    >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+    >>> my_project = cript.Project(name="my project", material=[my_material])
+    >>> file_handle = io.StringIO()
+    >>> cript.dump_jsonl(my_project, file_handle)
+    >>> _ = file_handle.seek(0)
+    >>> cript.load_jsonl(file_handle) is my_project
+    True
+    """
+    from cript.api.api import _get_global_cached_api
+
+    if api is None:
+        api = _get_global_cached_api()
+
+    node_json_hook = _NodeDecoderHook()
+    # Nodes of lines that reference nodes of later lines, they are resolved once everything is loaded
+    nodes_with_proxies: List[BaseNode] = []
+    line_has_proxy: bool = False
+
+    def edge_hook(node_dict: Dict):
+        nonlocal line_has_proxy
+        if len(node_dict) == 1 and "uuid" in node_dict:
+            try:
+                return node_json_hook.uid_cache[node_dict["uuid"]]
+            except KeyError:
+                line_has_proxy = True
+                return UIDProxy(uid=node_dict["uuid"])
+
+        loaded = node_json_hook(node_dict)
+        if isinstance(loaded, BaseNode):
+            # UUID edges are resolved with the same cache as UID edges
+            node_json_hook.uid_cache[str(loaded.uuid)] = loaded
+        return loaded
+
+    root = None
+    with _deserialization_context(api, _use_uuid_cache, trusted=trusted) as previous_skip_validation:
+        for line in fp:
+            if not line.strip():
+                continue
+            line_has_proxy = False
+            root = _json_loads(line, object_hook=edge_hook)
+            if line_has_proxy:
+                nodes_with_proxies.append(root)
+
+        for node in nodes_with_proxies:
+            node_json_hook._resolve_node_uids(node)
+
+    if root is None:
+        raise ValueError("The JSON Lines archive contains no nodes.")
+
+    if not previous_skip_validation and not skip_validation:
+        root.validate()
+
+    if _use_uuid_cache is not None:
+        return root, _use_uuid_cache
+    return root
@@ -0,0 +1,150 @@
+"""
+Lightweight views of node JSON, that create the actual nodes only when they are needed.
+"""
+import functools
+from typing import Any, Dict, FrozenSet
+
+from cript.nodes.core import BaseNode
+from cript.nodes.field_metadata import _get_field_metadata
+from cript.nodes.node_registry import _get_node_class
+
+# Fields that `_from_json` does not take over from the JSON as they are
+_NOT_LAZY_FIELD_NAMES = frozenset({"uid", "model_version"})
+
+# Marks attributes that cannot be read from the JSON without creating the node
+_NOT_IN_JSON = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_lazy_field_names(node_class: type) -> FrozenSet[str]:
+    """
+    Attributes of a node class, that a `LazyNode` can read directly from the JSON.
+    These are the fields of the `JsonAttributes` that the node class offers as attributes.
+    """
+    field_names = _get_field_metadata(node_class.JsonAttributes).field_names
+    return frozenset(field_name for field_name in field_names if field_name not in _NOT_LAZY_FIELD_NAMES and hasattr(node_class, field_name))
+
+
+def _contains_dict(value: Any) -> bool:
+    """
+    Checks if a JSON value contains objects, that are child nodes or edges to nodes.
+    """
+    if isinstance(value, dict):
+        return True
+    if isinstance(value, list):
+        return any(_contains_dict(element) for element in value)
+    return False
+
+
+class LazyNode:
+    """
+    View of the JSON of a node, that creates the actual node with all its children only on first use.
+
+    Reading attributes that the JSON holds as plain values, like `name` or `uuid`, costs a dict access only.
+    Anything else, like attributes with child nodes, methods such as `get_json` or `validate`,
+    or setting attributes, creates the node with `load_nodes_from_json` once and forwards to it.
+
+    `LazyNode` objects are returned by a `Paginator` with `lazy_load_nodes` enabled.
+    Since they are not nodes themselves, use `materialize()` to get the node, for example for `isinstance` checks
+    or to add it to another node.
+
+    Examples
+    --------
+    >>> import cript
+    >>> my_lazy_material = cript.LazyNode({"node": ["Material"], "uuid": "1f5a4b6e-8b3a-4c2a-9b0e-3d2f1e4c5a6b", "name": "my material"})
+    >>> my_lazy_material.name
+    'my material'
+    >>> my_lazy_material.is_materialized
+    False
+    """
+
+    __slots__ = ("_json_dict", "_node", "_api")
+
+    def __init__(self, json_dict: Dict, api=None):
+        """
+        Parameters
+        ----------
+        json_dict: Dict
+            parsed JSON of a node, as returned by the API. It is not modified.
+        api: Optional[cript.API]
+            API that returned the JSON. Saving the node with it later only sends what changed after it was created.
+        """
+        object.__setattr__(self, "_json_dict", json_dict)
+        object.__setattr__(self, "_node", None)
+        object.__setattr__(self, "_api", api)
+
+    @property
+    def node_type(self) -> str:
+        return self._json_dict["node"][0]
+
+    @property
+    def uuid(self) -> str:
+        return str(self._json_dict["uuid"])
+
+    @property
+    def json_dict(self) -> Dict:
+        """
+        The JSON of the node, as it was received. It must not be modified.
+        """
+        return self._json_dict
+
+    @property
+    def is_materialized(self) -> bool:
+        """
+        If the node was already created.
+        """
+        return self._node is not None
+
+    def materialize(self) -> BaseNode:
+        """
+        Creates the node with all its children from the JSON, on the first call only.
+
+        Returns
+        -------
+        BaseNode
+            the node described by the JSON
+        """
+        if self._node is None:
+            # Delayed import to avoid circular imports
+            from cript.nodes.util.json import load_nodes_from_json
+
+            object.__setattr__(self, "_node", load_nodes_from_json(self._json_dict))
+            if self._api is not None:
+                self._api._record_loaded_nodes(self._json_dict)
+        return self._node  # type: ignore
+
+    def _get_json_value(self, name: str) -> Any:
+        """
+        Reads an attribute from the JSON, if that is possible without creating the node.
+        Returns `_NOT_IN_JSON` otherwise.
+        """
+        node_class = _get_node_class(self.node_type)
+        if node_class is None or name not in _get_lazy_field_names(node_class):
+            return _NOT_IN_JSON
+        try:
+            value = self._json_dict[name]
+        except KeyError:
+            # Omitted attributes have their default value
+            return _get_field_metadata(node_class.JsonAttributes).get_default(name)
+        if _contains_dict(value):
+            return _NOT_IN_JSON
+        if isinstance(value, list):
+            # Node attributes hand out lists that can be modified, the JSON must stay untouched
+            return list(value)
+        return value
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that are not defined by `LazyNode` itself
+        if self._node is None and not name.startswith("_"):
+            value = self._get_json_value(name)
+            if value is not _NOT_IN_JSON:
+                return value
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.materialize(), name, value)
+
+    def __repr__(self) -> str:
+        if self._node is not None:
+            return f"LazyNode({self._node!r})"
+        return f"LazyNode({self.node_type}, uuid={self.uuid})"
@@ -0,0 +1,165 @@
+"""
+Binary snapshot format of node graphs for local persistence.
+
+A snapshot stores the attributes of every node of a graph with pickle protocol 5.
+Loading a snapshot neither parses JSON nor goes through `_from_json` and validation,
+so large in-progress graphs can be checkpointed and restored quickly.
+Shared nodes and circular references are restored as the same objects,
+and every loaded node is registered in the UUID cache under its UUID.
+
+Snapshots are meant to be written and read by the same version of the SDK on trusted machines.
+They are not a replacement for the JSON formats to exchange data.
+"""
+import os
+import pickle
+from typing import IO, Dict, Optional, Union
+
+from cript.nodes.core import BaseNode
+from cript.nodes.exceptions import CRIPTUUIDException
+from cript.nodes.uuid_base import UUIDBaseNode
+
+# Identifies snapshot files, the last byte is the version of the format
+_SNAPSHOT_HEADER: bytes = b"CRIPT-SNAPSHOT\x00\x01"
+
+# Classes outside of the SDK that attributes of nodes can contain
+_ALLOWED_GLOBALS = {("uuid", "UUID"), ("uuid", "SafeUUID")}
+
+
+def _restore_node(cls, node_uuid: Optional[str]):
+    """
+    Creates an empty node of a snapshot without calling `__init__`, its attributes are set by `_set_node_state`.
+    A node that already exists in the UUID cache is reused, like `load_nodes_from_json` does.
+    """
+    if node_uuid is None:
+        return object.__new__(cls)
+
+    existing_node = UUIDBaseNode._uuid_cache.get(node_uuid)
+    if existing_node is not None:
+        if type(existing_node) is not cls:
+            raise CRIPTUUIDException(node_uuid, type(existing_node), cls)
+        return existing_node
+
+    node = object.__new__(cls)
+    UUIDBaseNode._uuid_cache[node_uuid] = node
+    return node
+
+
+def _set_node_state(node: BaseNode, json_attrs) -> None:
+    node._json_attrs = json_attrs
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles nodes by their class, UUID and attributes only.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, BaseNode):
+            node_uuid = str(obj._json_attrs.uuid) if isinstance(obj, UUIDBaseNode) else None
+            return _restore_node, (type(obj), node_uuid), obj._json_attrs, None, None, _set_node_state
+        return NotImplemented
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Only loads classes and functions of the SDK, and the few others node attributes can contain.
+    """
+
+    def find_class(self, module, name):
+        if module.split(".", 1)[0] != "cript" and (module, name) not in _ALLOWED_GLOBALS:
+            raise pickle.UnpicklingError(f"CRIPT snapshots cannot contain `{module}.{name}`.")
+        return super().find_class(module, name)
+
+
+def dump_snapshot(node: BaseNode, file: Union[str, os.PathLike, IO[bytes]]) -> None:
+    """
+    Writes a node and all its children as a binary snapshot.
+
+    Parameters
+    ----------
+    node: BaseNode
+        root node of the graph to write, for example a project
+    file: Union[str, os.PathLike, IO[bytes]]
+        path of the snapshot file, or a file-like object opened for writing bytes
+
+    Examples
+    --------
+    >>> import cript
+    >>> import io
+    >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+    >>> my_project = cript.Project(name="my project", material=[my_material])
+    >>> file_handle = io.BytesIO()
+    >>> cript.dump_snapshot(my_project, file_handle)
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as file_handle:
+            dump_snapshot(node, file_handle)
+        return
+
+    file.write(_SNAPSHOT_HEADER)
+    _SnapshotPickler(file, protocol=5).dump(node)
+
+
+def load_snapshot(file: Union[str, os.PathLike, IO[bytes]], _use_uuid_cache: Optional[Dict] = None):
+    """
+    Loads a binary snapshot written by `dump_snapshot`.
+
+    The nodes are created directly from the stored attributes, without validation.
+    Call `validate` on the returned node if the snapshot might contain invalid nodes.
+
+    Garbage collection runs as usual while loading. Single-threaded programs that load very large snapshots
+    can pause it around this call with `gc.disable()` and `gc.enable()` to load several times faster.
+
+    Only load snapshots from trusted sources. Like all pickle based formats,
+    a manipulated snapshot can run code of the SDK with arbitrary arguments.
+
+    Parameters
+    ----------
+    file: Union[str, os.PathLike, IO[bytes]]
+        path of the snapshot file, or a file-like object opened for reading bytes
+
+    Returns
+    -------
+    BaseNode
+        root node of the snapshot with all its children
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot of this version of the format.
+    CRIPTUUIDException
+        If a node of the snapshot has the UUID of an existing node of a different type.
+
+    Examples
+    --------
+    >>> import cript
+    >>> import io
+    >>> my_material = cript.Material(name="my material", bigsmiles="{[][$]CC[$][]}")
+    >>> my_project = cript.Project(name="my project", material=[my_material])
+    >>> file_handle = io.BytesIO()
+    >>> cript.dump_snapshot(my_project, file_handle)
+    >>> _ = file_handle.seek(0)
+    >>> cript.load_snapshot(file_handle) is my_project
+    True
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as file_handle:
+            return load_snapshot(file_handle, _use_uuid_cache=_use_uuid_cache)
+
+    header = file.read(len(_SNAPSHOT_HEADER))
+    if header != _SNAPSHOT_HEADER:
+        raise ValueError("The file is not a CRIPT snapshot, or it was written by an incompatible version of the SDK.")
+
+    previous_uuid_cache = UUIDBaseNode._uuid_cache
+    if _use_uuid_cache is not None:
+        UUIDBaseNode._uuid_cache = _use_uuid_cache
+    # Garbage collection stays enabled, although its passes over the growing graph make loading a few times slower.
+    # Pausing or freezing it would change process-wide state that other threads depend on.
+    try:
+        root = _SnapshotUnpickler(file).load()
+    finally:
+        UUIDBaseNode._uuid_cache = previous_uuid_cache
+
+    if _use_uuid_cache is not None:
+        return root, _use_uuid_cache
+    return root
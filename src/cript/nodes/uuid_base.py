@@ -53,6 +53,19 @@ class UUIDBaseNode(BaseNode, ABC):
         self._json_attrs = replace(self._json_attrs, uuid=uuid)
         UUIDBaseNode._uuid_cache[uuid] = self
 
+    @classmethod
+    def _new_with_json_attrs(cls, json_attrs: JsonAttributes):
+        # Existing nodes with the same UUID are updated, as creating them with `__init__` does
+        node_uuid = str(json_attrs.uuid)
+        node = cls.__new__(cls, uuid=node_uuid)
+        if "_json_attrs" in node.__dict__:
+            node._json_attrs = json_attrs
+        else:
+            # A new node has no caches to invalidate
+            object.__setattr__(node, "_json_attrs", json_attrs)
+        UUIDBaseNode._uuid_cache[node_uuid] = node
+        return node
+
     @property
     @beartype
     def uuid(self) -> str:
@@ -11,6 +11,13 @@ import requests
 
 import cript
 from conftest import HAS_INTEGRATION_TESTS_ENABLED
+from cript.api.utils.save_helper import (
+    _find_unchanged_uuids,
+    _get_patch_diff,
+    _InternalSaveValues,
+    _record_loaded_state,
+    _record_server_state,
+)
 
 
 @pytest.mark.skipif(not HAS_INTEGRATION_TESTS_ENABLED, reason="skipping because API client needs API token")
@@ -134,3 +141,60 @@ def test_upload_and_download_local_file(cript_api, tmp_path_factory) -> None:
 
     # assert download file contents are the same as uploaded file contents
     assert downloaded_file_contents == file_text
+
+
+def test_patch_diff(complex_project_node) -> None:
+    known_server_states = {}
+    json_return = complex_project_node.get_json()
+    _record_server_state(complex_project_node, json_return.handled_ids, _InternalSaveValues(), known_server_states)
+    assert str(complex_project_node.uuid) in known_server_states
+
+    # Nothing changed, the whole project is a UUID edge
+    assert _find_unchanged_uuids(complex_project_node, known_server_states) == set(known_server_states)
+
+    material = complex_project_node.material[0]
+    material.name = "my renamed material"
+    unchanged_uuids = _find_unchanged_uuids(complex_project_node, known_server_states)
+    assert str(complex_project_node.uuid) not in unchanged_uuids
+    assert str(material.uuid) not in unchanged_uuids
+    assert str(complex_project_node.collection[0].uuid) in unchanged_uuids
+
+    # Only the changed attribute of the project is patched, unchanged children are UUID edges
+    json_dict = complex_project_node.get_json(known_uuid=unchanged_uuids).json_dict
+    patch_dict = _get_patch_diff(complex_project_node, json_dict, known_server_states, unchanged_uuids)
+    assert set(patch_dict) == {"node", "uid", "uuid", "material"}
+    assert patch_dict["material"][0]["name"] == "my renamed material"
+
+    # Lists returned by getters can be modified in place, without the node noticing
+    _record_server_state(complex_project_node, complex_project_node.get_json().handled_ids, _InternalSaveValues(), known_server_states)
+    new_material = cript.Material(name="my appended material", bigsmiles="{[][$]CC[$][]}")
+    complex_project_node.material.append(new_material)
+    unchanged_uuids = _find_unchanged_uuids(complex_project_node, known_server_states)
+    assert str(complex_project_node.uuid) not in unchanged_uuids
+    json_dict = complex_project_node.get_json(known_uuid=unchanged_uuids).json_dict
+    patch_dict = _get_patch_diff(complex_project_node, json_dict, known_server_states, unchanged_uuids)
+    assert set(patch_dict) == {"node", "uid", "uuid", "material"}
+    assert patch_dict["material"][-1]["name"] == "my appended material"
+    complex_project_node.material.remove(new_material)
+
+
+def test_patch_diff_loaded_nodes(complex_project_node) -> None:
+    # Nodes loaded from an API response are known in the state of the response
+    known_server_states = {}
+    project_dict = json.loads(complex_project_node.get_expanded_json())
+    loaded_project = cript.load_nodes_from_json(project_dict)
+    _record_loaded_state(project_dict, known_server_states)
+    assert set(known_server_states) == {str(node.uuid) for node in loaded_project}
+    loaded_uuids = _find_unchanged_uuids(loaded_project, known_server_states)
+    assert str(loaded_project.uuid) in loaded_uuids
+
+    loaded_project.name = "my renamed project"
+    unchanged_uuids = _find_unchanged_uuids(loaded_project, known_server_states)
+    assert unchanged_uuids == loaded_uuids - {str(loaded_project.uuid)}
+    json_dict = loaded_project.get_json(known_uuid=unchanged_uuids).json_dict
+    assert set(_get_patch_diff(loaded_project, json_dict, known_server_states, unchanged_uuids)) == {"node", "uid", "uuid", "name"}
+
+    # Nodes that the response only references by UUID are not known
+    known_server_states = {}
+    _record_loaded_state({"node": ["Project"], "uuid": str(loaded_project.uuid), "name": "my project", "material": [{"uuid": str(loaded_project.material[0].uuid)}]}, known_server_states)
+    assert set(known_server_states) == {str(loaded_project.uuid)}
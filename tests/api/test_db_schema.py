@@ -1,9 +1,15 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 
+import jsonschema
 import pytest
+import requests
 
 import cript
 from cript.api.exceptions import InvalidVocabulary
+from cript.api.utils.schema_codegen import compile_schema_validators
+from cript.api.utils.validation_cache import _ValidationCache
 from cript.nodes.exceptions import CRIPTNodeSchemaError
 
 
@@ -62,6 +68,89 @@ def test_is_node_schema_valid(cript_api: cript.API) -> None:
     assert cript_api.schema.is_node_schema_valid(node_json=json.dumps(valid_file_dict), is_patch=False) is True
 
 
+def test_node_validators_are_reused(cript_api: cript.API) -> None:
+    """
+    tests that the compiled node validators are built once per schema load and reused,
+    and that validating does not modify the shared db schema
+    """
+    valid_material_dict = {"node": ["Material"], "name": "0.053 volume fraction CM gel", "uid": "_:0.053 volume fraction CM gel"}
+
+    assert "MaterialPost" in cript_api.schema._node_validators
+    assert "MaterialPatch" in cript_api.schema._node_validators
+
+    material_validator = cript_api.schema._get_node_validator(node_type="Material", is_patch=False)
+    assert cript_api.schema.is_node_schema_valid(node_json=json.dumps(valid_material_dict), is_patch=False) is True
+    assert cript_api.schema._get_node_validator(node_type="Material", is_patch=False) is material_validator
+
+    assert "$ref" not in cript_api.schema._db_schema
+
+
+def test_validation_cache(cript_api: cript.API) -> None:
+    """
+    tests that valid node JSON is only validated once, while invalid node JSON is never cached
+    """
+    valid_material_json = json.dumps({"node": ["Material"], "name": "my cached material", "uid": "_:my cached material"})
+    invalid_material_json = json.dumps({"invalid key": "invalid value", "node": ["Material"]})
+
+    cript_api.schema.clear_validation_cache()
+
+    assert cript_api.schema.is_node_schema_valid(node_json=valid_material_json) is True
+    assert cript_api.schema.validation_cache_info.misses == 1
+    assert cript_api.schema.validation_cache_info.currsize == 1
+
+    assert cript_api.schema.is_node_schema_valid(node_json=valid_material_json) is True
+    assert cript_api.schema.validation_cache_info.hits == 1
+
+    # POST and PATCH results are cached independently
+    assert cript_api.schema._validation_cache.get_key(valid_material_json, is_patch=True) != cript_api.schema._validation_cache.get_key(valid_material_json, is_patch=False)
+
+    for _ in range(2):
+        with pytest.raises(CRIPTNodeSchemaError):
+            cript_api.schema.is_node_schema_valid(node_json=invalid_material_json)
+    assert cript_api.schema.validation_cache_info.hits == 1
+    assert cript_api.schema.validation_cache_info.misses == 3
+
+
+def test_validation_cache_threads() -> None:
+    """
+    tests that the validation cache stays consistent when threads validate nodes at the same time
+    """
+    validation_cache = _ValidationCache(schema_version="v1", maxsize=16)
+    keys = [validation_cache.get_key(json.dumps({"node": ["Material"], "name": f"my material {i}"}), is_patch=False) for i in range(64)]
+
+    def validate_all(offset: int) -> None:
+        for i in range(len(keys) * 20):
+            key = keys[(i + offset) % len(keys)]
+            if not validation_cache.is_known_valid(key):
+                validation_cache.add(key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(validate_all, range(8)))
+
+    cache_info = validation_cache.info()
+    assert cache_info.hits + cache_info.misses == 8 * len(keys) * 20
+    assert cache_info.currsize == 16
+
+
+def test_validation_cache_per_node(cript_api: cript.API, simple_project_node) -> None:
+    """
+    tests that validating a graph again only validates the nodes that changed since the last validation
+    """
+    project = simple_project_node
+    experiment = project.collection[0].experiment[0]
+
+    cript_api.schema.clear_validation_cache()
+    project.validate(api=cript_api, force_validation=True)
+    number_of_nodes = cript_api.schema.validation_cache_info.misses
+    assert number_of_nodes > 1
+
+    # Modifying a leaf does not change the JSON of its parents, which only contains the UID of the leaf
+    experiment._json_attrs = replace(experiment._json_attrs, name="my renamed experiment")
+    project.validate(api=cript_api, force_validation=True)
+    assert cript_api.schema.validation_cache_info.misses == number_of_nodes + 1
+    assert cript_api.schema.validation_cache_info.hits == number_of_nodes - 1
+
+
 def test_is_node_schema_valid_skipped(cript_api: cript.API) -> None:
     """
     test that a CRIPT node can be correctly validated and invalidated with the db schema, when skipping tests is active
@@ -146,3 +235,144 @@ def test_is_vocab_valid(cript_api: cript.API) -> None:
     # valid vocab category but invalid vocab word
     with pytest.raises(InvalidVocabulary):
         cript_api.schema._is_vocab_valid(vocab_category=cript.VocabCategories.FILE_TYPE, vocab_word="some_invalid_word")
+
+
+def test_prefetch_vocabulary(cript_api: cript.API) -> None:
+    """
+    tests that vocabulary categories can be fetched concurrently and are indexed by name
+    """
+    categories = [cript.VocabCategories.FILE_TYPE, cript.VocabCategories.QUANTITY_KEY]
+    cript_api.schema.prefetch_vocabulary(categories=categories)
+
+    for category in categories:
+        assert category.value in cript_api.schema._vocabulary
+        vocab_names = [vocab_dict["name"] for vocab_dict in cript_api.schema._vocabulary[category.value]]
+        assert set(vocab_names) == set(cript_api.schema._vocabulary_index[category.value])
+
+
+def test_find_invalid_vocab(cript_api: cript.API) -> None:
+    """
+    tests that all controlled vocabulary of a graph is checked at once
+    """
+    quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+    material = cript.Material(name="my vocab material", bigsmiles="{[][$]CC[$][]}")
+    ingredient = cript.Ingredient(material=material, quantity=[quantity])
+    process = cript.Process(name="my vocab process", type="affinity_pure", ingredient=[ingredient])
+
+    assert cript_api.schema.find_invalid_vocab(process) == {}
+
+    # Break the vocabulary without triggering validation
+    quantity._json_attrs = replace(quantity._json_attrs, key="some_invalid_word")
+    assert cript_api.schema.find_invalid_vocab(process) == {cript.VocabCategories.QUANTITY_KEY: {"some_invalid_word"}}
+
+
+def test_schema_cache_and_bundle(tmp_path, monkeypatch) -> None:
+    """
+    tests that the schema and vocabulary are cached on disk if enabled, revalidated when stale,
+    and loaded without any request from the cache or a warm-start bundle
+    """
+    cache_dir = tmp_path / "schema_cache"
+    bundle_path = tmp_path / "schema_bundle.json"
+    monkeypatch.setenv("CRIPT_SCHEMA_CACHE_DIR", str(cache_dir))
+
+    # the cache is not used by default
+    with cript.API(host=None, api_token=None, storage_token=None):
+        pass
+    assert not cache_dir.exists()
+
+    with cript.API(host=None, api_token=None, storage_token=None, use_schema_cache=True, schema_cache_dir=cache_dir) as api:
+        db_schema = api.schema._db_schema
+        api.schema.get_vocab_by_category(cript.VocabCategories.FILE_TYPE)
+        api.schema.export_bundle(bundle_path, include_vocabulary=False)
+
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    def offline_request(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("offline")
+
+    monkeypatch.setattr(cript.API, "_capsule_request", offline_request)
+
+    # a fresh cache entry is used without any request
+    with cript.API(host=None, api_token=None, storage_token=None, use_schema_cache=True, schema_cache_dir=cache_dir) as api:
+        assert api.schema._db_schema == db_schema
+        assert "calibration" in api.schema._vocabulary_index["file_type"]
+
+    # a stale cache entry is only used if the server cannot be reached, when the caller opts in
+    monkeypatch.setattr(cript.api.DataSchema, "schema_cache_ttl", 0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        cript.API(host=None, api_token=None, storage_token=None, use_schema_cache=True, schema_cache_dir=cache_dir).connect()
+    with cript.API(host=None, api_token=None, storage_token=None, use_schema_cache=True, schema_cache_dir=cache_dir, schema_cache_offline_fallback=True) as api:
+        assert api.schema._db_schema == db_schema
+
+    # a stale cache entry is reused, if the server reports the schema as unchanged
+    def not_modified_request(*args, **kwargs):
+        response = requests.Response()
+        response.status_code = 304
+        return response
+
+    monkeypatch.setattr(cript.API, "_capsule_request", not_modified_request)
+    with cript.API(host=None, api_token=None, storage_token=None, use_schema_cache=True, schema_cache_dir=cache_dir) as api:
+        assert api.schema._db_schema == db_schema
+        # vocabulary is not revalidated, so it is fetched again
+        assert "file_type" not in api.schema._vocabulary_index
+
+    # a bundle is loaded without any request, and nodes can be validated offline
+    monkeypatch.setattr(cript.API, "_capsule_request", offline_request)
+    with cript.API(host=None, api_token=None, storage_token=None, schema_bundle=bundle_path) as api:
+        assert api.schema._db_schema == db_schema
+        assert "calibration" in api.schema._vocabulary_index["file_type"]
+        cript.Quantity(key="mass", value=1.23, unit="kg").validate()
+
+
+def test_generated_validators_match_jsonschema() -> None:
+    """
+    tests that generated validators accept and reject the same instances as jsonschema,
+    and that definitions with unsupported keywords are left to jsonschema
+    """
+    db_schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$defs": {
+            "ChildPost": {
+                "type": "object",
+                "properties": {"node": {"const": ["Child"]}, "value": {"type": "number", "minimum": 0, "exclusiveMaximum": 10}},
+                "required": ["node"],
+                "additionalProperties": False,
+            },
+            "ParentPost": {
+                "type": "object",
+                "properties": {
+                    "node": {"const": ["Parent"]},
+                    "name": {"type": "string", "minLength": 1, "pattern": "^[a-z ]+$"},
+                    "type": {"enum": ["a", "b"]},
+                    "count": {"type": ["integer", "null"]},
+                    "child": {"type": "array", "items": {"anyOf": [{"$ref": "#/$defs/ChildPost"}, {"$ref": "#/$defs/ParentPost"}]}, "maxItems": 2},
+                },
+                "required": ["node", "name"],
+                "additionalProperties": False,
+            },
+            "UniquePost": {"type": "array", "uniqueItems": True},
+        },
+    }
+    generated_validators = compile_schema_validators(db_schema, ["ChildPost", "ParentPost", "UniquePost"])
+    assert set(generated_validators) == {"ChildPost", "ParentPost"}
+
+    parent_validator = jsonschema.Draft202012Validator(dict(db_schema, **{"$ref": "#/$defs/ParentPost"}))
+    instances = [
+        {"node": ["Parent"], "name": "my parent"},
+        {"node": ["Parent"], "name": "my parent", "type": "a", "count": 1.0, "child": [{"node": ["Child"], "value": 5}]},
+        {"node": ["Parent"], "name": "my parent", "child": [{"node": ["Parent"], "name": "nested", "count": None}]},
+        {"node": ["Parent"], "name": ""},
+        {"node": ["Parent"], "name": "Not lower case"},
+        {"node": ["Parent"], "name": "my parent", "type": "c"},
+        {"node": ["Parent"], "name": "my parent", "count": True},
+        {"node": ["Parent"], "name": "my parent", "count": 1.5},
+        {"node": ["Parent"], "name": "my parent", "child": [{"node": ["Child"], "value": 10}]},
+        {"node": ["Parent"], "name": "my parent", "child": [{"node": ["Child"], "value": -1}]},
+        {"node": ["Parent"], "name": "my parent", "child": [{"node": ["Child"]}, {"node": ["Child"]}, {"node": ["Child"]}]},
+        {"node": ["Parent"], "name": "my parent", "unknown": 1},
+        {"node": ["Child"], "name": "my parent"},
+        {"name": "my parent"},
+        ["Parent"],
+    ]
+    for instance in instances:
+        assert generated_validators["ParentPost"](instance) == parent_validator.is_valid(instance)
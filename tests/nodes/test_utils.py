@@ -1,4 +1,7 @@
+import dataclasses
+
 import cript
+from cript.nodes.field_metadata import _get_field_metadata
 from cript.nodes.util.json import _is_node_field_valid
 
 
@@ -51,3 +54,32 @@ def test_load_node_from_json_dict_argument() -> None:
 
     # convert UUID object to UUID str and compare
     assert str(my_material_node_from_dict.uuid) == material_uuid
+
+
+def test_field_metadata() -> None:
+    """
+    tests that the cached field metadata of a node class matches its `JsonAttributes` dataclass
+    """
+    field_metadata = _get_field_metadata(cript.Material.JsonAttributes)
+    assert field_metadata is _get_field_metadata(cript.Material.JsonAttributes)
+
+    default_attributes = cript.Material.JsonAttributes()
+    assert field_metadata.field_names == tuple(field.name for field in dataclasses.fields(default_attributes))
+    for field_name in field_metadata.field_names:
+        if field_name == "uuid":
+            # every default is a new UUID, so no value is equal to the default
+            assert not field_metadata.is_default(field_name, default_attributes.uuid)
+            assert field_metadata.get_default(field_name) != field_metadata.get_default(field_name)
+        else:
+            assert field_metadata.is_default(field_name, getattr(default_attributes, field_name))
+            assert field_metadata.get_default(field_name) == getattr(default_attributes, field_name)
+
+    # Fresh default values are not shared
+    assert field_metadata.get_default("property") is not field_metadata.get_default("property")
+
+    # Only fields that can hold nodes are child fields
+    assert "parent_material" in field_metadata.child_field_names
+    assert "property" in field_metadata.child_field_names
+    assert "name" not in field_metadata.child_field_names
+    assert "keyword" not in field_metadata.child_field_names
+    assert list(field_metadata.child_field_names) == sorted(field_metadata.child_field_names)
@@ -1,6 +1,11 @@
 import copy
+import gc
+import io
 import json
+import sys
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 
 import pytest
@@ -8,6 +13,7 @@ import pytest
 import cript
 from cript.nodes.core import get_new_uid
 from cript.nodes.exceptions import (
+    CRIPTDeserializationUIDError,
     CRIPTJsonNodeError,
     CRIPTJsonSerializationError,
     CRIPTNodeSchemaError,
@@ -17,6 +23,7 @@ from cript.nodes.exceptions import (
     CRIPTOrphanedMaterialWarning,
     CRIPTOrphanedProcessWarning,
 )
+from cript.nodes.uuid_base import UUIDBaseNode
 from tests.utils.util import strip_uid_from_dict
 
 
@@ -148,6 +155,105 @@ def test_json_error(complex_parameter_node):
         parameter.json
 
 
+def test_shallow_validation(simple_algorithm_node, complex_parameter_node):
+    algorithm = simple_algorithm_node
+    parameter = complex_parameter_node
+    algorithm.parameter += [parameter]
+
+    # Shallow validation only serializes direct children as UID edges
+    assert algorithm._get_child_uids() == {parameter.uid}
+
+    # Break the child node by violating the data model
+    parameter._json_attrs = replace(parameter._json_attrs, value="abc")
+
+    # Setters only validate the modified node, the broken child is an opaque edge
+    algorithm.type = "barostat"
+    algorithm.validate(is_shallow=True)
+
+    # A full validation of the graph still finds the broken child
+    with pytest.raises(CRIPTNodeSchemaError):
+        algorithm.validate()
+
+
+def test_find_schema_errors(simple_algorithm_node, complex_parameter_node):
+    algorithm = simple_algorithm_node
+    parameter = complex_parameter_node
+    other_parameter = copy.deepcopy(complex_parameter_node)
+    algorithm.parameter += [parameter, other_parameter]
+    assert cript.find_schema_errors(algorithm) == []
+
+    # Break both children by violating the data model
+    parameter._json_attrs = replace(parameter._json_attrs, value="abc")
+    other_parameter._json_attrs = replace(other_parameter._json_attrs, value="def")
+
+    # All errors are reported at once, with the node they belong to
+    schema_errors = cript.find_schema_errors(algorithm)
+    assert {schema_error.node_uuid for schema_error in schema_errors} == {parameter.uuid, other_parameter.uuid}
+    for schema_error in schema_errors:
+        assert schema_error.node_type == "Parameter"
+        assert schema_error.json_path == "$.value"
+        assert schema_error.message
+
+
+def test_find_schema_errors_in_parallel(monkeypatch, simple_project_node, simple_process_node):
+    project = simple_project_node
+    process = simple_process_node
+    project.collection[0].experiment[0].process += [process]
+    project.collection[0].experiment += [cript.Experiment(name="my other experiment", process=[copy.deepcopy(simple_process_node)])]
+
+    # Use worker processes even for this small graph
+    monkeypatch.setattr(cript.nodes.util.core, "_PARALLEL_VALIDATION_MIN_NODES", 0)
+    assert cript.find_schema_errors(project, max_workers=2) == []
+    project.validate(max_workers=2)
+
+    # Break a node inside one of the experiments
+    process._json_attrs = replace(process._json_attrs, name=123)
+
+    schema_errors = cript.find_schema_errors(project, max_workers=2)
+    assert schema_errors == cript.find_schema_errors(project)
+    assert [schema_error.node_uuid for schema_error in schema_errors] == [process.uuid]
+    assert schema_errors[0].json_path == "$.name"
+    with pytest.raises(CRIPTNodeSchemaError):
+        project.validate(max_workers=2)
+
+
+def test_deferred_validation(simple_algorithm_node, complex_parameter_node):
+    algorithm = simple_algorithm_node
+    parameter = complex_parameter_node
+
+    # Invalid modifications are only detected at the end of the block
+    with pytest.raises(CRIPTNodeSchemaError):
+        with cript.deferred_validation():
+            algorithm.parameter += [parameter]
+            parameter._update_json_attrs_if_valid(replace(parameter._json_attrs, value="abc"))
+            # Nested blocks are validated by the outermost block
+            with algorithm.batch_edit():
+                algorithm.type = "barostat"
+
+    # Outside the block, nodes are validated immediately again
+    with pytest.raises(CRIPTNodeSchemaError):
+        parameter._update_json_attrs_if_valid(replace(parameter._json_attrs, value="abc"))
+
+    parameter._update_json_attrs_if_valid(replace(parameter._json_attrs, value=1.0))
+    with algorithm.batch_edit():
+        algorithm.type = "barostat"
+        algorithm.parameter = [parameter]
+    assert algorithm.parameter == [parameter]
+
+
+def test_find_graph_roots(simple_algorithm_node, complex_parameter_node):
+    from cript.nodes.util.core import _find_graph_roots
+
+    algorithm = simple_algorithm_node
+    parameter = complex_parameter_node
+    algorithm.parameter += [parameter]
+    other_parameter = copy.deepcopy(parameter)
+
+    assert _find_graph_roots([parameter, algorithm]) == [algorithm]
+    assert _find_graph_roots([algorithm, parameter]) == [algorithm]
+    assert len(_find_graph_roots([parameter, algorithm, other_parameter])) == 2
+
+
 def test_local_search(simple_algorithm_node, complex_parameter_node):
     a = simple_algorithm_node
     # Check if we can use search to find the algorithm node, but specifying node and key
@@ -334,6 +440,113 @@ def test_invalid_project_graphs(simple_project_node, simple_material_node, simpl
     project.validate()
 
 
+def test_find_orphaned_nodes(simple_project_node, simple_material_node, simple_process_node, simple_data_node):
+    """
+    tests that all orphans of a project are reported at once and fixed in a single pass
+    """
+    project = copy.deepcopy(simple_project_node)
+    experiment = project.collection[0].experiment[0]
+    assert not cript.find_orphaned_nodes(project)
+
+    material = copy.deepcopy(simple_material_node)
+    process = copy.deepcopy(simple_process_node)
+    orphan_process = copy.deepcopy(simple_process_node)
+    data = copy.deepcopy(simple_data_node)
+    process.ingredient += [cript.Ingredient(material=material, quantity=[cript.Quantity(key="mass", value=1.23, unit="kg")])]
+    process.prerequisite_process += [orphan_process]
+    # force orphans into the graph without validation
+    experiment._json_attrs = replace(experiment._json_attrs, process=experiment.process + [process])
+    material._json_attrs.property.append(cript.Property(key="enthalpy", type="value", value=5.0, unit="GPa", data=[data]))
+
+    orphan_report = cript.find_orphaned_nodes(project)
+    assert orphan_report.material == [material]
+    assert orphan_report.process == [orphan_process]
+    assert orphan_report.data == [data]
+    assert orphan_report.computation == [] and orphan_report.computation_process == []
+    assert [type(orphan_warning) for orphan_warning in orphan_report.get_warnings()] == [CRIPTOrphanedMaterialWarning, CRIPTOrphanedProcessWarning, CRIPTOrphanedDataWarning]
+
+    cript.add_orphaned_nodes_to_project(project, experiment)
+    assert not cript.find_orphaned_nodes(project)
+    assert material in project.material
+    assert orphan_process in experiment.process
+    assert data in experiment.data
+
+
+def test_get_json_single_pass(complex_project_node):
+    json_result = complex_project_node.get_json(sort_keys=True)
+    # The dict is only parsed on first access
+    assert json_result._json_dict is None
+    assert json_result.json == json.dumps(json_result.json_dict, sort_keys=True)
+    assert json.loads(json_result.json) == json_result.json_dict
+    assert complex_project_node.uid in json_result.handled_ids
+
+    # Building the dict first gives the same JSON
+    with cript.incremental_serialization():
+        dict_result = complex_project_node.get_json(sort_keys=True)
+        assert dict_result._json is None
+        assert dict_result.json == json_result.json
+        assert dict_result.handled_ids == json_result.handled_ids
+
+    patch_result = complex_project_node.get_json(is_patch=True)
+    assert "uuid" not in patch_result.json_dict
+    assert {key: value for key, value in json_result.json_dict.items() if key != "uuid"} == patch_result.json_dict
+
+
+def test_get_json_thread_safe(complex_project_node):
+    projects = [copy.deepcopy(complex_project_node) for _ in range(8)]
+    expected = [project.get_json(sort_keys=True).json for project in projects]
+
+    previous_switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible, to provoke races between serializations
+    try:
+        with ThreadPoolExecutor(max_workers=len(projects)) as executor:
+            for _ in range(5):
+                assert list(executor.map(lambda project: project.get_json(sort_keys=True).json, projects)) == expected
+    finally:
+        sys.setswitchinterval(previous_switch_interval)
+
+    # The encoder state can also be handed to json.dumps
+    condense_to_uuid = {"Material": {"parent_material", "component"}}
+    assert json.dumps(complex_project_node, cls=cript.NodeEncoder, condense_to_uuid=condense_to_uuid) == complex_project_node.get_json(condense_to_uuid=condense_to_uuid).json
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "ujson", "msgspec", "auto"])
+def test_json_backend(backend, complex_project_node):
+    expected_json_dict = complex_project_node.get_json(sort_keys=True).json_dict
+    expected_json = complex_project_node.get_json(sort_keys=True).json
+    previous_backend = cript.get_json_backend()
+    try:
+        try:
+            cript.set_json_backend(backend)
+        except ImportError:
+            pytest.skip(f"{backend} is not installed")
+
+        # JSON strings of nodes are the same for every backend
+        assert complex_project_node.get_json(sort_keys=True).json == expected_json
+        assert complex_project_node.get_json(indent=2).json == json.dumps(complex_project_node.get_json().json_dict, indent=2)
+
+        # Request bodies have the same values and key order, but not necessarily the same text
+        request_body = {"values": [1e-07, 1e16, -2.5], **expected_json_dict}
+        json_string = cript.nodes.util.json_backend._json_dumps(request_body)
+        assert json.loads(json_string, object_pairs_hook=lambda pairs: pairs) == json.loads(json.dumps(request_body), object_pairs_hook=lambda pairs: pairs)
+
+        loaded_project, _ = cript.load_nodes_from_json(complex_project_node.get_expanded_json(), _use_uuid_cache=dict())
+        assert loaded_project.get_json(sort_keys=True).json_dict == expected_json_dict
+
+        # Unsupported values are left to the standard library
+        assert json.loads(cript.nodes.util.json_backend._json_dumps({"large": 2**70})) == {"large": 2**70}
+        non_finite_values = {"values": [1.0, {"value": float("nan")}, float("inf"), -float("inf")]}
+        assert cript.nodes.util.json_backend._json_dumps(non_finite_values) == json.dumps(non_finite_values)
+        assert cript.nodes.util.json_backend._json_loads('{"value": NaN}', object_hook=dict)["value"] != 0
+        with pytest.raises(json.JSONDecodeError):
+            cript.nodes.util.json_backend._json_loads("{")
+    finally:
+        cript.set_json_backend(previous_backend)
+
+    with pytest.raises(ValueError):
+        cript.set_json_backend("yaml")
+
+
 def test_expanded_json(complex_project_node):
     """
     Tests the generation and deserialization of expanded JSON for a complex project node.
@@ -356,6 +569,295 @@ def test_expanded_json(complex_project_node):
         cript.load_nodes_from_json(condensed_json)
 
 
+def test_write_expanded_json(complex_project_node, tmp_path):
+    for json_kwargs in ({}, {"indent": 2}, {"sort_keys": True}):
+        file_handle = io.StringIO()
+        complex_project_node.write_expanded_json(file_handle, **json_kwargs)
+        assert file_handle.getvalue() == complex_project_node.get_expanded_json(**json_kwargs)
+
+    # Round trip through a file
+    file_path = tmp_path / "project.json"
+    with open(file_path, "w") as file_handle:
+        complex_project_node.write_expanded_json(file_handle)
+    with open(file_path, "r") as file_handle:
+        reloaded_project, _ = cript.load_nodes_from_json(file_handle.read(), _use_uuid_cache=dict())
+
+    assert reloaded_project is not complex_project_node
+    assert reloaded_project.get_expanded_json() == complex_project_node.get_expanded_json()
+
+
+def test_jsonl(complex_project_node, tmp_path):
+    file_path = tmp_path / "project.jsonl"
+    with open(file_path, "w") as file_handle:
+        cript.dump_jsonl(complex_project_node, file_handle)
+
+    with open(file_path, "r") as file_handle:
+        lines = file_handle.read().splitlines()
+    # One line per node, children are UUID edges and come before their parents
+    assert len(lines) == len(list(complex_project_node))
+    assert json.loads(lines[-1])["uuid"] == str(complex_project_node.uuid)
+    written_uuids = set()
+    for line in lines:
+        node_dict = json.loads(line)
+        for value in node_dict.values():
+            for element in value if isinstance(value, list) else [value]:
+                if isinstance(element, dict) and "node" not in element:
+                    assert list(element) == ["uuid"]
+        written_uuids.add(node_dict["uuid"])
+    assert len(written_uuids) == len(lines)
+
+    with open(file_path, "r") as file_handle:
+        reloaded_project, _ = cript.load_jsonl(file_handle, _use_uuid_cache=dict())
+    assert reloaded_project is not complex_project_node
+    assert reloaded_project.get_expanded_json(sort_keys=True) == complex_project_node.get_expanded_json(sort_keys=True)
+
+    # Edges to nodes of later lines are resolved at the end
+    parents_first_lines = lines[-2::-1] + lines[-1:]
+    reloaded_project, _ = cript.load_jsonl(parents_first_lines, _use_uuid_cache=dict())
+    assert reloaded_project.get_expanded_json(sort_keys=True) == complex_project_node.get_expanded_json(sort_keys=True)
+
+    with pytest.raises(ValueError):
+        cript.load_jsonl(io.StringIO(""))
+
+
+def test_snapshot(complex_project_node, tmp_path):
+    snapshot_path = tmp_path / "project.snapshot"
+    cript.dump_snapshot(complex_project_node, snapshot_path)
+
+    # Loading into the same UUID cache returns the existing nodes
+    assert cript.load_snapshot(snapshot_path) is complex_project_node
+
+    loaded_project, cache = cript.load_snapshot(snapshot_path, _use_uuid_cache=dict())
+    assert loaded_project is not complex_project_node
+    assert loaded_project.get_expanded_json(sort_keys=True) == complex_project_node.get_expanded_json(sort_keys=True)
+    assert cache[loaded_project.uuid] is loaded_project
+    for node in loaded_project:
+        assert cache[node.uuid] is node
+    # Nodes shared in the graph are still shared after loading
+    loaded_materials = {id(node) for node in loaded_project if isinstance(node, cript.Material)}
+    assert len(loaded_materials) == len({node.uuid for node in loaded_project if isinstance(node, cript.Material)})
+
+    with pytest.raises(ValueError):
+        cript.load_snapshot(io.BytesIO(b"not a snapshot"))
+
+
+def test_incremental_serialization(complex_project_node):
+    with cript.incremental_serialization():
+        first_json = complex_project_node.get_json(sort_keys=True).json
+        assert complex_project_node._json_fragment is not None
+        # Unchanged graphs reuse the stored dicts
+        assert complex_project_node.get_json(sort_keys=True).json == first_json
+
+        material = complex_project_node.material[0]
+        material.name = "my renamed material"
+        # Modifying a node drops the stored dicts of the nodes containing it
+        assert material._json_fragment is None
+        assert complex_project_node._json_fragment is None
+        second_json = complex_project_node.get_json(sort_keys=True).json
+        assert second_json != first_json
+
+    assert complex_project_node._json_fragment is None
+    assert complex_project_node.get_json(sort_keys=True).json == second_json
+    condense_to_uuid = {"Material": {"parent_material", "component"}}
+    with cript.incremental_serialization():
+        complex_project_node.get_json()
+        # Stored dicts are only reused with the same settings
+        assert complex_project_node.get_json(condense_to_uuid=condense_to_uuid).json == json.dumps(complex_project_node, cls=cript.NodeEncoder, condense_to_uuid=condense_to_uuid)
+
+
+def test_content_hash(complex_project_node, fixed_cyclic_project_node):
+    project_hash = complex_project_node.content_hash
+    assert complex_project_node.content_hash == project_hash
+
+    # A reloaded graph with the same content has the same hash, although it has different UIDs
+    reloaded_project, _ = cript.load_nodes_from_json(complex_project_node.get_expanded_json(), _use_uuid_cache=dict())
+    assert reloaded_project is not complex_project_node
+    assert reloaded_project.content_hash == project_hash
+
+    material = complex_project_node.material[0]
+    material_name = material.name
+    material_hash = material.content_hash
+    material.name = "my renamed material"
+    # Modifying a node drops the cached hashes of the nodes containing it
+    assert complex_project_node._content_hash is None
+    assert material.content_hash != material_hash
+    assert complex_project_node.content_hash != project_hash
+    material.name = material_name
+    assert complex_project_node.content_hash == project_hash
+
+    # Lists modified in place through a getter are detected, also deeper inside the graph
+    new_material = cript.Material(name="my appended material", bigsmiles="{[][$]CC[$][]}")
+    complex_project_node.material.append(new_material)
+    assert complex_project_node.content_hash != project_hash
+    complex_project_node.material.remove(new_material)
+    assert complex_project_node.content_hash == project_hash
+    material.keyword.append("my appended keyword")
+    assert complex_project_node.content_hash != project_hash
+    assert material.content_hash != material_hash
+    material.keyword.pop()
+    assert complex_project_node.content_hash == project_hash
+    complex_project_node.material[0] = cript.Material(name="my replacing material", bigsmiles="{[][$]CC[$][]}")
+    assert complex_project_node.content_hash != project_hash
+    complex_project_node.material[0] = material
+    assert complex_project_node.content_hash == project_hash
+
+    # Circular references are hashed the same way every time
+    cyclic_hash = fixed_cyclic_project_node.content_hash
+    assert fixed_cyclic_project_node.content_hash == cyclic_hash
+    for node in fixed_cyclic_project_node:
+        node.content_hash
+    assert fixed_cyclic_project_node.content_hash == cyclic_hash
+
+    # Children do not keep nodes alive that contained them
+    shared_quantity = cript.Quantity(key="mass", value=1.23, unit="kg")
+    old_ingredient = cript.Ingredient(material=material, quantity=[shared_quantity])
+    old_ingredient.content_hash
+    old_ingredient_ref = weakref.ref(old_ingredient)
+    # The UUID cache keeps all nodes alive by itself
+    UUIDBaseNode._uuid_cache.pop(str(old_ingredient.uuid))
+    del old_ingredient
+    gc.collect()
+    assert old_ingredient_ref() is None
+    assert len(shared_quantity._cache_parents) == 0
+
+
+def test_register_node_class(simple_material_node):
+    from cript.nodes.node_registry import _node_classes
+
+    class CustomMaterial(cript.Material):
+        pass
+
+    previous_node_classes = dict(_node_classes)
+    try:
+        assert cript.register_node_class(CustomMaterial, "Material") is CustomMaterial
+        loaded_material, _ = cript.load_nodes_from_json(simple_material_node.get_json().json, _use_uuid_cache=dict())
+        assert type(loaded_material) is CustomMaterial
+        with pytest.raises(TypeError):
+            cript.register_node_class(dict)
+    finally:
+        _node_classes.clear()
+        _node_classes.update(previous_node_classes)
+
+    loaded_material, _ = cript.load_nodes_from_json(simple_material_node.get_json().json, _use_uuid_cache=dict())
+    assert type(loaded_material) is cript.Material
+
+
+def test_load_nodes_from_dict(complex_project_node):
+    expanded_json = complex_project_node.get_expanded_json()
+    project_dict = json.loads(expanded_json)
+
+    loaded_project, _ = cript.load_nodes_from_json(project_dict, _use_uuid_cache=dict())
+    assert loaded_project.get_expanded_json(sort_keys=True) == complex_project_node.get_expanded_json(sort_keys=True)
+    # The dict is decoded directly, without modifying it
+    assert project_dict == json.loads(expanded_json)
+
+    # Lists of node dicts, with UID edges between them
+    condensed_dicts = [json.loads(material.get_json().json) for material in complex_project_node.material]
+    loaded_materials, _ = cript.load_nodes_from_json(condensed_dicts, _use_uuid_cache=dict())
+    assert [material.get_json(sort_keys=True).json for material in loaded_materials] == [material.get_json(sort_keys=True).json for material in complex_project_node.material]
+
+
+def test_stream_nodes_from_json():
+    shared_component = cript.Material(name="my shared component", bigsmiles="{[][$]CC[$][]}")
+    materials = [cript.Material(name=f"my material \\ \"{i}\" {{[ ]}} \u00e4\u20ac", bigsmiles="{[][$]CC[$][]}", component=[shared_component]) for i in range(3)]
+    # One document for all materials, the shared component is written once and referenced by its UID afterwards
+    materials_json = json.dumps(materials, cls=cript.NodeEncoder, ensure_ascii=False)
+    assert materials_json.count(f'{{"uid": "{shared_component.uid}"}}') == 2
+    expected_json = [material.get_json(sort_keys=True).json for material in materials]
+
+    # Tiny chunks split strings, escapes and UTF-8 characters
+    for chunk_size in (1, 7, 1 << 20):
+        loaded_materials = list(cript.stream_nodes_from_json(io.BytesIO(materials_json.encode()), chunk_size=chunk_size, _use_uuid_cache=dict()))
+        assert [material.get_json(sort_keys=True).json for material in loaded_materials] == expected_json
+        assert loaded_materials[1].component[0] is loaded_materials[0].component[0]
+
+    # The array of an API response, where items reference the component of a later item by its UID
+    material_dicts = json.loads(materials_json)
+    material_dicts.append(material_dicts.pop(0))
+    response_json = json.dumps({"code": 200, "data": {"result": material_dicts}, "error": None})
+    loaded_materials = list(cript.stream_nodes_from_json([response_json[:100], response_json[100:]], path=("data", "result"), _use_uuid_cache=dict()))
+    assert [material.get_json(sort_keys=True).json for material in loaded_materials] == expected_json[1:] + expected_json[:1]
+    assert loaded_materials[0].component[0] is loaded_materials[2].component[0]
+
+    # Numbers have no closing character, tiny chunks must not cut them short
+    for chunk_size in range(1, 12):
+        assert list(cript.stream_nodes_from_json(io.StringIO('{"data": [1.5, -2.5e-07, null]}'), path=("data",), chunk_size=chunk_size)) == [1.5, -2.5e-07, None]
+
+    # A single item larger than a chunk is decoded while it is read, the shared component is still resolved
+    project_json = json.dumps({"data": [cript.Project(name="my project", material=materials)]}, cls=cript.NodeEncoder)
+    for chunk_size in (64, 1 << 20):
+        loaded_projects = list(cript.stream_nodes_from_json(io.StringIO(project_json), path=("data",), chunk_size=chunk_size, _use_uuid_cache=dict()))
+        assert [material.get_json(sort_keys=True).json for material in loaded_projects[0].material] == expected_json
+        assert loaded_projects[0].material[1].component[0] is loaded_projects[0].material[0].component[0]
+
+    # The component is never defined
+    with pytest.raises(CRIPTDeserializationUIDError):
+        list(cript.stream_nodes_from_json(io.StringIO(json.dumps(material_dicts[:-1])), _use_uuid_cache=dict()))
+
+    with pytest.raises(ValueError):
+        list(cript.stream_nodes_from_json(io.StringIO(materials_json[:200]), _use_uuid_cache=dict()))
+
+
+def test_lazy_node(complex_project_node):
+    project_dict = json.loads(complex_project_node.get_expanded_json())
+    original_dict = copy.deepcopy(project_dict)
+    lazy_project = cript.LazyNode(project_dict)
+
+    # Plain attributes are read from the JSON, without creating the node
+    assert lazy_project.node_type == "Project"
+    assert lazy_project.uuid == str(complex_project_node.uuid)
+    assert lazy_project.name == complex_project_node.name
+    assert not lazy_project.is_materialized
+
+    # Attributes with child nodes create the node
+    assert len(lazy_project.material) == len(complex_project_node.material)
+    assert lazy_project.is_materialized
+    assert lazy_project.materialize() is lazy_project.materialize()
+    # Nodes in the UUID cache are reused, like with `load_nodes_from_json`
+    assert lazy_project.materialize() is cript.load_nodes_from_json(original_dict)
+    assert lazy_project.get_json(sort_keys=True).json == complex_project_node.get_json(sort_keys=True).json
+    assert project_dict == original_dict
+
+    # Methods create the node as well
+    lazy_material = cript.LazyNode(json.loads(complex_project_node.material[0].get_json().json))
+    assert lazy_material.name == complex_project_node.material[0].name
+    assert not lazy_material.is_materialized
+    assert lazy_material.get_json(sort_keys=True).json == complex_project_node.material[0].get_json(sort_keys=True).json
+    assert lazy_material.is_materialized
+
+    # Setting attributes is forwarded to the node
+    lazy_material.name = "my renamed material"
+    assert lazy_material.materialize().name == "my renamed material"
+
+
+def test_load_trusted_json(complex_project_node):
+    expanded_json = complex_project_node.get_expanded_json()
+
+    project, _ = cript.load_nodes_from_json(expanded_json, _use_uuid_cache=dict())
+    trusted_project, trusted_cache = cript.load_nodes_from_json(expanded_json, _use_uuid_cache=dict(), trusted=True)
+    assert trusted_project.get_expanded_json(sort_keys=True) == project.get_expanded_json(sort_keys=True)
+    # Every node gets exactly the attributes it gets from its constructor
+    assert len(list(trusted_project)) == len(list(project))
+    for trusted_node, node in zip(trusted_project, project):
+        assert type(trusted_node) is type(node)
+        assert trusted_node.get_json(sort_keys=True).json == node.get_json(sort_keys=True).json
+        assert trusted_cache[trusted_node.uuid] is trusted_node
+
+    # Nodes that exist already are updated, not duplicated
+    reloaded_project, _ = cript.load_nodes_from_json(expanded_json, _use_uuid_cache=trusted_cache, trusted=True)
+    assert reloaded_project is trusted_project
+
+    # UIDs are completed as usual
+    material_dict = json.loads(complex_project_node.material[0].get_json().json)
+    material_dict["uid"] = material_dict["uid"][2:]
+    trusted_material, _ = cript.load_nodes_from_json(material_dict, _use_uuid_cache=dict(), trusted=True)
+    assert trusted_material.uid == "_:" + material_dict["uid"]
+    del material_dict["uid"]
+    trusted_material, _ = cript.load_nodes_from_json(material_dict, _use_uuid_cache=dict(), trusted=True)
+    assert trusted_material.uid.startswith("_:")
+    assert trusted_material.node == ["Material"]
+
+
 def test_uuid_cache_override(complex_project_node):
     normal_serial = complex_project_node.get_expanded_json()
     reloaded_project = cript.load_nodes_from_json(normal_serial)